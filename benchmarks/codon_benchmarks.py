@@ -0,0 +1,329 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+Benchmark suite for the codon module.
+
+Runs offline: the Codon Usage Database file of the codon tests
+(tests/codon/data/37762.txt) is copied into a temporary codon cache, in
+offline mode, before synbiopython is imported.
+
+Each benchmark reports latency (best and median of repeated runs),
+throughput and peak memory (as traced by tracemalloc). Results can be saved
+as a JSON baseline and compared against on a later commit:
+
+    python benchmarks/codon_benchmarks.py --output baseline.json
+    python benchmarks/codon_benchmarks.py --baseline baseline.json
+
+Comparison is of median latencies. It exits with status 1 if any benchmark
+is slower than the baseline both by more than the threshold ratio (default
+1.25) and by more than the minimum difference (default 1 us), so that timer
+noise on sub-microsecond benchmarks is not reported as a regression.
+
+This is a standalone runner, like the other benchmarks here, rather than a
+pytest-benchmark suite: pytest-benchmark is not a dependency of the package
+or its tests, does not report throughput or peak memory, and would run
+within the test session, whose codon cache and offline settings must not
+leak into the benchmarks (these are set before synbiopython is imported).
+Saved baselines hold the same median latencies that
+``pytest --benchmark-compare-fail=median:25%`` would compare.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+_DATA_FILE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    os.pardir,
+    "tests",
+    "codon",
+    "data",
+    "37762.txt",
+)
+
+_AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def _setup_cache():
+    """Point the codon cache at a temporary copy of the test data file.
+
+    :return: the temporary directory.
+    :rtype: tempfile.TemporaryDirectory
+    """
+    tmp_dir = tempfile.TemporaryDirectory()
+    cache_dir = os.path.join(tmp_dir.name, "codon")
+    os.makedirs(cache_dir)
+    shutil.copy(_DATA_FILE, cache_dir)
+    os.environ["SYNBIOPYTHON_CODON_CACHE"] = cache_dir
+    os.environ["SYNBIOPYTHON_CODON_OFFLINE"] = "1"
+    return tmp_dir
+
+
+def _get_benchmarks(sizes):
+    """Get the benchmarks to run.
+
+    :param sizes: the synthetic proteome sizes, in residues.
+    :type sizes: list
+    :return: a list of (name, function, number of items per call, unit)
+        tuples.
+    :rtype: list
+    """
+    # pylint: disable=import-outside-toplevel
+    from synbiopython.codon import table, taxonomy_utils, utils
+
+    codon_table = table.get_table("Escherichia coli")
+    compiled = utils.CompiledCodonTable(codon_table)
+    rng = np.random.default_rng(0)
+
+    def get_table_cold():
+        table.clear_cache()
+        table.get_table("37762")
+
+    benchmarks = [
+        ("get_table (cold)", get_table_cold, 1, "calls"),
+        ("get_table (warm)", lambda: table.get_table("37762"), 1, "calls"),
+        (
+            "get_tax_id (name)",
+            lambda: taxonomy_utils.get_tax_id("Escherichia coli"),
+            1,
+            "calls",
+        ),
+        (
+            "get_tax_id (id)",
+            lambda: taxonomy_utils.get_tax_id(37762),
+            1,
+            "calls",
+        ),
+        ("sample", lambda: utils.sample(codon_table, "L"), 1, "calls"),
+    ]
+
+    for size in sizes:
+        aa_seq = "".join(rng.choice(list(_AMINO_ACIDS), size=size))
+
+        benchmarks.extend(
+            [
+                (
+                    "optimise (dict, %d)" % size,
+                    lambda aa_seq=aa_seq: utils.optimise(codon_table, aa_seq),
+                    size,
+                    "residues",
+                ),
+                (
+                    "optimise (compiled, %d)" % size,
+                    lambda aa_seq=aa_seq: utils.optimise(compiled, aa_seq),
+                    size,
+                    "residues",
+                ),
+            ]
+        )
+
+    return benchmarks
+
+
+def _measure(func, items, min_time=0.2, repeat=11):
+    """Measure the latency, throughput and peak memory of a function.
+
+    :param func: the function.
+    :type func: function
+    :param items: the number of items processed per call.
+    :type items: int
+    :param min_time: the minimum duration of each timed run, in seconds.
+    :type min_time: float
+    :param repeat: the number of timed runs.
+    :type repeat: int
+    :return: the measurements.
+    :rtype: dict
+    """
+    # Calibrate the number of calls per run:
+    number = 1
+
+    while True:
+        start = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        if time.perf_counter() - start >= min_time or number >= 1e6:
+            break
+
+        number *= 10
+
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        latencies.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "latency_s": min(latencies),
+        "median_latency_s": statistics.median(latencies),
+        "throughput_per_s": items / min(latencies),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _get_metadata():
+    """Get metadata describing the benchmark run.
+
+    :return: the metadata.
+    :rtype: dict
+    """
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.realpath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold, min_difference=1e-6):
+    """Compare the median latencies of results against a baseline.
+
+    :param results: the benchmark results.
+    :type results: dict
+    :param baseline: the baseline benchmark results.
+    :type baseline: dict
+    :param threshold: the maximum ratio of latency to baseline latency.
+    :type threshold: float
+    :param min_difference: the minimum difference of latency to baseline
+        latency of a regression, in seconds.
+    :type min_difference: float
+    :return: the names of benchmarks slower than both the threshold and
+        the minimum difference.
+    :rtype: list
+    """
+    regressions = []
+
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+
+        if base is None:
+            continue
+
+        latency = result["median_latency_s"]
+        base_latency = base["median_latency_s"]
+        ratio = latency / base_latency
+        regression = (
+            ratio > threshold and latency - base_latency > min_difference
+        )
+        print(
+            "%-28s %8.2fx %+12.3f us %s"
+            % (
+                name,
+                ratio,
+                (latency - base_latency) * 1e6,
+                "REGRESSION" if regression else "",
+            )
+        )
+
+        if regression:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(args):
+    """main method."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for the codon module."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=_SIZES,
+        help="synthetic proteome sizes, in residues",
+    )
+    parser.add_argument("--output", help="JSON file to save results to")
+    parser.add_argument("--baseline", help="JSON baseline to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="maximum median latency ratio to the baseline",
+    )
+    parser.add_argument(
+        "--min-difference",
+        type=float,
+        default=1.0,
+        help="minimum median latency difference to the baseline of a "
+        "regression, in us",
+    )
+    params = parser.parse_args(args)
+
+    tmp_dir = _setup_cache()
+    results = {"metadata": _get_metadata(), "results": {}}
+
+    try:
+        for name, func, items, unit in _get_benchmarks(params.sizes):
+            result = _measure(func, items)
+            result["unit"] = unit
+            results["results"][name] = result
+            print(
+                "%-28s %12.3f us %14.0f %s/s %10.1f KiB"
+                % (
+                    name,
+                    result["latency_s"] * 1e6,
+                    result["throughput_per_s"],
+                    unit,
+                    result["peak_memory_bytes"] / 1024,
+                )
+            )
+    finally:
+        tmp_dir.cleanup()
+
+    if params.output:
+        with open(params.output, "w") as fle:
+            json.dump(results, fle, indent=2)
+
+    if params.baseline:
+        with open(params.baseline) as fle:
+            baseline = json.load(fle)
+
+        if compare(
+            results,
+            baseline,
+            params.threshold,
+            params.min_difference * 1e-6,
+        ):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
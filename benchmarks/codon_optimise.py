@@ -0,0 +1,50 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+Benchmark of codon.utils.optimise against the original per-residue loop.
+
+Usage: python benchmarks/codon_optimise.py [table_id] [length]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from synbiopython.codon import table, utils
+
+_AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def _optimise_loop(codon_table, aa_seq):
+    """The original implementation: one random draw per residue."""
+    return "".join([utils.sample(codon_table, aa) for aa in aa_seq])
+
+
+def main(args):
+    """main method."""
+    table_id = args[0] if args else "Escherichia coli"
+    length = int(args[1]) if len(args) > 1 else 100000
+
+    codon_table = table.get_table(table_id)
+    rng = np.random.default_rng(0)
+    aa_seq = "".join(rng.choice(list(_AMINO_ACIDS), size=length))
+    compiled = utils.CompiledCodonTable(codon_table)
+
+    for name, func in [
+        ("loop", lambda: _optimise_loop(codon_table, aa_seq)),
+        ("optimise (dict)", lambda: utils.optimise(codon_table, aa_seq)),
+        ("optimise (compiled)", lambda: utils.optimise(compiled, aa_seq)),
+    ]:
+        secs = min(timeit.repeat(func, number=1, repeat=5))
+        print(
+            "%-20s %10.2f ms %14.0f residues/s"
+            % (name, secs * 1000, length / secs)
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
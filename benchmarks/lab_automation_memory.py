@@ -0,0 +1,128 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+Memory benchmark of the slotted lab_automation classes (CompactWell,
+CompactWellContent and CompactTransfer) and of the generic ones (Well,
+WellContent and Transfer), against the attribute layout of the generic
+classes before the compact classes were introduced: dict-based instances,
+with the data dict and sources list of wells created eagerly.
+
+Usage: python benchmarks/lab_automation_memory.py [num_instances]
+"""
+import sys
+import tracemalloc
+
+from synbiopython.lab_automation.containers.Well import CompactWell, Well
+from synbiopython.lab_automation.containers.WellContent import (
+    CompactWellContent,
+    WellContent,
+)
+from synbiopython.lab_automation.picklist.Transfer import (
+    CompactTransfer,
+    Transfer,
+)
+
+
+class _BaselineWellContent:
+    """Attribute layout of the original WellContent."""
+
+    def __init__(self, quantities=None, volume=0):
+        if quantities is None:
+            quantities = {}
+        self.volume = volume
+        self.quantities = quantities
+
+
+class _BaselineWell:
+    """Attribute layout of the original Well."""
+
+    def __init__(self, plate, row, column, name, data=None):
+        self.plate = plate
+        self.row = row
+        self.column = column
+        self.name = name
+        self.data = data or {}
+        self.sources = []
+        self.content = _BaselineWellContent()
+
+
+class _BaselineTransfer:
+    """Attribute layout of the original Transfer."""
+
+    def __init__(self, source_well, destination_well, volume, data=None):
+        self.volume = volume
+        self.source_well = source_well
+        self.destination_well = destination_well
+        self.data = data
+
+
+def _measure(factory, num_instances):
+    """Measure the memory allocated per instance, as traced by tracemalloc.
+
+    :param factory: a function creating an instance from its index.
+    :type factory: function
+    :param num_instances: the number of instances.
+    :type num_instances: int
+    :return: the number of bytes per instance.
+    :rtype: float
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [factory(idx) for idx in range(num_instances)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del instances
+    return size / num_instances
+
+
+def main(args):
+    """main method."""
+    num_instances = int(args[0]) if args else 10 ** 6
+    well = Well(None, 1, 1, "A1")
+
+    print(
+        "%-12s %10s %10s %10s %16s"
+        % ("", "baseline", "generic", "compact", "saved (compact)")
+    )
+
+    for name, baseline, generic, compact in [
+        (
+            "Well",
+            lambda idx: _BaselineWell(None, 1, idx, "A1"),
+            lambda idx: Well(None, 1, idx, "A1"),
+            lambda idx: CompactWell(None, 1, idx, "A1"),
+        ),
+        (
+            "WellContent",
+            lambda idx: _BaselineWellContent(volume=idx),
+            lambda idx: WellContent(volume=idx),
+            lambda idx: CompactWellContent(volume=idx),
+        ),
+        (
+            "Transfer",
+            lambda idx: _BaselineTransfer(well, well, idx),
+            lambda idx: Transfer(well, well, idx),
+            lambda idx: CompactTransfer(well, well, idx),
+        ),
+    ]:
+        baseline_size = _measure(baseline, num_instances)
+        generic_size = _measure(generic, num_instances)
+        compact_size = _measure(compact, num_instances)
+        print(
+            "%-12s %8.1f B %8.1f B %8.1f B %15.1f%%"
+            % (
+                name,
+                baseline_size,
+                generic_size,
+                compact_size,
+                100 * (1 - compact_size / baseline_size),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -10,3 +10,5 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 import os.path
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".synbiopython", "codon")
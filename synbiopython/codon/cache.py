@@ -0,0 +1,112 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from collections import OrderedDict, namedtuple
+import threading
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+class LRUCache:
+    """A bounded, thread-safe, least-recently-used cache.
+
+    Each entry is stored with a stamp (for instance, the modification time of
+    the file it was read from). Looking an entry up with a different stamp
+    counts as a miss and drops the stale entry.
+
+    :param maxsize: the maximum number of entries.
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key, stamp=None):
+        """Gets a value from the cache.
+
+        :param key: the key.
+        :type key: hashable
+        :param stamp: the current stamp of the value's source.
+        :type stamp: hashable
+        :return: the cached value, or None if absent or stale.
+        :rtype: object
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None or entry[0] != stamp:
+                self.__entries.pop(key, None)
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def put(self, key, value, stamp=None):
+        """Puts a value into the cache, evicting the least recently used
+        entries if the cache is full.
+
+        :param key: the key.
+        :type key: hashable
+        :param value: the value.
+        :type value: object
+        :param stamp: the current stamp of the value's source.
+        :type stamp: hashable
+        """
+        with self.__lock:
+            self.__entries[key] = (stamp, value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def resize(self, maxsize):
+        """Sets the maximum number of entries, evicting entries if required.
+
+        :param maxsize: the maximum number of entries.
+        :type maxsize: int
+        """
+        with self.__lock:
+            self.maxsize = maxsize
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def info(self):
+        """Gets the cache statistics.
+
+        :return: the hits, misses, evictions, maximum size and current size.
+        :rtype: CacheInfo
+        """
+        with self.__lock:
+            return CacheInfo(
+                self.__hits,
+                self.__misses,
+                self.__evictions,
+                self.maxsize,
+                len(self.__entries),
+            )
@@ -0,0 +1,207 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from synbiopython.codon.codons import (
+    AMINO_ACIDS,
+    CODON_INDEX,
+    CODONS,
+    RNA_CODONS,
+)
+
+_RNA_CODON_INDEX = {codon: idx for idx, codon in enumerate(RNA_CODONS)}
+
+
+class CodonArray:
+    """A codon usage table (or a stack of these) as an array of 64 values per
+    table, indexed as codons.CODONS.
+
+    Codons absent from a table have a value of NaN. The amino acid encoded
+    by each codon is held in amino_acids, which defaults to the standard
+    genetic code.
+
+    :param values: an array of shape (..., 64).
+    :type values: numpy.ndarray
+    :param amino_acids: an array of the amino acid encoded by each codon.
+    :type amino_acids: numpy.ndarray
+    """
+
+    def __init__(self, values, amino_acids=AMINO_ACIDS):
+        self.values = np.asarray(values, dtype=float)
+        self.amino_acids = np.asarray(amino_acids)
+
+        if self.values.shape[-1:] != (len(CODONS),):
+            raise ValueError(
+                "Expected %d values per table, got shape %s"
+                % (len(CODONS), self.values.shape)
+            )
+
+    @classmethod
+    def from_dict(cls, table):
+        """Creates a CodonArray from a codon usage table.
+
+        :param table: a codon usage table, with DNA or RNA codons.
+        :type table: dict
+        :return: the CodonArray.
+        :rtype: CodonArray
+        """
+        values = np.full(len(CODONS), np.nan)
+        amino_acids = AMINO_ACIDS.copy()
+
+        for amino_acid, codon_freqs in table.items():
+            for codon, freq in codon_freqs.items():
+                idx = CODON_INDEX[codon.upper().replace("U", "T")]
+                values[idx] = freq
+                amino_acids[idx] = amino_acid
+
+        if (amino_acids == AMINO_ACIDS).all():
+            amino_acids = AMINO_ACIDS
+
+        return cls(values, amino_acids)
+
+    @property
+    def dna(self):
+        """Gets a mapping of DNA codon to value, sharing memory with values.
+
+        :return: the mapping.
+        :rtype: CodonView
+        """
+        return CodonView(self.values, CODON_INDEX)
+
+    @property
+    def rna(self):
+        """Gets a mapping of RNA codon to value, sharing memory with values.
+
+        :return: the mapping.
+        :rtype: CodonView
+        """
+        return CodonView(self.values, _RNA_CODON_INDEX)
+
+    @property
+    def shape(self):
+        """Gets the shape of the stack of tables.
+
+        :return: the shape, excluding the codon axis.
+        :rtype: tuple
+        """
+        return self.values.shape[:-1]
+
+    def normalise(self):
+        """Normalises values to sum to 1 over the codons of each amino acid.
+
+        :return: a new, normalised CodonArray.
+        :rtype: CodonArray
+        """
+        groups = np.unique(self.amino_acids, return_inverse=True)[1]
+        values = np.nan_to_num(self.values)
+        totals = np.zeros(self.shape + (groups.max() + 1,))
+
+        for group in range(totals.shape[-1]):
+            totals[..., group] = values[..., groups == group].sum(axis=-1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return CodonArray(
+                self.values / totals[..., groups], self.amino_acids
+            )
+
+    def to_dict(self, dna=True):
+        """Converts a single table to a codon usage table.
+
+        :param dna: boolean parameter specifying whether the codon table
+            returned should contain DNA or RNA codons.
+        :type dna: bool
+        :return: a codon usage table, in which the codons of each amino acid
+            are in order of increasing value.
+        :rtype: dict
+        """
+        if self.shape:
+            raise ValueError("Cannot convert a stack of tables to a dict")
+
+        codons = CODONS if dna else RNA_CODONS
+        table = {}
+
+        entries = sorted(
+            (amino_acid, value, codon)
+            for codon, amino_acid, value in zip(
+                codons, self.amino_acids.tolist(), self.values.tolist()
+            )
+            if not np.isnan(value)
+        )
+
+        for amino_acid, value, codon in entries:
+            table.setdefault(amino_acid, {})[codon] = value
+
+        return table
+
+    def __getitem__(self, key):
+        return CodonArray(self.values[key], self.amino_acids)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return "CodonArray(%r)" % self.values
+
+
+class CodonView(MutableMapping):
+    """A mapping of codon to value, backed by an array of 64 values per table.
+
+    Values of a stack of tables are returned, and set, as arrays.
+
+    :param values: an array of shape (..., 64).
+    :type values: numpy.ndarray
+    :param codon_index: a dict of codon to its index in the last axis of
+        values.
+    :type codon_index: dict
+    """
+
+    def __init__(self, values, codon_index):
+        self.values = values
+        self.codon_index = codon_index
+
+    def __getitem__(self, codon):
+        return self.values[..., self.codon_index[codon]]
+
+    def __setitem__(self, codon, value):
+        self.values[..., self.codon_index[codon]] = value
+
+    def __delitem__(self, codon):
+        raise TypeError("Codons cannot be deleted from a CodonView")
+
+    def __iter__(self):
+        return iter(self.codon_index)
+
+    def __len__(self):
+        return len(self.codon_index)
+
+    def __contains__(self, codon):
+        return codon in self.codon_index
+
+
+def stack(arrays):
+    """Stacks CodonArrays, which must share a genetic code, along a new first
+    axis.
+
+    :param arrays: an iterable of CodonArrays.
+    :type arrays: iterable
+    :return: the stacked CodonArray.
+    :rtype: CodonArray
+    """
+    arrays = list(arrays)
+
+    for array in arrays[1:]:
+        if not np.array_equal(array.amino_acids, arrays[0].amino_acids):
+            raise ValueError("Cannot stack tables of different genetic codes")
+
+    return CodonArray(
+        np.stack([array.values for array in arrays]), arrays[0].amino_acids
+    )
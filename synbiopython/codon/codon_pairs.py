@@ -0,0 +1,214 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import itertools
+
+import numpy as np
+
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.codons import CODONS, to_codon_indices
+from synbiopython.codon.genetic_code import get_genetic_code
+from synbiopython.codon.table import get_coding_sequences
+
+_NUM_PAIRS = len(CODONS) ** 2
+
+
+def count_codon_pairs(sequences, fmt=None, batch_size=1000):
+    """Counts the pairs of adjacent codons of coding sequences, streaming
+    sequences in batches so that memory use is bounded by the batch size.
+
+    :param sequences: a FASTA or GenBank filename (optionally gzipped) or
+        file handle, or an iterable of coding sequences (see
+        table.get_coding_sequences).
+    :type sequences: str or iterable
+    :param fmt: the file format, fasta or genbank (default is None, which
+        infers the format from the file extension).
+    :type fmt: str
+    :param batch_size: the number of sequences counted at once.
+    :type batch_size: int
+    :return: an array of shape (64, 64), counting each pair of first codon
+        (rows) and second codon (columns), indexed as codons.CODONS.
+    :rtype: numpy.ndarray
+    """
+    counts = np.zeros(_NUM_PAIRS, dtype=np.int64)
+    seqs = get_coding_sequences(sequences, fmt)
+
+    while True:
+        batch = list(itertools.islice(seqs, batch_size))
+
+        if not batch:
+            break
+
+        pair_idxs, _ = _to_pair_indices(batch)
+        counts += np.bincount(pair_idxs[pair_idxs >= 0], minlength=_NUM_PAIRS)
+
+    return counts.reshape(len(CODONS), len(CODONS))
+
+
+def codon_pair_scores(pair_counts, genetic_code=1, pseudocount=0.5):
+    """Calculates the codon pair score (CPS) of each pair of codons: the log
+    ratio of its observed count to the count expected from the frequencies
+    of its codons and of its pair of amino acids, as described by Coleman et
+    al. (2008), Science 320:1784.
+
+    :param pair_counts: an array of codon pair counts, of shape (64, 64).
+    :type pair_counts: numpy.ndarray
+    :param genetic_code: the genetic code (default is 1, the standard code).
+    :type genetic_code: int or str or GeneticCode
+    :param pseudocount: a count added to observed and expected counts, so
+        that unobserved pairs have finite scores.
+    :type pseudocount: float
+    :return: an array of codon pair scores, of shape (64, 64).
+    :rtype: numpy.ndarray
+    """
+    amino_acids = get_genetic_code(genetic_code).amino_acids
+    groups = np.unique(amino_acids, return_inverse=True)[1]
+    membership = np.zeros((len(CODONS), groups.max() + 1))
+    membership[np.arange(len(CODONS)), groups] = 1
+
+    pair_counts = np.asarray(pair_counts, dtype=float)
+    first_counts = pair_counts.sum(axis=1)
+    second_counts = pair_counts.sum(axis=0)
+    aa_pair_counts = membership.T @ pair_counts @ membership
+    first_aa_counts = (first_counts @ membership)[groups]
+    second_aa_counts = (second_counts @ membership)[groups]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        expected = np.nan_to_num(
+            np.outer(
+                first_counts / first_aa_counts,
+                second_counts / second_aa_counts,
+            )
+            * aa_pair_counts[np.ix_(groups, groups)]
+        )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.log(
+            (pair_counts + pseudocount) / (expected + pseudocount)
+        )
+
+    # Pairs neither observed nor expected are unbiased:
+    scores[(pair_counts == 0) & (expected == 0)] = 0
+    return scores
+
+
+def cpb(sequences, pair_scores):
+    """Calculates the codon pair bias (CPB) of one or many sequences: the
+    mean codon pair score of their pairs of adjacent codons.
+
+    :param sequences: a nucleic acid sequence, or a list of these.
+    :type sequences: str or list
+    :param pair_scores: an array of codon pair scores, of shape (64, 64).
+    :type pair_scores: numpy.ndarray
+    :return: the codon pair bias of the sequence (as a float), or of each
+        sequence (as an array). Sequences with no unambiguous codon pairs
+        score NaN.
+    :rtype: float or numpy.ndarray
+    """
+    if isinstance(sequences, str):
+        return float(cpb([sequences], pair_scores)[0])
+
+    pair_idxs, seq_ids = _to_pair_indices(sequences)
+    valid = pair_idxs >= 0
+    scores = np.asarray(pair_scores).ravel()[pair_idxs[valid]]
+    totals = np.bincount(
+        seq_ids[valid], weights=scores, minlength=len(sequences)
+    )
+    counts = np.bincount(seq_ids[valid], minlength=len(sequences))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts
+
+
+def optimise(table, aa_seq, pair_scores, weight=1.0):
+    """Codon optimise an amino acid sequence for both codon usage and codon
+    pair bias.
+
+    The codon sequence maximising the sum of the log frequencies of its
+    codons and the weighted scores of its codon pairs is found with a
+    Viterbi pass whose states are the codons of the current amino acid, in
+    time linear in the sequence length.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :param aa_seq: an amino acid sequence.
+    :type aa_seq: str
+    :param pair_scores: an array of codon pair scores, of shape (64, 64).
+    :type pair_scores: numpy.ndarray
+    :param weight: the weight of codon pair scores relative to log codon
+        frequencies (default is 1.0; 0.0 ignores codon pairs).
+    :type weight: float
+    :return: a codon-optimised nucleic acid sequence, encoding the supplied
+        amino acid sequence
+    :rtype: str
+    """
+    codon_freqs = CodonArray.from_dict(table)
+    aa_codons = {}
+
+    for amino_acid in table:
+        idxs = np.flatnonzero(codon_freqs.amino_acids == amino_acid)
+        idxs = idxs[~np.isnan(codon_freqs.values[idxs])]
+        freqs = codon_freqs.values[idxs]
+        freqs = np.maximum(freqs / max(freqs.sum(), 1e-12), 1e-6)
+        aa_codons[amino_acid] = idxs, np.log(freqs)
+
+    pair_scores = weight * np.asarray(pair_scores)
+    positions = []
+    back_pointers = []
+    scores = None
+
+    for amino_acid in aa_seq:
+        idxs, log_freqs = aa_codons[amino_acid]
+
+        if positions:
+            # Best previous codon for each current codon:
+            totals = scores[:, None] + pair_scores[np.ix_(positions[-1], idxs)]
+            best = np.argmax(totals, axis=0)
+            back_pointers.append(best)
+            scores = totals[best, np.arange(len(idxs))] + log_freqs
+        else:
+            scores = log_freqs
+
+        positions.append(idxs)
+
+    # Trace back from the best final codon:
+    codons = []
+    idx = int(np.argmax(scores)) if aa_seq else 0
+
+    for pos in range(len(aa_seq) - 1, -1, -1):
+        codons.append(CODONS[positions[pos][idx]])
+
+        if pos:
+            idx = back_pointers[pos - 1][idx]
+
+    return "".join(reversed(codons))
+
+
+def _to_pair_indices(sequences):
+    """Convert many sequences to the indices of their pairs of adjacent
+    codons (64 * first codon index + second codon index) in one pass.
+
+    :param sequences: a list of nucleic acid sequences.
+    :type sequences: list
+    :return: the pair indices of all sequences, concatenated, with -1 for
+        pairs that span two sequences or include an ambiguous codon, and the
+        index of the sequence of each pair.
+    :rtype: tuple
+    """
+    lengths = np.array([len(seq) // 3 for seq in sequences], dtype=np.int64)
+    idxs = to_codon_indices(
+        "".join(seq[: length * 3] for seq, length in zip(sequences, lengths))
+    ).astype(np.int64)
+    seq_ids = np.repeat(np.arange(len(sequences)), lengths)
+
+    pair_idxs = idxs[:-1] * len(CODONS) + idxs[1:]
+    invalid = (idxs[:-1] < 0) | (idxs[1:] < 0) | (seq_ids[:-1] != seq_ids[1:])
+    pair_idxs[invalid] = -1
+
+    return pair_idxs, seq_ids[:-1]
@@ -0,0 +1,70 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import itertools
+
+import numpy as np
+
+# The 64 DNA codons, in a canonical (lexicographic, ACGT) order:
+CODONS = ["".join(bases) for bases in itertools.product("ACGT", repeat=3)]
+
+CODON_INDEX = {codon: idx for idx, codon in enumerate(CODONS)}
+
+# The 64 RNA codons, in the same order:
+RNA_CODONS = [codon.replace("T", "U") for codon in CODONS]
+
+# The standard genetic code (NCBI translation table 1), as listed by NCBI:
+_NCBI_AAS = "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"
+
+STANDARD_CODE = {
+    "".join(bases): amino_acid
+    for bases, amino_acid in zip(
+        itertools.product("TCAG", repeat=3), _NCBI_AAS
+    )
+}
+
+# The amino acid encoded by each codon of CODONS, under the standard code:
+AMINO_ACIDS = np.array([STANDARD_CODE[codon] for codon in CODONS])
+AMINO_ACIDS.flags.writeable = False
+
+# Lookup from nucleotide (as an ASCII code) to 0-3, with 4 for other symbols:
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+
+for _code, _bases in enumerate(["Aa", "Cc", "Gg", "TtUu"]):
+    for _base in _bases:
+        _BASE_CODES[ord(_base)] = _code
+
+
+def encode(seq):
+    """Encode a nucleic acid sequence as an array of nucleotide codes: 0-3
+    for A, C, G and T (or U), and 4 for any other symbol.
+
+    :param seq: a nucleic acid sequence.
+    :type seq: str
+    :return: the nucleotide codes.
+    :rtype: numpy.ndarray
+    """
+    return _BASE_CODES[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+
+
+def to_codon_indices(seq):
+    """Convert a nucleic acid sequence into the indices (in CODONS) of its
+    codons, read in frame from the first nucleotide. Codons containing
+    symbols other than A, C, G, T or U are given the index -1, and trailing
+    nucleotides are ignored.
+
+    :param seq: a nucleic acid sequence.
+    :type seq: str
+    :return: the codon indices.
+    :rtype: numpy.ndarray
+    """
+    codes = encode(seq[: len(seq) // 3 * 3]).reshape(-1, 3).astype(np.int16)
+    idxs = codes[:, 0] * 16 + codes[:, 1] * 4 + codes[:, 2]
+    idxs[(codes == 4).any(axis=1)] = -1
+    return idxs
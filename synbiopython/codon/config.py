@@ -0,0 +1,140 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+Configuration of the local codon cache.
+
+Codon usage tables are looked up in layers: first in shared, read-only
+directories (for instance, a prebuilt store on a local disk of a cluster
+node), then in a per-user writable cache, and finally downloaded into the
+writable cache, unless in offline mode.
+
+Each setting is taken from the API, if set, or else from an environment
+variable:
+
+* ``SYNBIOPYTHON_CODON_CACHE``: the writable cache directory (default is
+  ``~/.synbiopython/codon``).
+* ``SYNBIOPYTHON_CODON_SHARED_CACHE``: read-only cache directories,
+  separated by ``os.pathsep``.
+* ``SYNBIOPYTHON_CODON_OFFLINE``: set to 1 (or true, or yes) to raise a
+  ConnectionError rather than download tables.
+
+@author: neilswainston
+"""
+import os
+
+from synbiopython.codon import CACHE_DIR
+
+CACHE_ENV = "SYNBIOPYTHON_CODON_CACHE"
+SHARED_CACHE_ENV = "SYNBIOPYTHON_CODON_SHARED_CACHE"
+OFFLINE_ENV = "SYNBIOPYTHON_CODON_OFFLINE"
+
+STORE_FILENAME = "codon_usage.db"
+
+_SETTINGS = {}
+
+
+def get_cache_dir():
+    """Gets the writable cache directory.
+
+    :return: the writable cache directory.
+    :rtype: str
+    """
+    cache_dir = _SETTINGS.get("cache_dir")
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_ENV) or CACHE_DIR
+
+    return os.path.expanduser(cache_dir)
+
+
+def set_cache_dir(cache_dir):
+    """Sets the writable cache directory.
+
+    :param cache_dir: the writable cache directory, or None to revert to the
+        environment variable or default.
+    :type cache_dir: str
+    """
+    _SETTINGS["cache_dir"] = cache_dir
+
+
+def get_shared_dirs():
+    """Gets the read-only cache directories, in order of lookup.
+
+    :return: the read-only cache directories.
+    :rtype: list
+    """
+    shared_dirs = _SETTINGS.get("shared_dirs")
+
+    if shared_dirs is None:
+        shared_dirs = os.environ.get(SHARED_CACHE_ENV, "").split(os.pathsep)
+
+    return [
+        os.path.expanduser(dir_name) for dir_name in shared_dirs if dir_name
+    ]
+
+
+def set_shared_dirs(shared_dirs):
+    """Sets the read-only cache directories.
+
+    :param shared_dirs: the read-only cache directories, in order of lookup,
+        or None to revert to the environment variable.
+    :type shared_dirs: list
+    """
+    _SETTINGS["shared_dirs"] = (
+        None if shared_dirs is None else list(shared_dirs)
+    )
+
+
+def is_offline():
+    """Gets whether in offline mode, in which tables are never downloaded.
+
+    :return: whether in offline mode.
+    :rtype: bool
+    """
+    offline = _SETTINGS.get("offline")
+
+    if offline is None:
+        offline = os.environ.get(OFFLINE_ENV, "").lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+
+    return offline
+
+
+def set_offline(offline):
+    """Sets whether in offline mode, in which tables are never downloaded.
+
+    :param offline: whether in offline mode, or None to revert to the
+        environment variable.
+    :type offline: bool
+    """
+    _SETTINGS["offline"] = offline
+
+
+def get_store_path():
+    """Gets the path of the codon usage store of the writable cache.
+
+    :return: the path of the codon usage store.
+    :rtype: str
+    """
+    return os.path.join(get_cache_dir(), STORE_FILENAME)
+
+
+def get_shared_store_paths():
+    """Gets the paths of the existing codon usage stores of the read-only
+    cache directories, in order of lookup.
+
+    :return: the paths of the codon usage stores.
+    :rtype: list
+    """
+    paths = [
+        os.path.join(dir_name, STORE_FILENAME)
+        for dir_name in get_shared_dirs()
+    ]
+    return [path for path in paths if os.path.exists(path)]
@@ -0,0 +1,322 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from collections import deque
+
+import numpy as np
+
+from synbiopython.codon.codons import CODON_INDEX, CODONS, encode
+
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+# The GC count of each codon:
+_CODON_GC = np.array([sum(base in "GC" for base in codon) for codon in CODONS])
+
+
+class MotifAutomaton:
+    """An Aho-Corasick automaton recognising a set of DNA motifs.
+
+    States are nodes of a trie of the motifs. Reading a nucleotide moves to
+    the state of the longest motif prefix that is a suffix of the sequence
+    read so far, and a state is forbidden if that suffix ends with a motif.
+
+    :param motifs: an iterable of DNA motifs.
+    :type motifs: iterable
+    """
+
+    def __init__(self, motifs):
+        children = [{}]
+        forbidden = [False]
+
+        for motif in motifs:
+            state = 0
+
+            for base in encode(motif.upper()):
+                if base > 3:
+                    raise ValueError("Invalid motif: %s" % motif)
+
+                if base not in children[state]:
+                    children[state][base] = len(children)
+                    children.append({})
+                    forbidden.append(False)
+
+                state = children[state][base]
+
+            forbidden[state] = True
+
+        # Breadth-first construction of failure links and transitions:
+        self.transitions = np.zeros((len(children), 4), dtype=np.int64)
+        self.forbidden = np.array(forbidden)
+        failures = [0] * len(children)
+        queue = deque()
+
+        for base in range(4):
+            child = children[0].get(base)
+
+            if child is not None:
+                self.transitions[0, base] = child
+                queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            self.forbidden[state] |= self.forbidden[failures[state]]
+
+            for base in range(4):
+                child = children[state].get(base)
+
+                if child is None:
+                    self.transitions[state, base] = self.transitions[
+                        failures[state], base
+                    ]
+                else:
+                    failures[child] = self.transitions[failures[state], base]
+                    self.transitions[state, base] = child
+                    queue.append(child)
+
+    def codon_transitions(self):
+        """Gets the state reached from each state by reading each codon.
+
+        :return: an array of shape (number of states, 64), with -1 where a
+            forbidden state is reached.
+        :rtype: numpy.ndarray
+        """
+        states = np.arange(len(self.transitions))
+        result = np.empty((len(states), len(CODONS)), dtype=np.int64)
+
+        for idx, codon in enumerate(CODONS):
+            current = states
+            valid = np.ones(len(states), dtype=bool)
+
+            for base in encode(codon):
+                current = self.transitions[current, base]
+                valid &= ~self.forbidden[current]
+
+            result[:, idx] = np.where(valid, current, -1)
+
+        return result
+
+
+def get_motifs(forbidden=(), both_strands=True, max_homopolymer=None):
+    """Gets the full set of forbidden motifs.
+
+    :param forbidden: an iterable of forbidden DNA motifs.
+    :type forbidden: iterable
+    :param both_strands: whether to also forbid the reverse complements of the
+        motifs (default is True).
+    :type both_strands: bool
+    :param max_homopolymer: the maximum length of runs of a single nucleotide
+        (default is None, for no limit).
+    :type max_homopolymer: int
+    :return: the forbidden motifs.
+    :rtype: list
+    """
+    motifs = {motif.upper() for motif in forbidden}
+
+    if both_strands:
+        motifs |= {motif.translate(_COMPLEMENT)[::-1] for motif in motifs}
+
+    if max_homopolymer is not None:
+        motifs |= {base * (max_homopolymer + 1) for base in "ACGT"}
+
+    return sorted(motifs)
+
+
+def optimise(
+    table,
+    aa_seq,
+    forbidden=(),
+    both_strands=True,
+    max_homopolymer=None,
+    gc_window=None,
+    gc_range=(0.0, 1.0),
+    max_iter=50,
+):
+    """Codon optimise an amino acid sequence, avoiding forbidden motifs and
+    keeping GC content within bounds.
+
+    The most likely codon sequence under the codon usage table is found with
+    a Viterbi pass over the states of an Aho-Corasick automaton of the
+    forbidden motifs, in time linear in the sequence length. GC content
+    bounds are enforced with per-position Lagrangian penalties on GC
+    content, which are adjusted over the windows out of bounds, repeating the
+    Viterbi pass until all windows are within bounds (or raising a
+    ValueError after max_iter passes).
+
+    :param table: a codon usage table.
+    :type table: dict
+    :param aa_seq: an amino acid sequence.
+    :type aa_seq: str
+    :param forbidden: an iterable of forbidden DNA motifs, such as
+        restriction sites.
+    :type forbidden: iterable
+    :param both_strands: whether to also forbid the reverse complements of the
+        motifs (default is True).
+    :type both_strands: bool
+    :param max_homopolymer: the maximum length of runs of a single nucleotide
+        (default is None, for no limit).
+    :type max_homopolymer: int
+    :param gc_window: the size of windows, in nucleotides, over which GC
+        content is bounded (default is None, for no bounds).
+    :type gc_window: int
+    :param gc_range: the minimum and maximum GC content (as fractions) of
+        each window.
+    :type gc_range: tuple
+    :param max_iter: the maximum number of Viterbi passes used to satisfy the
+        GC content bounds.
+    :type max_iter: int
+    :return: a codon-optimised nucleic acid sequence, encoding the supplied
+        amino acid sequence
+    :rtype: str
+    """
+    automaton = MotifAutomaton(
+        get_motifs(forbidden, both_strands, max_homopolymer)
+    )
+    codon_transitions = automaton.codon_transitions()
+    aa_codons = _get_aa_codons(table)
+    penalties = np.zeros(len(aa_seq))
+
+    for iteration in range(max_iter):
+        bonuses = penalties[:, None] * _CODON_GC
+        codon_idxs = _viterbi(aa_seq, aa_codons, codon_transitions, bonuses)
+
+        if gc_window is None or 3 * len(aa_seq) < gc_window:
+            break
+
+        # Adjust penalties of positions in windows out of bounds:
+        low, high = _get_gc_violations(codon_idxs, gc_window, gc_range)
+
+        if not low.any() and not high.any():
+            break
+
+        # Diminishing steps, to avoid oscillating between violations:
+        step = 0.5 / (1 + iteration / 5)
+        penalties += step * (low.astype(float) - high)
+    else:
+        raise ValueError(
+            "Unable to satisfy GC content bounds in %d iterations" % max_iter
+        )
+
+    return "".join(CODONS[idx] for idx in codon_idxs)
+
+
+def _get_aa_codons(table):
+    """Gets the codon indices and log frequencies of each amino acid.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :return: a dict of amino acid to (codon indices, log frequencies).
+    :rtype: dict
+    """
+    aa_codons = {}
+
+    for amino_acid, codon_freqs in table.items():
+        idxs = np.array(
+            [CODON_INDEX[codon.replace("U", "T")] for codon in codon_freqs]
+        )
+        freqs = np.array(list(codon_freqs.values()), dtype=float)
+        freqs = np.maximum(freqs / max(freqs.sum(), 1e-12), 1e-6)
+        aa_codons[amino_acid] = idxs, np.log(freqs)
+
+    return aa_codons
+
+
+def _viterbi(aa_seq, aa_codons, codon_transitions, bonuses):
+    """Finds the highest scoring codon sequence that never enters a
+    forbidden state.
+
+    :param aa_seq: an amino acid sequence.
+    :type aa_seq: str
+    :param aa_codons: a dict of amino acid to (codon indices, log
+        frequencies).
+    :type aa_codons: dict
+    :param codon_transitions: the automaton state reached from each state by
+        reading each codon, or -1 if forbidden.
+    :type codon_transitions: numpy.ndarray
+    :param bonuses: an array of shape (sequence length, 64) of scores added to
+        each codon at each position.
+    :type bonuses: numpy.ndarray
+    :return: the codon indices.
+    :rtype: numpy.ndarray
+    """
+    states = np.array([0])
+    scores = np.array([0.0])
+    back_pointers = []
+
+    for pos, amino_acid in enumerate(aa_seq):
+        codon_idxs, log_freqs = aa_codons[amino_acid]
+
+        # Score every (active state, codon) transition:
+        prev = np.repeat(np.arange(len(states)), len(codon_idxs))
+        codons = np.tile(np.arange(len(codon_idxs)), len(states))
+        nxt = codon_transitions[states[prev], codon_idxs[codons]]
+        vals = (
+            scores[prev]
+            + log_freqs[codons]
+            + bonuses[pos, codon_idxs[codons]]
+        )
+
+        valid = nxt >= 0
+        prev, codons = prev[valid], codons[valid]
+        nxt, vals = nxt[valid], vals[valid]
+
+        if not len(nxt):
+            raise ValueError(
+                "No codon sequence avoids the forbidden motifs at position "
+                "%d (%s)" % (pos, amino_acid)
+            )
+
+        # Keep the best transition into each state:
+        order = np.lexsort((-vals, nxt))
+        first = np.concatenate([[True], nxt[order][1:] != nxt[order][:-1]])
+        best = order[first]
+
+        back_pointers.append((prev[best], codon_idxs[codons[best]]))
+        states, scores = nxt[best], vals[best]
+
+    # Trace back from the best final state:
+    result = np.empty(len(aa_seq), dtype=np.int64)
+    idx = int(np.argmax(scores)) if len(aa_seq) else 0
+
+    for pos in range(len(aa_seq) - 1, -1, -1):
+        prev, codon_idxs = back_pointers[pos]
+        result[pos] = codon_idxs[idx]
+        idx = prev[idx]
+
+    return result
+
+
+def _get_gc_violations(codon_idxs, gc_window, gc_range):
+    """Finds the codon positions within windows of GC content out of bounds.
+
+    :param codon_idxs: the codon indices.
+    :type codon_idxs: numpy.ndarray
+    :param gc_window: the window size, in nucleotides.
+    :type gc_window: int
+    :param gc_range: the minimum and maximum GC content of each window.
+    :type gc_range: tuple
+    :return: boolean arrays flagging codon positions within windows below and
+        above the bounds.
+    :rtype: tuple
+    """
+    seq = "".join(CODONS[idx] for idx in codon_idxs)
+    is_gc = np.isin(encode(seq), [1, 2])
+    cum_gc = np.concatenate([[0], np.cumsum(is_gc)])
+    gc = (cum_gc[gc_window:] - cum_gc[:-gc_window]) / gc_window
+
+    flags = []
+
+    for out_of_bounds in [gc < gc_range[0], gc > gc_range[1]]:
+        # Mark nucleotides covered by windows out of bounds, then codons:
+        starts = np.zeros(len(seq) + 1, dtype=np.int64)
+        np.add.at(starts, np.flatnonzero(out_of_bounds), 1)
+        np.add.at(starts, np.flatnonzero(out_of_bounds) + gc_window, -1)
+        covered = np.cumsum(starts)[:-1] > 0
+        flags.append(covered.reshape(-1, 3).any(axis=1))
+
+    return tuple(flags)
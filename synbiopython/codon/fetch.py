@@ -0,0 +1,343 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import os.path
+import tempfile
+import threading
+from urllib.error import URLError
+from urllib.request import (
+    HTTPHandler,
+    HTTPSHandler,
+    ProxyHandler,
+    build_opener,
+)
+
+from synbiopython.codon.config import is_offline
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+KAZUSA_URL = (
+    "http://www.kazusa.or.jp/codon/cgi-bin/showcodon.cgi?"
+    "aa=1&style=N&species=%s"
+)
+
+
+class HTTPSession:
+    """A pool of persistent HTTP connections, one per host and thread, so
+    that consecutive requests reuse an open connection.
+
+    Requests go through a urllib opener, so proxies set in the environment
+    (e.g. ``http_proxy``) are used and redirects are followed, and failures
+    raise URLError (or HTTPError).
+
+    :param timeout: the connection timeout, in seconds.
+    :type timeout: float
+    """
+
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        self.__local = threading.local()
+        self.__pools = []
+        self.__lock = threading.Lock()
+        self.__opener = build_opener(
+            ProxyHandler(), _PooledHTTPHandler(self), _PooledHTTPSHandler(self)
+        )
+
+    def get(self, url):
+        """Gets the content of a url.
+
+        :param url: the url.
+        :type url: str
+        :return: the content.
+        :rtype: bytes
+        """
+        with self.__opener.open(url, timeout=self.timeout) as response:
+            try:
+                return response.read()
+            except (http.client.HTTPException, OSError) as err:
+                raise URLError(err)
+
+    def close(self):
+        """Closes all connections opened by all threads."""
+        with self.__lock:
+            for pool in self.__pools:
+                for conn in pool.values():
+                    conn.close()
+
+                pool.clear()
+
+    def open_connection(self, http_class, req, **kwargs):
+        """Sends a urllib request over a pooled connection.
+
+        :param http_class: the connection class.
+        :type http_class: type
+        :param req: the request.
+        :type req: urllib.request.Request
+        :return: the response.
+        :rtype: http.client.HTTPResponse
+        """
+        if not req.host:
+            raise URLError("no host given")
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            (name, val)
+            for name, val in req.headers.items()
+            if name not in headers
+        )
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+
+        if req._tunnel_host and "Proxy-Authorization" in headers:
+            tunnel_headers["Proxy-Authorization"] = headers.pop(
+                "Proxy-Authorization"
+            )
+
+        pool = self.__get_pool()
+        key = (http_class, req.host, req._tunnel_host)
+
+        for attempt in range(2):
+            conn = pool.get(key)
+
+            if conn is None:
+                conn = http_class(req.host, timeout=req.timeout, **kwargs)
+
+                if req._tunnel_host:
+                    conn.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+
+                pool[key] = conn
+
+            try:
+                conn.request(req.get_method(), req.selector, req.data, headers)
+                response = conn.getresponse()
+                break
+            except (http.client.HTTPException, OSError) as err:
+                # The server may have closed an idle connection, so retry
+                # once:
+                del pool[key]
+                conn.close()
+
+                if attempt:
+                    raise URLError(err)
+
+        # As urllib.request.AbstractHTTPHandler.do_open:
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+    def __get_pool(self):
+        """Gets the connections of the current thread, keyed by host.
+
+        :return: the connections of the current thread.
+        :rtype: dict
+        """
+        if not hasattr(self.__local, "pool"):
+            self.__local.pool = {}
+
+            with self.__lock:
+                self.__pools.append(self.__local.pool)
+
+        return self.__local.pool
+
+
+class _PooledHTTPHandler(HTTPHandler):
+    """urllib handler sending http requests over the connections of a
+    HTTPSession."""
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    def http_open(self, req):
+        """Opens a http request."""
+        return self.session.open_connection(http.client.HTTPConnection, req)
+
+
+class _PooledHTTPSHandler(HTTPSHandler):
+    """urllib handler sending https requests over the connections of a
+    HTTPSession."""
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    def https_open(self, req):
+        """Opens a https request."""
+        return self.session.open_connection(
+            http.client.HTTPSConnection, req, context=self._context
+        )
+
+
+class FileLock:
+    """An exclusive, inter-process lock held on a lock file.
+
+    The lock file is removed when the lock is released. A process that
+    acquires the lock on a file removed in the meantime retries on a new
+    one, so that all processes lock the same file.
+
+    :param filename: the lock filename.
+    :type filename: str
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.__fle = None
+
+    def __enter__(self):
+        while True:
+            self.__fle = open(self.filename, "a+")
+
+            if fcntl:
+                fcntl.flock(self.__fle.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover
+                msvcrt.locking(self.__fle.fileno(), msvcrt.LK_LOCK, 1)
+
+            if self.__is_current():
+                return self
+
+            self.__release()
+
+    def __exit__(self, *args):
+        if fcntl:
+            # Removed while locked, so that no other process locks it:
+            os.remove(self.filename)
+            self.__release()
+        else:  # pragma: no cover
+            # Open files cannot be removed, so removal may fail while
+            # another process waits for the lock:
+            self.__release()
+
+            try:
+                os.remove(self.filename)
+            except OSError:
+                pass
+
+    def __is_current(self):
+        """Checks whether the locked file is still the lock file."""
+        if not fcntl:  # pragma: no cover
+            return os.path.exists(self.filename)
+
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return False
+
+        return os.path.samestat(stat, os.fstat(self.__fle.fileno()))
+
+    def __release(self):
+        """Unlocks and closes the locked file."""
+        if fcntl:
+            fcntl.flock(self.__fle.fileno(), fcntl.LOCK_UN)
+        else:  # pragma: no cover
+            msvcrt.locking(self.__fle.fileno(), msvcrt.LK_UNLCK, 1)
+
+        self.__fle.close()
+        self.__fle = None
+
+
+def fetch_content(tax_id, target_dir, url=KAZUSA_URL, session=None):
+    """Downloads Codon Usage Database content to a cached file, unless
+    already cached.
+
+    The download is guarded by a per-tax-id file lock, so concurrent callers
+    (in any process) download each file once. Content is written to a
+    temporary file and published with an atomic rename, so readers never see
+    a partially written file.
+
+    In offline mode (see synbiopython.codon.config), content that is not
+    already cached raises a ConnectionError rather than being downloaded.
+
+    :param tax_id: a NCBI Taxonomy id.
+    :type tax_id: str
+    :param target_dir: the cache directory.
+    :type target_dir: str
+    :param url: the url template, with a placeholder for the tax id.
+    :type url: str
+    :param session: an optional HTTP session, for connection reuse.
+    :type session: HTTPSession
+    :return: the cached filename.
+    :rtype: str
+    """
+    target_file = os.path.join(target_dir, "%s.txt" % tax_id)
+
+    if os.path.exists(target_file):
+        return target_file
+
+    if is_offline():
+        raise ConnectionError(
+            "Codon usage table %s is not cached and downloads are disabled "
+            "in offline mode" % tax_id
+        )
+
+    if not os.path.exists(target_dir):
+        os.makedirs(target_dir, exist_ok=True)
+
+    with FileLock(os.path.join(target_dir, ".%s.lock" % tax_id)):
+        # Another worker may have downloaded the file while we waited:
+        if os.path.exists(target_file):
+            return target_file
+
+        if session is None:
+            own_session = HTTPSession()
+
+            try:
+                content = own_session.get(url % tax_id)
+            finally:
+                own_session.close()
+        else:
+            content = session.get(url % tax_id)
+
+        fd, tmp_file = tempfile.mkstemp(
+            dir=target_dir, prefix=".%s." % tax_id, suffix=".tmp"
+        )
+
+        try:
+            with os.fdopen(fd, "wb") as fle:
+                fle.write(content)
+
+            os.replace(tmp_file, target_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+    return target_file
+
+
+def fetch_all(tax_ids, target_dir, concurrency=8, url=KAZUSA_URL):
+    """Downloads Codon Usage Database content for many tax ids concurrently,
+    over a pool of persistent HTTP connections.
+
+    :param tax_ids: an iterable of NCBI Taxonomy ids.
+    :type tax_ids: iterable
+    :param target_dir: the cache directory.
+    :type target_dir: str
+    :param concurrency: the maximum number of concurrent downloads.
+    :type concurrency: int
+    :param url: the url template, with a placeholder for the tax id.
+    :type url: str
+    :return: the cached filenames, in the order of the tax ids.
+    :rtype: list
+    """
+    session = HTTPSession()
+
+    def fetch(tax_id):
+        return fetch_content(tax_id, target_dir, url=url, session=session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(fetch, tax_ids))
+    finally:
+        session.close()
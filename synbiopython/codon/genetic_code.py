@@ -0,0 +1,215 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from Bio.Data import CodonTable
+import numpy as np
+
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.codons import CODON_INDEX, CODONS, to_codon_indices
+
+_CODON_BYTES = np.array(CODONS, dtype="S3")
+
+
+class GeneticCode:
+    """A genetic code, precompiled into lookup arrays indexed as
+    codons.CODONS.
+
+    :param table_id: the NCBI translation table id.
+    :type table_id: int
+    :param names: the names of the genetic code.
+    :type names: list
+    :param amino_acids: the amino acid encoded by each codon, indexed as
+        codons.CODONS, with * for stop codons.
+    :type amino_acids: str
+    :param start_codons: the start codons.
+    :type start_codons: list
+    """
+
+    def __init__(self, table_id, names, amino_acids, start_codons):
+        self.table_id = table_id
+        self.names = names
+        self.amino_acids = np.array(list(amino_acids))
+        self.amino_acids.flags.writeable = False
+        self.start_codons = start_codons
+        self.stop_codons = [
+            codon for codon, aa in zip(CODONS, amino_acids) if aa == "*"
+        ]
+
+        # Lookup from codon index to amino acid (as an ASCII code), with X
+        # (at index -1) for ambiguous codons:
+        self._aa_codes = np.frombuffer(
+            (amino_acids + "X").encode("ascii"), dtype=np.uint8
+        )
+
+        # Lookup from amino acid (as an ASCII code) to its first codon:
+        self._first_codons = np.full(256, -1, dtype=np.int64)
+
+        for idx, amino_acid in reversed(list(enumerate(amino_acids))):
+            self._first_codons[ord(amino_acid)] = idx
+
+    def get_codons(self, amino_acid):
+        """Gets the codons encoding an amino acid.
+
+        :param amino_acid: the amino acid (or * for stop codons).
+        :type amino_acid: str
+        :return: the codons, in the order of codons.CODONS.
+        :rtype: list
+        """
+        return [
+            codon
+            for codon, aa in zip(CODONS, self.amino_acids.tolist())
+            if aa == amino_acid
+        ]
+
+    def translate(self, seq, to_stop=False):
+        """Translates a nucleic acid sequence, read in frame from the first
+        nucleotide. Ambiguous codons translate to X, stop codons to * and
+        trailing nucleotides are ignored.
+
+        :param seq: a nucleic acid sequence.
+        :type seq: str
+        :param to_stop: whether to stop translating at the first stop codon
+            (default is False).
+        :type to_stop: bool
+        :return: the amino acid sequence.
+        :rtype: str
+        """
+        aa_seq = self._aa_codes[to_codon_indices(seq)].tobytes().decode()
+
+        if to_stop:
+            return aa_seq.split("*", 1)[0]
+
+        return aa_seq
+
+    def back_translate(self, aa_seq, table=None):
+        """Back-translates an amino acid sequence, choosing the most frequent
+        codon of each amino acid in a codon usage table or, if no table is
+        supplied, the first codon (in the order of codons.CODONS).
+
+        :param aa_seq: an amino acid sequence.
+        :type aa_seq: str
+        :param table: an optional codon usage table.
+        :type table: dict
+        :return: a DNA sequence, encoding the supplied amino acid sequence.
+        :rtype: str
+        """
+        best_codons = self._first_codons
+
+        if table is not None:
+            best_codons = best_codons.copy()
+
+            for amino_acid, codon_freqs in remap_table(table, self).items():
+                best_codon = max(codon_freqs, key=codon_freqs.get)
+                best_codons[ord(amino_acid)] = CODON_INDEX[best_codon]
+
+        idxs = best_codons[
+            np.frombuffer(aa_seq.encode("ascii"), dtype=np.uint8)
+        ]
+
+        if (idxs < 0).any():
+            raise KeyError(aa_seq[int(np.argmax(idxs < 0))])
+
+        return _CODON_BYTES[idxs].tobytes().decode("ascii")
+
+    def __repr__(self):
+        return "GeneticCode(%d, %r)" % (self.table_id, self.names[0])
+
+
+def _get_genetic_codes():
+    """Gets the NCBI genetic codes, as listed by Biopython.
+
+    :return: a dict of NCBI translation table id to GeneticCode.
+    :rtype: dict
+    """
+    codes = {}
+
+    for table_id, table in sorted(CodonTable.unambiguous_dna_by_id.items()):
+        amino_acids = "".join(
+            table.forward_table.get(codon, "*") for codon in CODONS
+        )
+        codes[table_id] = GeneticCode(
+            table_id, list(table.names), amino_acids, table.start_codons
+        )
+
+    return codes
+
+
+GENETIC_CODES = _get_genetic_codes()
+
+
+def get_genetic_code(genetic_code):
+    """Gets a genetic code from supplied parameter, which may be either a
+    NCBI translation table id, a name of a genetic code, or a GeneticCode.
+
+    :param genetic_code: a NCBI translation table id (as either a str or
+        int), a name of a genetic code, or a GeneticCode.
+    :type genetic_code: int
+    :return: the genetic code.
+    :rtype: GeneticCode
+    """
+    if isinstance(genetic_code, GeneticCode):
+        return genetic_code
+
+    if str(genetic_code).isdigit() and int(genetic_code) in GENETIC_CODES:
+        return GENETIC_CODES[int(genetic_code)]
+
+    for code in GENETIC_CODES.values():
+        if genetic_code in code.names:
+            return code
+
+    raise ValueError("Unrecognised genetic code: %s" % genetic_code)
+
+
+def translate(seq, genetic_code=1, to_stop=False):
+    """Translates a nucleic acid sequence.
+
+    :param seq: a nucleic acid sequence.
+    :type seq: str
+    :param genetic_code: the genetic code (default is 1, the standard code).
+    :type genetic_code: int or str or GeneticCode
+    :param to_stop: whether to stop translating at the first stop codon
+        (default is False).
+    :type to_stop: bool
+    :return: the amino acid sequence.
+    :rtype: str
+    """
+    return get_genetic_code(genetic_code).translate(seq, to_stop)
+
+
+def back_translate(aa_seq, genetic_code=1, table=None):
+    """Back-translates an amino acid sequence.
+
+    :param aa_seq: an amino acid sequence.
+    :type aa_seq: str
+    :param genetic_code: the genetic code (default is 1, the standard code).
+    :type genetic_code: int or str or GeneticCode
+    :param table: an optional codon usage table, from which the most frequent
+        codon of each amino acid is chosen.
+    :type table: dict
+    :return: a DNA sequence, encoding the supplied amino acid sequence.
+    :rtype: str
+    """
+    return get_genetic_code(genetic_code).back_translate(aa_seq, table)
+
+
+def remap_table(table, genetic_code):
+    """Reassigns the codons of a codon usage table to the amino acids they
+    encode under a genetic code, renormalising frequencies over the codons of
+    each amino acid.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :param genetic_code: the genetic code.
+    :type genetic_code: int or str or GeneticCode
+    :return: a codon usage table, with DNA codons.
+    :rtype: dict
+    """
+    code = get_genetic_code(genetic_code)
+    array = CodonArray.from_dict(table)
+    return CodonArray(array.values, code.amino_acids).normalise().to_dict()
@@ -0,0 +1,357 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from collections import namedtuple
+import itertools
+
+from Bio import SeqIO
+import numpy as np
+
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.codons import (
+    CODON_INDEX,
+    CODONS,
+    STANDARD_CODE,
+    encode,
+    to_codon_indices,
+)
+
+WindowProfile = namedtuple("WindowProfile", ["mean_freq", "min_freq", "gc"])
+
+
+def relative_adaptiveness(table, zero_weight=0.01):
+    """Gets the relative adaptiveness (w) of each codon: its frequency
+    relative to the most frequent synonymous codon.
+
+    Codons of stops and of amino acids encoded by a single codon are
+    uninformative and are given a weight of NaN, so that they are ignored
+    when scoring.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :param zero_weight: the minimum weight of a codon, so that codons with
+        zero frequency do not give zero scores (default is 0.01).
+    :type zero_weight: float
+    :return: an array of 64 weights, indexed as codons.CODONS.
+    :rtype: numpy.ndarray
+    """
+    weights = np.full(len(CODONS), np.nan)
+
+    for amino_acid, codon_freqs in table.items():
+        max_freq = max(codon_freqs.values())
+
+        if amino_acid == "*" or len(codon_freqs) < 2 or max_freq <= 0:
+            continue
+
+        for codon, freq in codon_freqs.items():
+            weights[CODON_INDEX[codon.replace("U", "T")]] = max(
+                freq / max_freq, zero_weight
+            )
+
+    return weights
+
+
+def cai(sequences, table, zero_weight=0.01):
+    """Calculates the Codon Adaptation Index of one or many sequences.
+
+    :param sequences: a nucleic acid sequence, or a list of these.
+    :type sequences: str or list
+    :param table: a codon usage table.
+    :type table: dict
+    :param zero_weight: the minimum weight of a codon.
+    :type zero_weight: float
+    :return: the Codon Adaptation Index of the sequence (as a float), or of
+        each sequence (as an array). Sequences with no informative codons
+        score NaN.
+    :rtype: float or numpy.ndarray
+    """
+    if isinstance(sequences, str):
+        return float(cai([sequences], table, zero_weight)[0])
+
+    log_weights = np.log(relative_adaptiveness(table, zero_weight))
+    idxs, seq_ids = _to_codon_indices(sequences)
+
+    scores = log_weights[idxs]
+    valid = (idxs >= 0) & ~np.isnan(scores)
+    totals = np.bincount(
+        seq_ids[valid], weights=scores[valid], minlength=len(sequences)
+    )
+    counts = np.bincount(seq_ids[valid], minlength=len(sequences))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.exp(totals / counts)
+
+
+def cai_profile(sequences, table, window=20, zero_weight=0.01):
+    """Calculates the Codon Adaptation Index over a sliding window of codons.
+
+    All windows of all sequences are computed together, from differences of
+    cumulative sums over the concatenated sequences, dropping windows that
+    span two sequences.
+
+    :param sequences: a nucleic acid sequence, or a list of these.
+    :type sequences: str or list
+    :param table: a codon usage table.
+    :type table: dict
+    :param window: the window size, in codons (default is 20).
+    :type window: int
+    :param zero_weight: the minimum weight of a codon.
+    :type zero_weight: float
+    :return: the Codon Adaptation Index of each window of the sequence (as an
+        array), or of each sequence (as a list of arrays).
+    :rtype: numpy.ndarray or list
+    """
+    if isinstance(sequences, str):
+        return cai_profile([sequences], table, window, zero_weight)[0]
+
+    _check_window(window)
+
+    log_weights = np.log(relative_adaptiveness(table, zero_weight))
+    idxs, seq_ids = _to_codon_indices(sequences)
+
+    scores = log_weights[idxs]
+    valid = (idxs >= 0) & ~np.isnan(scores)
+    scores[~valid] = 0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        profile = np.exp(
+            _window_sums(scores, window) / _window_sums(valid, window)
+        )
+
+    lengths = np.bincount(seq_ids, minlength=len(sequences))
+    return _split_windows(profile, lengths, window)
+
+
+def window_profile(sequences, table, window=20):
+    """Profiles codon usage and GC content over a sliding window of codons,
+    to locate clusters of rare codons and GC content spikes.
+
+    All windows of all sequences are computed together, in time linear in
+    the total sequence length whatever the window size: means from
+    differences of cumulative sums, and minima with the van Herk/Gil-Werman
+    algorithm. Ambiguous codons, and codons absent from the table, are
+    ignored when calculating codon frequencies.
+
+    :param sequences: a nucleic acid sequence, or a list of these.
+    :type sequences: str or list
+    :param table: a codon usage table.
+    :type table: dict
+    :param window: the window size, in codons (default is 20).
+    :type window: int
+    :return: a WindowProfile of arrays of the mean codon frequency, minimum
+        codon frequency and GC fraction of each window of the sequence, or a
+        list of these, one per sequence.
+    :rtype: WindowProfile or list
+    """
+    if isinstance(sequences, str):
+        return window_profile([sequences], table, window)[0]
+
+    _check_window(window)
+
+    lengths = np.array([len(seq) // 3 for seq in sequences], dtype=np.int64)
+    seq = "".join(seq[: length * 3] for seq, length in zip(sequences, lengths))
+
+    # Codon frequencies, with NaN for ambiguous and absent codons:
+    codon_freqs = CodonArray.from_dict(table).normalise().values
+    freqs = np.append(codon_freqs, np.nan)[to_codon_indices(seq)]
+    valid = ~np.isnan(freqs)
+    gc_counts = np.isin(encode(seq), [1, 2]).reshape(-1, 3).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_freqs = _window_sums(np.where(valid, freqs, 0), window) / (
+            _window_sums(valid, window)
+        )
+
+    min_freqs = _sliding_min(np.where(valid, freqs, np.inf), window)
+    min_freqs[np.isinf(min_freqs)] = np.nan
+    gc = _window_sums(gc_counts, window) / (3 * window)
+
+    return [
+        WindowProfile(*values)
+        for values in zip(
+            *(
+                _split_windows(values, lengths, window)
+                for values in [mean_freqs, min_freqs, gc]
+            )
+        )
+    ]
+
+
+def codon_counts(sequences):
+    """Counts the codons of many sequences.
+
+    :param sequences: a list of nucleic acid sequences.
+    :type sequences: list
+    :return: an array of codon counts, of shape (number of sequences, 64).
+    :rtype: numpy.ndarray
+    """
+    idxs, seq_ids = _to_codon_indices(sequences)
+    valid = idxs >= 0
+
+    return np.bincount(
+        seq_ids[valid] * len(CODONS) + idxs[valid],
+        minlength=len(sequences) * len(CODONS),
+    ).reshape(len(sequences), len(CODONS))
+
+
+def rscu(sequences):
+    """Calculates the relative synonymous codon usage of one or many
+    sequences: the count of each codon relative to the count expected if all
+    synonymous codons were used equally.
+
+    :param sequences: a nucleic acid sequence, or a list of these.
+    :type sequences: str or list
+    :return: an array of 64 RSCU values, indexed as codons.CODONS, or an array
+        of shape (number of sequences, 64). Codons of amino acids absent
+        from a sequence score NaN.
+    :rtype: numpy.ndarray
+    """
+    if isinstance(sequences, str):
+        return rscu([sequences])[0]
+
+    amino_acids = sorted(set(STANDARD_CODE.values()))
+    groups = np.array(
+        [amino_acids.index(STANDARD_CODE[codon]) for codon in CODONS]
+    )
+    membership = np.zeros((len(CODONS), len(amino_acids)))
+    membership[np.arange(len(CODONS)), groups] = 1
+
+    counts = codon_counts(sequences)
+    group_totals = counts @ membership
+    group_sizes = membership.sum(axis=0)[groups]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return counts * group_sizes / group_totals[:, groups]
+
+
+def score_fasta(filename, table, batch_size=1000, zero_weight=0.01):
+    """Calculates the Codon Adaptation Index of each sequence of a FASTA file,
+    streaming the file in batches so that memory use is bounded by the batch
+    size.
+
+    :param filename: the FASTA filename (or file handle).
+    :type filename: str
+    :param table: a codon usage table.
+    :type table: dict
+    :param batch_size: the number of sequences scored at once.
+    :type batch_size: int
+    :param zero_weight: the minimum weight of a codon.
+    :type zero_weight: float
+    :return: a generator of (sequence id, Codon Adaptation Index) tuples.
+    :rtype: generator
+    """
+    records = SeqIO.parse(filename, "fasta")
+
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+
+        if not batch:
+            return
+
+        scores = cai([str(rec.seq) for rec in batch], table, zero_weight)
+
+        for rec, score in zip(batch, scores):
+            yield rec.id, float(score)
+
+
+def _to_codon_indices(sequences):
+    """Convert many sequences to codon indices in one pass.
+
+    :param sequences: a list of nucleic acid sequences.
+    :type sequences: list
+    :return: the codon indices of all sequences, concatenated, and the index
+        of the sequence of each codon.
+    :rtype: tuple
+    """
+    lengths = np.array([len(seq) // 3 for seq in sequences], dtype=np.int64)
+    idxs = to_codon_indices(
+        "".join(seq[: length * 3] for seq, length in zip(sequences, lengths))
+    )
+    return idxs, np.repeat(np.arange(len(sequences)), lengths)
+
+
+def _check_window(window):
+    """Checks a window size.
+
+    :param window: the window size, in codons.
+    :type window: int
+    """
+    if window < 1:
+        raise ValueError("Window size must be at least 1: %s" % window)
+
+
+def _split_windows(values, lengths, window):
+    """Splits the values of the windows of concatenated sequences into the
+    values of the windows of each sequence, dropping windows that span two
+    sequences.
+
+    :param values: the value of each window of the concatenated sequences.
+    :type values: numpy.ndarray
+    :param lengths: the length of each sequence, in codons.
+    :type lengths: numpy.ndarray
+    :param window: the window size, in codons.
+    :type window: int
+    :return: an array of the values of each sequence.
+    :rtype: list
+    """
+    if not lengths.size:
+        return []
+
+    starts = np.cumsum(lengths) - lengths
+    num_windows = np.maximum(lengths - window + 1, 0)
+    offsets = np.cumsum(num_windows) - num_windows
+
+    # The index of each window within a single sequence:
+    keep = np.repeat(starts - offsets, num_windows) + np.arange(
+        num_windows.sum()
+    )
+
+    return np.split(values[keep], np.cumsum(num_windows)[:-1])
+
+
+def _window_sums(values, window):
+    """Sums values over a sliding window, from differences of cumulative
+    sums.
+
+    :param values: the values.
+    :type values: numpy.ndarray
+    :param window: the window size.
+    :type window: int
+    :return: the sum of each window.
+    :rtype: numpy.ndarray
+    """
+    cum_values = np.concatenate([[0], np.cumsum(values)])
+    return cum_values[window:] - cum_values[: max(len(values) - window + 1, 0)]
+
+
+def _sliding_min(values, window):
+    """Finds minima over a sliding window with the van Herk/Gil-Werman
+    algorithm: the minimum of each window is the lesser of a suffix minimum
+    and a prefix minimum of the blocks of window size that it spans.
+
+    :param values: the values.
+    :type values: numpy.ndarray
+    :param window: the window size.
+    :type window: int
+    :return: the minimum of each window.
+    :rtype: numpy.ndarray
+    """
+    size = len(values)
+
+    if size < window:
+        return np.empty(0)
+
+    padded = np.concatenate([values, np.full(-size % window, np.inf)])
+    blocks = padded.reshape(-1, window)
+    prefixes = np.minimum.accumulate(blocks, axis=1).ravel()
+    suffixes = np.minimum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    return np.minimum(
+        suffixes[: size - window + 1], prefixes[window - 1 : size]
+    )
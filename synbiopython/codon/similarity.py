@@ -0,0 +1,317 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from collections import defaultdict
+import itertools
+import os.path
+import tempfile
+
+import numpy as np
+
+from synbiopython.codon.codon_array import CodonArray, stack
+from synbiopython.codon.codons import CODONS
+from synbiopython.codon.config import (
+    get_cache_dir,
+    get_shared_store_paths,
+    get_store_path,
+)
+from synbiopython.codon.store import CodonUsageStore
+
+METRICS = ["cosine", "euclidean", "kl"]
+
+# Pseudo-frequency added to avoid infinite KL divergences:
+_EPSILON = 1e-6
+
+# The number of tables read from a store at once:
+_BATCH_SIZE = 1024
+
+
+class UsageMatrix:
+    """A matrix of the codon usage of many organisms, of shape (N, 64), in
+    which each row holds the frequency of each codon (indexed as
+    codons.CODONS) relative to the synonymous codons of its amino acid.
+
+    :param tax_ids: the NCBI Taxonomy id of each row.
+    :type tax_ids: list
+    :param values: an array of shape (N, 64), which may be memory-mapped.
+    :type values: numpy.ndarray
+    """
+
+    def __init__(self, tax_ids, values):
+        self.tax_ids = np.asarray(tax_ids, dtype=str)
+        self.values = values
+        self.__prepared = {}
+
+    @classmethod
+    def from_store(cls, store=None, filename=None, mmap_threshold=10000):
+        """Stacks all tables of a CodonUsageStore into a UsageMatrix.
+
+        Tables are read in a single pass. When there are more than
+        mmap_threshold tables (or a filename is given), the matrix is written
+        to a .npy file and memory-mapped, rather than held in memory. The
+        file is written under a temporary name and then renamed, so that
+        concurrent builds never overwrite a file mapped by another process.
+
+        :param store: the store (default is the stores of the local codon
+            cache: those of any shared, read-only cache directories, then
+            the writable store, with tables of earlier stores taking
+            precedence).
+        :type store: CodonUsageStore
+        :param filename: an optional .npy filename for the memory-mapped
+            matrix (default is ``usage_matrix.npy`` in the writable codon
+            cache directory).
+        :type filename: str
+        :param mmap_threshold: the maximum number of tables held in memory.
+        :type mmap_threshold: int
+        :return: the UsageMatrix.
+        :rtype: UsageMatrix
+        """
+        stores = [store] if store is not None else _get_stores()
+        sizes = [len(layer) for layer in stores]
+        size = sum(sizes)
+
+        if filename is None and size > mmap_threshold:
+            filename = os.path.join(get_cache_dir(), "usage_matrix.npy")
+
+        if filename is None or not size:
+            values = np.empty((size, len(CODONS)))
+            tax_ids = _stack_arrays(stores, sizes, values)
+            return cls(tax_ids, values[: len(tax_ids)])
+
+        dir_name = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(dir_name, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(
+            dir=dir_name, prefix=".usage_matrix.", suffix=".npy"
+        )
+        os.close(fd)
+
+        try:
+            values = np.lib.format.open_memmap(
+                tmp_file, mode="w+", shape=(size, len(CODONS))
+            )
+            tax_ids = _stack_arrays(stores, sizes, values)
+            values.flush()
+            del values
+
+            # Map the file before publishing it, as it may then be replaced
+            # by concurrent builds:
+            values = np.load(tmp_file, mmap_mode="r")
+            os.replace(tmp_file, filename)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+        return cls(tax_ids, values[: len(tax_ids)])
+
+    def distances(self, queries=None, metric="cosine", chunk_size=1024):
+        """Calculates the distances of queries to every row, in chunks of
+        queries so that memory use is bounded.
+
+        :param queries: the usage of each query organism or gene, as an array
+            of shape (M, 64), a CodonArray or a codon usage table (default is
+            the matrix itself, giving all-vs-all distances).
+        :type queries: numpy.ndarray
+        :param metric: the distance metric: one of cosine, euclidean or kl
+            (the Kullback-Leibler divergence of each row from each query,
+            summed over amino acids).
+        :type metric: str
+        :param chunk_size: the number of queries per chunk.
+        :type chunk_size: int
+        :return: an array of distances, of shape (M, N).
+        :rtype: numpy.ndarray
+        """
+        queries = self.values if queries is None else _to_queries(queries)
+        result = np.empty((len(queries), len(self.values)))
+
+        for start in range(0, len(queries), chunk_size):
+            end = start + chunk_size
+            result[start:end] = self.__distances(queries[start:end], metric)
+
+        return result
+
+    def nearest(self, query, k=10, metric="cosine"):
+        """Finds the organisms of codon usage closest to a query.
+
+        :param query: the usage of the query, as an array of 64 values, a
+            CodonArray or a codon usage table.
+        :type query: numpy.ndarray
+        :param k: the number of organisms (default is 10).
+        :type k: int
+        :param metric: the distance metric: one of cosine, euclidean or kl.
+        :type metric: str
+        :return: a list of (NCBI Taxonomy id, distance) tuples, closest
+            first.
+        :rtype: list
+        """
+        dists = self.__distances(_to_queries(query)[:1], metric)[0]
+
+        if len(dists) > k:
+            idxs = np.argpartition(dists, k - 1)[:k]
+        else:
+            idxs = np.arange(len(dists))
+
+        idxs = idxs[np.lexsort((idxs, dists[idxs]))]
+
+        return [(str(self.tax_ids[idx]), float(dists[idx])) for idx in idxs]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __distances(self, queries, metric):
+        """Calculates the distances of a chunk of queries to every row.
+
+        :param queries: an array of shape (M, 64).
+        :type queries: numpy.ndarray
+        :param metric: the distance metric.
+        :type metric: str
+        :return: an array of distances, of shape (M, N).
+        :rtype: numpy.ndarray
+        """
+        rows = self.__prepare(metric)
+
+        if metric == "cosine":
+            norms = np.linalg.norm(queries, axis=1)[:, None]
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sims = (queries @ rows.T) / norms
+
+            return 1 - np.nan_to_num(sims)
+
+        if metric == "euclidean":
+            sq_norms = np.square(queries).sum(axis=1)[:, None]
+            sq_dists = (
+                sq_norms + self.__prepared["sq_norms"] - 2 * (queries @ rows.T)
+            )
+            return np.sqrt(np.maximum(sq_dists, 0))
+
+        # Kullback-Leibler divergence, as sum(p log p) - sum(p log q):
+        queries = queries + _EPSILON
+        entropies = (queries * np.log(queries)).sum(axis=1)[:, None]
+        return entropies - queries @ rows.T
+
+    def __prepare(self, metric):
+        """Gets the rows transformed for a metric, computing them once.
+
+        :param metric: the distance metric.
+        :type metric: str
+        :return: the transformed rows.
+        :rtype: numpy.ndarray
+        """
+        if metric not in METRICS:
+            raise ValueError("Unrecognised metric: %s" % metric)
+
+        if metric not in self.__prepared:
+            if metric == "cosine":
+                norms = np.linalg.norm(self.values, axis=1)[:, None]
+
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    rows = np.nan_to_num(self.values / norms)
+            elif metric == "euclidean":
+                rows = self.values
+                self.__prepared["sq_norms"] = np.square(rows).sum(axis=1)
+            else:
+                rows = np.log(self.values + _EPSILON)
+
+            self.__prepared[metric] = rows
+
+        return self.__prepared[metric]
+
+
+def to_usage_vector(usage):
+    """Converts codon usage to a vector of 64 frequencies, relative to the
+    synonymous codons of each amino acid.
+
+    :param usage: a codon usage table or a CodonArray (which may be a stack
+        of tables).
+    :type usage: dict or CodonArray
+    :return: an array of shape (..., 64), with zeros for absent codons.
+    :rtype: numpy.ndarray
+    """
+    if isinstance(usage, dict):
+        usage = CodonArray.from_dict(usage)
+
+    return np.nan_to_num(usage.normalise().values)
+
+
+def _get_stores():
+    """Gets the existing codon usage stores of the local codon cache, in
+    order of lookup.
+
+    :return: the stores.
+    :rtype: list
+    """
+    stores = [
+        CodonUsageStore(path, read_only=True)
+        for path in get_shared_store_paths()
+    ]
+
+    if os.path.exists(get_store_path()):
+        stores.append(CodonUsageStore())
+
+    return stores
+
+
+def _stack_arrays(stores, sizes, values):
+    """Normalises the tables of stores into the first rows of an array,
+    reading them in batches. Tables of tax ids already read from earlier
+    stores are skipped.
+
+    :param stores: the stores.
+    :type stores: list
+    :param sizes: the number of tables to read from each store.
+    :type sizes: list
+    :param values: the array, of shape (sum(sizes), 64).
+    :type values: numpy.ndarray
+    :return: the NCBI Taxonomy ids of the rows filled.
+    :rtype: list
+    """
+    tax_ids = []
+    seen = set()
+    rows = itertools.chain.from_iterable(
+        itertools.islice(store.arrays(), size)
+        for store, size in zip(stores, sizes)
+    )
+
+    while True:
+        batch = list(itertools.islice(rows, _BATCH_SIZE))
+
+        if not batch:
+            break
+
+        # Normalise batches of tables sharing a genetic code at once:
+        groups = defaultdict(list)
+
+        for tax_id, array in batch:
+            if tax_id not in seen:
+                seen.add(tax_id)
+                groups[array.amino_acids.tobytes()].append(
+                    (len(tax_ids), array)
+                )
+                tax_ids.append(tax_id)
+
+        for group in groups.values():
+            idxs, arrays = zip(*group)
+            values[list(idxs)] = to_usage_vector(stack(arrays))
+
+    return tax_ids
+
+
+def _to_queries(queries):
+    """Converts queries to an array of usage vectors.
+
+    :param queries: a codon usage table, a CodonArray, or an array of shape
+        (64,) or (M, 64).
+    :type queries: numpy.ndarray
+    :return: an array of shape (M, 64).
+    :rtype: numpy.ndarray
+    """
+    if isinstance(queries, (dict, CodonArray)):
+        queries = to_usage_vector(queries)
+
+    return np.atleast_2d(np.asarray(queries, dtype=float))
@@ -0,0 +1,392 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import argparse
+from collections import defaultdict
+from contextlib import closing
+import os.path
+import re
+import sqlite3
+import sys
+from urllib.request import pathname2url
+
+import numpy as np
+
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.codons import STANDARD_CODE
+from synbiopython.codon.config import get_store_path
+
+_CODON_REGEX = r"([ATGCU]{3}) ([A-Z]|\*) (\d.\d+)"
+
+# Codon order of the count vectors in Kazusa .spsum files:
+_SPSUM_CODONS = [
+    codon.replace("U", "T")
+    for codon in (
+        "CGA CGC CGG CGU AGA AGG CUA CUC CUG CUU UUA UUG UCA UCC UCG UCU "
+        "AGC AGU ACA ACC ACG ACU CCA CCC CCG CCU GCA GCC GCG GCU GGA GGC "
+        "GGG GGU GUA GUC GUG GUU AAA AAG AAC AAU CAA CAG CAC CAU GAA GAG "
+        "GAC GAU UAC UAU UGC UGU UUC UUU AUA AUC AUU AUG UGG UAA UAG UGA"
+    ).split()
+]
+
+
+class CodonUsageStore:
+    """A single-file store of parsed codon usage tables, keyed by NCBI
+    Taxonomy id.
+
+    Each table is held as a vector of 64 codon frequencies (in the order of
+    ``codons.CODONS``) alongside the amino acid encoded by each codon, so
+    reading a table back involves no parsing. Each table also has a version,
+    which increases whenever the table is put into the store, so that copies
+    of individual tables can be validated.
+
+    :param path: the path of the SQLite database file (default is
+        ``codon_usage.db`` in the writable codon cache directory; see
+        config.get_store_path).
+    :type path: str
+    :param read_only: whether to open an existing store read-only, so that
+        it may be shared without ever being written or locked for writing.
+    :type read_only: bool
+    """
+
+    def __init__(self, path=None, read_only=False):
+        self.path = path or get_store_path()
+        self.read_only = read_only
+
+        if read_only:
+            return
+
+        dir_name = os.path.dirname(os.path.abspath(self.path))
+
+        if not os.path.exists(dir_name):
+            os.makedirs(dir_name, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS codon_usage ("
+                "tax_id TEXT PRIMARY KEY, "
+                "amino_acids TEXT NOT NULL, "
+                "frequencies BLOB NOT NULL, "
+                "version INTEGER NOT NULL DEFAULT 0)"
+            )
+
+            # Stores created before tables were versioned:
+            columns = [
+                row[1]
+                for row in conn.execute("PRAGMA table_info(codon_usage)")
+            ]
+
+            if "version" not in columns:
+                conn.execute(
+                    "ALTER TABLE codon_usage "
+                    "ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS codon_usage_version "
+                "ON codon_usage (version)"
+            )
+
+    def __contains__(self, tax_id):
+        with closing(self._connect()) as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM codon_usage WHERE tax_id = ?",
+                    (str(tax_id),),
+                ).fetchone()
+                is not None
+            )
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT COUNT(*) FROM codon_usage").fetchone()
+
+        return row[0]
+
+    def tax_ids(self):
+        """Gets the NCBI Taxonomy ids of all tables in the store.
+
+        :return: a list of NCBI Taxonomy ids.
+        :rtype: list
+        """
+        with closing(self._connect()) as conn:
+            return [
+                row[0]
+                for row in conn.execute(
+                    "SELECT tax_id FROM codon_usage ORDER BY tax_id"
+                )
+            ]
+
+    def get(self, tax_id, dna=True):
+        """Gets a codon usage table from the store.
+
+        :param tax_id: a NCBI Taxonomy id.
+        :type tax_id: str
+        :param dna: boolean parameter specifying whether the codon table
+            returned should contain DNA or RNA codons (default is DNA).
+        :type dna: bool
+        :return: a codon usage table, or None if not in the store.
+        :rtype: dict
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT amino_acids, frequencies FROM codon_usage "
+                "WHERE tax_id = ?",
+                (str(tax_id),),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return _to_table(row[0], np.frombuffer(row[1], dtype=np.float64), dna)
+
+    def version(self, tax_id):
+        """Gets the version of a codon usage table in the store, which
+        changes whenever the table is put into the store.
+
+        :param tax_id: a NCBI Taxonomy id.
+        :type tax_id: str
+        :return: the version, or None if not in the store.
+        :rtype: int
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT version FROM codon_usage WHERE tax_id = ?",
+                (str(tax_id),),
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def arrays(self):
+        """Gets all tables in the store, in order of NCBI Taxonomy id, reading
+        them in a single query.
+
+        :return: a generator of (NCBI Taxonomy id, CodonArray) tuples.
+        :rtype: generator
+        """
+        with closing(self._connect()) as conn:
+            for tax_id, amino_acids, freqs in conn.execute(
+                "SELECT tax_id, amino_acids, frequencies FROM codon_usage "
+                "ORDER BY tax_id"
+            ):
+                yield tax_id, CodonArray(
+                    np.frombuffer(freqs, dtype=np.float64),
+                    np.array(list(amino_acids)),
+                )
+
+    def put(self, tax_id, table):
+        """Puts a codon usage table into the store, replacing any existing
+        table with the same id.
+
+        :param tax_id: a NCBI Taxonomy id.
+        :type tax_id: str
+        :param table: a codon usage table, with DNA or RNA codons.
+        :type table: dict
+        """
+        self.put_many([(tax_id, table)])
+
+    def put_many(self, items):
+        """Puts many codon usage tables into the store in one transaction.
+
+        :param items: an iterable of (NCBI Taxonomy id, codon usage table)
+            tuples.
+        :type items: iterable
+        :return: the number of tables put into the store.
+        :rtype: int
+        """
+        rows = [(str(tax_id),) + _from_table(table) for tax_id, table in items]
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO codon_usage "
+                "(tax_id, amino_acids, frequencies, version) VALUES (?, ?, ?, "
+                "(SELECT COALESCE(MAX(version), 0) + 1 FROM codon_usage))",
+                rows,
+            )
+
+        return len(rows)
+
+    def import_files(self, filenames):
+        """Imports Codon Usage Database files, as cached by
+        ``table.get_table``, named by NCBI Taxonomy id (e.g. 9606.txt).
+
+        :param filenames: an iterable of filenames.
+        :type filenames: iterable
+        :return: the number of tables imported.
+        :rtype: int
+        """
+        return self.put_many(
+            (
+                os.path.splitext(os.path.basename(filename))[0],
+                parse_file(filename),
+            )
+            for filename in filenames
+        )
+
+    def import_spsum(self, filename):
+        """Imports a Codon Usage Database bulk .spsum file.
+
+        :param filename: the .spsum filename.
+        :type filename: str
+        :return: the number of tables imported.
+        :rtype: int
+        """
+        with open(filename) as fle:
+            return self.put_many(parse_spsum(fle))
+
+    def _connect(self):
+        """Opens a connection to the database.
+
+        :return: a database connection.
+        :rtype: sqlite3.Connection
+        """
+        if self.read_only:
+            return sqlite3.connect(
+                "file:%s?mode=ro" % pathname2url(os.path.abspath(self.path)),
+                timeout=60,
+                uri=True,
+            )
+
+        return sqlite3.connect(self.path, timeout=60)
+
+
+def parse_content(content):
+    """Parses Codon Usage Database content into a codon usage table.
+
+    :param content: the Codon Usage Database content.
+    :type content: str
+    :return: a codon usage table, with DNA codons.
+    :rtype: dict
+    """
+    results = defaultdict(dict)
+
+    for vals in sorted(
+        re.findall(_CODON_REGEX, content), key=lambda x: (x[1], x[2])
+    ):
+        results[vals[1]][vals[0].replace("U", "T")] = float(vals[2])
+
+    return dict(results)
+
+
+def parse_file(filename):
+    """Parses a Codon Usage Database file into a codon usage table.
+
+    :param filename: the filename.
+    :type filename: str
+    :return: a codon usage table, with DNA codons.
+    :rtype: dict
+    """
+    with open(filename) as fle:
+        return parse_content(fle.read())
+
+
+def parse_spsum(lines):
+    """Parses a Codon Usage Database bulk .spsum file.
+
+    Entries are pairs of lines: a header of the form
+    ``tax_id:organism name: number of CDSs``, followed by 64 codon counts.
+
+    :param lines: an iterable of lines.
+    :type lines: iterable
+    :return: a generator of (NCBI Taxonomy id, codon usage table) tuples.
+    :rtype: generator
+    """
+    lines = (line.strip() for line in lines)
+    lines = (line for line in lines if line)
+
+    for header, counts in zip(lines, lines):
+        tax_id = header.split(":", 1)[0].strip()
+        counts = dict(zip(_SPSUM_CODONS, map(float, counts.split())))
+        table = defaultdict(dict)
+
+        for codon, count in counts.items():
+            table[STANDARD_CODE[codon]][codon] = count
+
+        for codon_counts in table.values():
+            total = sum(codon_counts.values())
+
+            for codon, count in codon_counts.items():
+                codon_counts[codon] = count / total if total else 0.0
+
+        yield tax_id, dict(table)
+
+
+def _from_table(table):
+    """Converts a codon usage table to its stored form.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :return: an (amino acids, frequencies) tuple.
+    :rtype: tuple
+    """
+    array = CodonArray.from_dict(table)
+    amino_acids = np.where(np.isnan(array.values), "-", array.amino_acids)
+    return "".join(amino_acids), array.values.tobytes()
+
+
+def _to_table(amino_acids, freqs, dna):
+    """Converts a stored codon usage table to a codon usage table.
+
+    :param amino_acids: the amino acid encoded by each codon.
+    :type amino_acids: str
+    :param freqs: the frequency of each codon.
+    :type freqs: numpy.ndarray
+    :param dna: boolean parameter specifying whether the codon table returned
+        should contain DNA or RNA codons.
+    :type dna: bool
+    :return: a codon usage table.
+    :rtype: dict
+    """
+    return CodonArray(freqs, np.array(list(amino_acids))).to_dict(dna)
+
+
+def main(args):
+    """main method."""
+    parser = argparse.ArgumentParser(
+        description="Bulk import codon usage tables into a local store."
+    )
+    parser.add_argument(
+        "--db", help="store filename (default is the writable cache store)"
+    )
+    parser.add_argument(
+        "--spsum", action="store_true", help="inputs are Kazusa .spsum files"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Codon Usage Database files, named by tax id, or directories "
+        "of these",
+    )
+    params = parser.parse_args(args)
+    store = CodonUsageStore(params.db)
+    count = 0
+
+    if params.spsum:
+        for filename in params.inputs:
+            count += store.import_spsum(filename)
+    else:
+        filenames = []
+
+        for path in params.inputs:
+            if os.path.isdir(path):
+                filenames.extend(
+                    os.path.join(path, filename)
+                    for filename in sorted(os.listdir(path))
+                    if filename.endswith(".txt")
+                )
+            else:
+                filenames.append(path)
+
+        count = store.import_files(filenames)
+
+    print("Imported %d tables into %s" % (count, store.path))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,22 +7,56 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 
 @author: neilswainston
 """
-from collections import defaultdict
+import gzip
+import itertools
 import os.path
-import re
-from urllib.request import urlretrieve
 
+from Bio import SeqIO
+import numpy as np
+
+from synbiopython.codon.cache import LRUCache
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.config import (
+    STORE_FILENAME,
+    get_cache_dir,
+    get_shared_dirs,
+    get_shared_store_paths,
+    get_store_path,
+)
+from synbiopython.codon.fetch import KAZUSA_URL, fetch_all, fetch_content
+from synbiopython.codon.genetic_code import get_genetic_code
+from synbiopython.codon.scoring import codon_counts
+from synbiopython.codon.store import (
+    CodonUsageStore,
+    parse_content,
+    parse_file,
+)
 from synbiopython.codon.taxonomy_utils import get_tax_id
 
-_CODON_REGEX = r"([ATGCU]{3}) ([A-Z]|\*) (\d.\d+)"
+_TABLE_CACHE = LRUCache(maxsize=128)
+
+# Versions of the tables of writable stores, by store path, as a
+# (stamp of the store file, {tax_id: version}) tuple:
+_STORE_VERSIONS = {}
+
+_GENBANK_EXTS = [".gb", ".gbk", ".gbff", ".genbank"]
 
 
 def get_table(table_id, dna=True):
     """Gets a codon table from from supplied parameter, which may be either an
     organism name or a NCBI Taxonomy id.
 
+    Tables are looked up in the layers of the local codon cache (see
+    synbiopython.codon.config): first in any shared, read-only cache
+    directories, then in the writable cache. Tables in neither are
+    downloaded (unless in offline mode), parsed once and added to the
+    codon usage store of the writable cache. Recently used tables are also
+    held in memory, until their version in the writable store, or the shared
+    store or file that they are read from, changes.
+
     :param table_id: an organism name or a NCBI Taxonomy id (as either a str or
-        int).
+        int), or the id of a custom table registered by
+        build_table_from_sequences.
     :type table_id: str
     :param dna: boolean parameter specifying whether the codon table returned
         should contain DNA or RNA codons (default is DNA).
@@ -30,16 +64,257 @@ def get_table(table_id, dna=True):
     :return: a codon usage table.
     :rtype: dict
     """
-    tax_id = get_tax_id(table_id)
-    results = defaultdict(dict)
-    content = _get_content(tax_id)
+    try:
+        tax_id = get_tax_id(table_id)
+        is_custom = False
+    except ValueError:
+        # Custom tables are in the cache, but not in the taxonomy:
+        tax_id = str(table_id)
+        is_custom = True
+
+    store_path = get_store_path()
+    stamp = (
+        store_path,
+        _get_shared_stamp(tax_id),
+        _get_version(store_path, tax_id),
+    )
+    table = _TABLE_CACHE.get((tax_id, dna), stamp)
+
+    if table is None:
+        table = _read_table(tax_id, dna)
+
+        if table is None:
+            if is_custom:
+                raise ValueError("Unrecognised table id: %s" % table_id)
+
+            content = _get_content(tax_id)
+            store = CodonUsageStore(store_path)
+            store.put(tax_id, parse_content(content))
+            table = store.get(tax_id, dna=dna)
+            stamp = stamp[:2] + (_get_version(store_path, tax_id),)
+
+        _TABLE_CACHE.put((tax_id, dna), table, stamp)
+
+    return {amino_acid: dict(codons) for amino_acid, codons in table.items()}
+
+
+def prefetch_tables(table_ids, concurrency=8, url=KAZUSA_URL):
+    """Downloads codon tables for many organisms concurrently and adds them
+    to the codon usage store of the writable cache. Tables already in any
+    layer of the local codon cache are skipped.
+
+    :param table_ids: an iterable of organism names or NCBI Taxonomy ids.
+    :type table_ids: iterable
+    :param concurrency: the maximum number of concurrent downloads.
+    :type concurrency: int
+    :param url: the url template, with a placeholder for the tax id.
+    :type url: str
+    :return: the NCBI Taxonomy ids of all tables requested, whether fetched
+        or already cached, without duplicates.
+    :rtype: list
+    """
+    tax_ids = list(
+        dict.fromkeys(get_tax_id(table_id) for table_id in table_ids)
+    )
+    missing = [tax_id for tax_id in tax_ids if _read_table(tax_id) is None]
+
+    if missing:
+        CodonUsageStore().import_files(
+            fetch_all(
+                missing, get_cache_dir(), concurrency=concurrency, url=url
+            )
+        )
+
+    return tax_ids
+
+
+def build_table_from_sequences(
+    sequences, fmt=None, genetic_code=1, table_id=None, batch_size=1000
+):
+    """Builds a codon usage table by counting the codons of coding sequences.
+
+    Sequences are streamed in batches, so memory use is bounded by the batch
+    size (and, for GenBank files, by the size of the largest record) rather
+    than by the size of the input.
+
+    :param sequences: a FASTA or GenBank filename (optionally gzipped) or
+        file handle, or an iterable of coding sequences (as str or
+        Bio.SeqRecord). Each FASTA record is taken to be a coding sequence,
+        while the CDS features of GenBank records are extracted.
+    :type sequences: str or iterable
+    :param fmt: the file format, fasta or genbank (default is None, which
+        infers the format from the file extension).
+    :type fmt: str
+    :param genetic_code: the genetic code, used to group codons by amino
+        acid (default is 1, the standard code).
+    :type genetic_code: int or str or GeneticCode
+    :param table_id: an optional id, under which the table is registered in
+        the local codon usage store, so that it can be got with get_table.
+    :type table_id: str
+    :param batch_size: the number of sequences counted at once.
+    :type batch_size: int
+    :return: a codon usage table, with DNA codons.
+    :rtype: dict
+    """
+    code = get_genetic_code(genetic_code)
+    counts = np.zeros(len(code.amino_acids))
+    seqs = get_coding_sequences(sequences, fmt)
 
-    for vals in sorted(re.findall(_CODON_REGEX, content),
-                       key=lambda x: (x[1], x[2])):
-        results[vals[1]][vals[0].replace("U", "T") if dna else vals[0]] = \
-            float(vals[2])
+    while True:
+        batch = list(itertools.islice(seqs, batch_size))
 
-    return dict(results)
+        if not batch:
+            break
+
+        counts += codon_counts(batch).sum(axis=0)
+
+    array = CodonArray(counts, code.amino_acids).normalise()
+    table = CodonArray(np.nan_to_num(array.values), code.amino_acids).to_dict()
+
+    if table_id is not None:
+        CodonUsageStore().put(table_id, table)
+
+    return table
+
+
+def get_coding_sequences(sequences, fmt=None):
+    """Gets the coding sequences of a FASTA or GenBank file, or of an
+    iterable, lazily.
+
+    :param sequences: a FASTA or GenBank filename (optionally gzipped) or
+        file handle, or an iterable of coding sequences (as str or
+        Bio.SeqRecord). Each FASTA record is taken to be a coding sequence,
+        while the CDS features of GenBank records are extracted.
+    :type sequences: str or iterable
+    :param fmt: the file format (default is None, which infers the format
+        from the file extension).
+    :type fmt: str
+    :return: a generator of coding sequences.
+    :rtype: generator
+    """
+    if isinstance(sequences, str):
+        opener = gzip.open if sequences.endswith(".gz") else open
+
+        with opener(sequences, "rt") as fle:
+            yield from get_coding_sequences(fle, fmt or _get_format(sequences))
+
+        return
+
+    if not hasattr(sequences, "read"):
+        for seq in sequences:
+            yield str(getattr(seq, "seq", seq))
+
+        return
+
+    fmt = fmt or _get_format(getattr(sequences, "name", ""))
+
+    for record in SeqIO.parse(sequences, fmt):
+        if fmt == "fasta":
+            yield str(record.seq)
+            continue
+
+        for feature in record.features:
+            if feature.type == "CDS":
+                yield str(feature.extract(record.seq))
+
+
+def get_cache_info():
+    """Gets statistics of the in-memory cache of codon tables.
+
+    :return: the hits, misses, evictions, maximum size and current size.
+    :rtype: synbiopython.codon.cache.CacheInfo
+    """
+    return _TABLE_CACHE.info()
+
+
+def set_cache_size(maxsize):
+    """Sets the maximum number of codon tables held in memory.
+
+    :param maxsize: the maximum number of codon tables.
+    :type maxsize: int
+    """
+    _TABLE_CACHE.resize(maxsize)
+
+
+def clear_cache():
+    """Clears the in-memory cache of codon tables."""
+    _TABLE_CACHE.clear()
+    _STORE_VERSIONS.clear()
+
+
+def _get_stamp(filename):
+    """Gets a stamp identifying the current version of a store or file.
+
+    :param filename: the filename.
+    :type filename: str
+    :return: the modification time and size of the file, and the file change
+        counter in its SQLite header (which changes with every write, even
+        within the resolution of modification times), or None if it does
+        not exist.
+    :rtype: tuple
+    """
+    try:
+        with open(filename, "rb") as fle:
+            stat = os.fstat(fle.fileno())
+            fle.seek(24)
+            counter = fle.read(4)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size, counter
+
+
+def _get_shared_stamp(tax_id):
+    """Gets a stamp identifying the current versions of the stores and Codon
+    Usage Database files of shared cache directories that a table may be
+    read from.
+
+    :param tax_id: a NCBI Taxonomy id, or the id of a custom table.
+    :type tax_id: str
+    :return: the paths of the shared stores and files, with their stamps.
+    :rtype: tuple
+    """
+    paths = [
+        path
+        for dir_name in get_shared_dirs()
+        for path in [
+            os.path.join(dir_name, STORE_FILENAME),
+            os.path.join(dir_name, "%s.txt" % tax_id),
+        ]
+    ]
+
+    return tuple((path, _get_stamp(path)) for path in paths)
+
+
+def _get_version(store_path, tax_id):
+    """Gets the version of a table in a writable store.
+
+    Versions are read from the store at most once per change of the store
+    file, so that looking up cached tables does not query the store.
+
+    :param store_path: the path of the store.
+    :type store_path: str
+    :param tax_id: a NCBI Taxonomy id, or the id of a custom table.
+    :type tax_id: str
+    :return: the version, or None if not in the store.
+    :rtype: int
+    """
+    file_stamp = _get_stamp(store_path)
+
+    if file_stamp is None:
+        return None
+
+    entry = _STORE_VERSIONS.get(store_path)
+
+    if entry is None or entry[0] != file_stamp:
+        entry = _STORE_VERSIONS[store_path] = (file_stamp, {})
+
+    versions = entry[1]
+
+    if tax_id not in versions:
+        versions[tax_id] = CodonUsageStore(store_path).version(tax_id)
+
+    return versions[tax_id]
 
 
 def _get_content(tax_id):
@@ -50,18 +325,55 @@ def _get_content(tax_id):
     :return: the Codon Usage Database content
     :rtype: str
     """
-    target_dir = os.path.join(os.path.expanduser('~'), '.synbiopython/codon')
+    with open(fetch_content(tax_id, get_cache_dir())) as fle:
+        return fle.read()
 
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
 
-    target_file = os.path.join(target_dir, "%s.txt" % tax_id)
+def _read_table(tax_id, dna=True):
+    """Reads a codon table from the layers of the local codon cache, without
+    downloading: from the stores, then from the Codon Usage Database files,
+    of shared cache directories, and finally from the writable store.
 
-    if not os.path.exists(target_file):
-        url = "http://www.kazusa.or.jp/codon/cgi-bin/showcodon.cgi?" + \
-            "aa=1&style=N&species=%s" % tax_id
+    :param tax_id: a NCBI Taxonomy id, or the id of a custom table.
+    :type tax_id: str
+    :param dna: boolean parameter specifying whether the codon table returned
+        should contain DNA or RNA codons.
+    :type dna: bool
+    :return: a codon usage table, or None if not in the local codon cache.
+    :rtype: dict
+    """
+    for path in get_shared_store_paths():
+        table = CodonUsageStore(path, read_only=True).get(tax_id, dna=dna)
 
-        urlretrieve(url, target_file)
+        if table is not None:
+            return table
 
-    with open(target_file) as fle:
-        return fle.read()
+    for dir_name in get_shared_dirs():
+        filename = os.path.join(dir_name, "%s.txt" % tax_id)
+
+        if os.path.exists(filename):
+            return CodonArray.from_dict(parse_file(filename)).to_dict(dna)
+
+    if os.path.exists(get_store_path()):
+        return CodonUsageStore().get(tax_id, dna=dna)
+
+    return None
+
+
+def _get_format(filename):
+    """Infers the format of a sequence file from its extension.
+
+    :param filename: the filename.
+    :type filename: str
+    :return: genbank or fasta.
+    :rtype: str
+    """
+    filename = str(filename)
+
+    if filename.endswith(".gz"):
+        filename = filename[:-3]
+
+    if os.path.splitext(filename)[1].lower() in _GENBANK_EXTS:
+        return "genbank"
+
+    return "fasta"
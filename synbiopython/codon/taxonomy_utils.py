@@ -7,31 +7,183 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 
 @author: neilswainston
 """
+import bisect
+from collections import defaultdict
 import os.path
+import threading
+
+import numpy as np
 
-import pandas as pd
 from synbiopython.codon import DATA_DIR
 
+ERRORS = ["raise", "coerce", "ignore"]
+
+_SPEC_INDEX = None
+_SPEC_INDEX_LOCK = threading.Lock()
+_SEARCH_INDEX = None
+
 
-def _get_spec_df():
-    """Get NCBI Taxonomy ids and organism from species.table as a Pandas
-    DataFrame.
+class _SpeciesIndex:
+    """Index of NCBI Taxonomy ids and organism names from species.table.
 
-    :return: a Pandas DataFrame, containing NCBI Taxonomy ids and organism
-        names.
-    :rtype: pd.DataFrame
+    :param filename: the species.table filename.
+    :type filename: str
     """
-    spec_tab_df = pd.read_csv(
-        os.path.join(DATA_DIR, "species.table"),
-        names=["name", "tax_id"],
-        sep="\t",
-        comment="#",
-    )
 
-    return spec_tab_df.set_index("tax_id")
+    def __init__(self, filename):
+        self.name_to_id = {}
+        self.id_to_name = {}
+
+        with open(filename) as fle:
+            for line in fle:
+                if line.startswith("#"):
+                    continue
+
+                name, tax_id = line.rstrip("\n").split("\t")
+                self.name_to_id.setdefault(name, tax_id)
+                self.id_to_name.setdefault(tax_id, name)
+
+
+class _SearchIndex:
+    """Search index of organism names, supporting case-insensitive prefix
+    completion (over a sorted array of names) and approximate matching (over
+    an index of character trigrams).
+
+    :param names: the organism names.
+    :type names: list
+    """
+
+    def __init__(self, names):
+        self.names = sorted(names, key=str.lower)
+        self.lower_names = [name.lower() for name in self.names]
+
+        postings = defaultdict(list)
+        self.num_trigrams = np.empty(len(self.names), dtype=np.int32)
+
+        for idx, name in enumerate(self.lower_names):
+            trigrams = _get_trigrams(name)
+            self.num_trigrams[idx] = len(trigrams)
+
+            for trigram in trigrams:
+                postings[trigram].append(idx)
+
+        self.postings = {
+            trigram: np.array(idxs, dtype=np.int32)
+            for trigram, idxs in postings.items()
+        }
+
+    def complete(self, prefix, limit):
+        """Complete a prefix.
+
+        :param prefix: the prefix.
+        :type prefix: str
+        :param limit: the maximum number of names.
+        :type limit: int
+        :return: the matching names, in alphabetical order.
+        :rtype: list
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.lower_names, prefix)
+        names = []
+
+        for idx in range(start, min(start + limit, len(self.names))):
+            if not self.lower_names[idx].startswith(prefix):
+                break
+
+            names.append(self.names[idx])
+
+        return names
+
+    def search(self, query, k):
+        """Find the names sharing most trigrams with a query.
+
+        :param query: the query.
+        :type query: str
+        :param k: the maximum number of names.
+        :type k: int
+        :return: the names and their similarity (the Jaccard index of their
+            trigrams), best first (and then in alphabetical order).
+        :rtype: list
+        """
+        trigrams = _get_trigrams(query.lower())
+        idxs = [
+            self.postings[trigram]
+            for trigram in trigrams
+            if trigram in self.postings
+        ]
 
+        if not idxs:
+            return []
 
-_SPEC_DF = _get_spec_df()
+        counts = np.bincount(np.concatenate(idxs), minlength=len(self.names))
+        candidates = np.flatnonzero(counts)
+        shared = counts[candidates]
+        scores = shared / (
+            len(trigrams) + self.num_trigrams[candidates] - shared
+        )
+
+        if len(candidates) > k:
+            # Keep all names tying with the k-th best, so that ties are broken
+            # by name (as names are sorted) rather than arbitrarily:
+            kth_score = -np.partition(-scores, k - 1)[k - 1]
+            top = scores >= kth_score
+            candidates, scores = candidates[top], scores[top]
+
+        order = np.lexsort((candidates, -scores))[:k]
+
+        return [
+            (self.names[candidates[idx]], float(scores[idx])) for idx in order
+        ]
+
+
+def _get_trigrams(text):
+    """Get the set of character trigrams of a text, padded with spaces so that
+    starts and ends of words count.
+
+    :param text: the text.
+    :type text: str
+    :return: the trigrams.
+    :rtype: set
+    """
+    text = "  " + text + " "
+    return {text[idx : idx + 3] for idx in range(len(text) - 2)}
+
+
+def _get_spec_index():
+    """Get the index of NCBI Taxonomy ids and organism names, building it on
+    first use.
+
+    :return: the index of NCBI Taxonomy ids and organism names.
+    :rtype: _SpeciesIndex
+    """
+    global _SPEC_INDEX  # pylint: disable=global-statement
+
+    if _SPEC_INDEX is None:
+        with _SPEC_INDEX_LOCK:
+            if _SPEC_INDEX is None:
+                _SPEC_INDEX = _SpeciesIndex(
+                    os.path.join(DATA_DIR, "species.table")
+                )
+
+    return _SPEC_INDEX
+
+
+def _get_search_index():
+    """Get the search index of organism names, building it on first use.
+
+    :return: the search index of organism names.
+    :rtype: _SearchIndex
+    """
+    global _SEARCH_INDEX  # pylint: disable=global-statement
+
+    if _SEARCH_INDEX is None:
+        spec_index = _get_spec_index()
+
+        with _SPEC_INDEX_LOCK:
+            if _SEARCH_INDEX is None:
+                _SEARCH_INDEX = _SearchIndex(list(spec_index.name_to_id))
+
+    return _SEARCH_INDEX
 
 
 def get_tax_id(table_id):
@@ -44,15 +196,10 @@ def get_tax_id(table_id):
     :return: a NCBI Taxonomy id
     :rtype: str
     """
-    table_id = str(table_id)
-
-    if table_id in _SPEC_DF.index:
-        return table_id
+    tax_id = _resolve_tax_id(str(table_id), _get_spec_index())
 
-    tax_ids = _SPEC_DF.index[_SPEC_DF["name"] == table_id]
-
-    if tax_ids.any():
-        return tax_ids[0]
+    if tax_id is not None:
+        return tax_id
 
     raise ValueError("Unrecognised table id: %s" % table_id)
 
@@ -67,5 +214,159 @@ def get_organism_name(table_id):
     :return: an organism name
     :rtype: str
     """
-    tax_id = get_tax_id(table_id)
-    return _SPEC_DF.loc[tax_id, "name"] if tax_id else None
+    return _get_spec_index().id_to_name[get_tax_id(table_id)]
+
+
+def get_tax_ids(table_ids, errors="raise", fill_value=None):
+    """Gets NCBI Taxonomy ids from many organism names or NCBI Taxonomy ids.
+
+    Each distinct value is resolved once, with a single lookup in the species
+    index, so that large, repetitive inputs (such as a column of a sample
+    sheet) are resolved in time linear in their length.
+
+    :param table_ids: organism names or NCBI Taxonomy ids (as either str or
+        int), as a list, pandas Series or numpy array.
+    :type table_ids: iterable
+    :param errors: the policy for unrecognised values: raise (a ValueError),
+        coerce (to fill_value) or ignore (returning the value unchanged).
+    :type errors: str
+    :param fill_value: the value of unrecognised values, if coerced (default
+        is None).
+    :type fill_value: object
+    :return: an array of NCBI Taxonomy ids, aligned with table_ids.
+    :rtype: numpy.ndarray
+    """
+    spec_index = _get_spec_index()
+    return _resolve_all(
+        table_ids,
+        lambda key: _resolve_tax_id(key, spec_index),
+        errors,
+        fill_value,
+    )
+
+
+def get_organism_names(table_ids, errors="raise", fill_value=None):
+    """Gets organism names from many organism names or NCBI Taxonomy ids.
+
+    :param table_ids: organism names or NCBI Taxonomy ids (as either str or
+        int), as a list, pandas Series or numpy array.
+    :type table_ids: iterable
+    :param errors: the policy for unrecognised values: raise (a ValueError),
+        coerce (to fill_value) or ignore (returning the value unchanged).
+    :type errors: str
+    :param fill_value: the value of unrecognised values, if coerced (default
+        is None).
+    :type fill_value: object
+    :return: an array of organism names, aligned with table_ids.
+    :rtype: numpy.ndarray
+    """
+    spec_index = _get_spec_index()
+    return _resolve_all(
+        table_ids,
+        lambda key: spec_index.id_to_name.get(
+            _resolve_tax_id(key, spec_index)
+        ),
+        errors,
+        fill_value,
+    )
+
+
+def complete_organism_names(prefix, limit=10):
+    """Gets organism names starting with the supplied prefix, ignoring case.
+
+    :param prefix: the prefix of an organism name.
+    :type prefix: str
+    :param limit: the maximum number of names returned (default is 10).
+    :type limit: int
+    :return: the matching organism names, in alphabetical order.
+    :rtype: list
+    """
+    return _get_search_index().complete(prefix, limit)
+
+
+def search_organism_names(query, k=10):
+    """Gets the organism names most similar to the supplied query, which may
+    be partial or misspelled, ignoring case.
+
+    :param query: the query.
+    :type query: str
+    :param k: the maximum number of names returned (default is 10).
+    :type k: int
+    :return: a list of (organism name, similarity score) tuples, best first
+        (with ties in alphabetical order). Scores are between 0 and 1, with 1
+        indicating a perfect match.
+    :rtype: list
+    """
+    return _get_search_index().search(query, k)
+
+
+def _resolve_tax_id(table_id, spec_index):
+    """Resolves an organism name or a NCBI Taxonomy id to a NCBI Taxonomy id.
+
+    :param table_id: an organism name or a NCBI Taxonomy id.
+    :type table_id: str
+    :param spec_index: the index of NCBI Taxonomy ids and organism names.
+    :type spec_index: _SpeciesIndex
+    :return: a NCBI Taxonomy id, or None if unrecognised.
+    :rtype: str
+    """
+    if table_id in spec_index.id_to_name:
+        return table_id
+
+    return spec_index.name_to_id.get(table_id)
+
+
+def _resolve_all(table_ids, resolve, errors, fill_value):
+    """Resolves many values, resolving each distinct value once.
+
+    :param table_ids: the values.
+    :type table_ids: iterable
+    :param resolve: a function resolving a value (as a str), returning None
+        if unrecognised.
+    :type resolve: function
+    :param errors: the policy for unrecognised values.
+    :type errors: str
+    :param fill_value: the value of unrecognised values, if coerced.
+    :type fill_value: object
+    :return: an array of resolved values, aligned with table_ids.
+    :rtype: numpy.ndarray
+    """
+    if errors not in ERRORS:
+        raise ValueError("Unrecognised errors policy: %s" % errors)
+
+    values = np.asarray(table_ids, dtype=object)
+    keys = [_to_key(value) for value in values.ravel().tolist()]
+    resolved = {key: resolve(key) for key in dict.fromkeys(keys)}
+
+    if errors == "raise":
+        for key, res in resolved.items():
+            if res is None:
+                raise ValueError("Unrecognised table id: %s" % key)
+
+    result = np.empty(len(keys), dtype=object)
+    result[:] = [resolved[key] for key in keys]
+
+    unknown = np.equal(result, None)
+
+    if unknown.any():
+        result[unknown] = (
+            values.ravel()[unknown] if errors == "ignore" else fill_value
+        )
+
+    return result.reshape(values.shape)
+
+
+def _to_key(value):
+    """Converts a value to a str, as used as keys of the species index.
+    Integral floats (such as ids in a pandas column with missing values) are
+    converted as ints.
+
+    :param value: the value.
+    :type value: object
+    :return: the value, as a str.
+    :rtype: str
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value)
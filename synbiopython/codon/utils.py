@@ -7,9 +7,105 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 
 @author: neilswainston
 """
+from collections import deque
+import heapq
+import itertools
+import math
 import random
+import sys
 
-_CODON_REGEX = r"([ATGCU]{3}) ([A-Z]|\*) (\d.\d+)"
+import numpy as np
+
+from synbiopython.codon.cache import LRUCache
+from synbiopython.codon.codon_array import CodonArray
+from synbiopython.codon.codons import CODONS, to_codon_indices
+
+# Compiled codon tables of running optimise_many calls, by token, set by the
+# worker initializer (or inherited by forked worker processes):
+_WORKER_TABLES = {}
+_WORKER_TOKENS = itertools.count()
+
+# Harmonisation maps of recently used pairs of tables:
+_HARMONISATION_CACHE = LRUCache(maxsize=128)
+
+# The nucleotides (as ASCII codes) of each codon, indexed as codons.CODONS:
+_CODON_CODES = np.frombuffer("".join(CODONS).encode("ascii"), np.uint8)
+_CODON_CODES = _CODON_CODES.reshape(len(CODONS), 3)
+
+
+class CompiledCodonTable:
+    """A codon usage table compiled into NumPy arrays for fast sampling.
+
+    Codon frequencies are normalised per amino acid and stored as cumulative
+    probabilities. The cumulative probabilities of the i-th amino acid are
+    offset by i, so that all amino acids share a single sorted array and a
+    whole sequence can be sampled with one call to ``numpy.searchsorted``.
+
+    :param table: a codon usage table, as returned by
+        ``synbiopython.codon.table.get_table``.
+    :type table: dict
+    """
+
+    def __init__(self, table):
+        self.amino_acids = sorted(table)
+        codons = []
+        cum_probs = []
+
+        for offset, amino_acid in enumerate(self.amino_acids):
+            aa_codons = list(table[amino_acid].keys())
+            freqs = np.array(list(table[amino_acid].values()), dtype=float)
+            total = freqs.sum()
+
+            if total > 0:
+                freqs = freqs / total
+            else:
+                freqs = np.full(len(freqs), 1.0 / len(freqs))
+
+            cum_freqs = np.cumsum(freqs)
+            cum_freqs[-1] = 1.0
+            codons.extend(aa_codons)
+            cum_probs.append(cum_freqs + offset)
+
+        self.codons = np.array(codons, dtype="S3")
+        self.cum_probs = np.concatenate(cum_probs)
+        self._last_idxs = np.cumsum([len(cum) for cum in cum_probs]) - 1
+
+        # Lookup from amino acid (as an ASCII code) to its offset:
+        self._aa_offsets = np.full(256, -1, dtype=np.int64)
+
+        for offset, amino_acid in enumerate(self.amino_acids):
+            self._aa_offsets[ord(amino_acid)] = offset
+
+    def sample(self, aa_seq, rng=None):
+        """Sample codons for every amino acid of a sequence in a single pass.
+
+        :param aa_seq: an amino acid sequence.
+        :type aa_seq: str
+        :param rng: an optional random number generator, for reproducible
+            sampling.
+        :type rng: numpy.random.Generator
+        :return: a nucleic acid sequence, encoding the supplied amino acid
+            sequence.
+        :rtype: str
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        offsets = self._aa_offsets[
+            np.frombuffer(aa_seq.encode("ascii"), dtype=np.uint8)
+        ]
+
+        if (offsets < 0).any():
+            unknown = aa_seq[int(np.argmax(offsets < 0))]
+            raise KeyError(unknown)
+
+        # Draw from [0, 1) and shift into the block of each amino acid:
+        draws = rng.random(len(offsets)) + offsets
+        idxs = np.searchsorted(self.cum_probs, draws, side="right")
+
+        # Guard against draws rounded up onto the next block:
+        idxs = np.minimum(idxs, self._last_idxs[offsets])
+        return self.codons[idxs].tobytes().decode("ascii")
 
 
 def sample(table, amino_acid):
@@ -36,15 +132,429 @@ def sample(table, amino_acid):
     return None
 
 
-def optimise(table, aa_seq):
+def optimise(table, aa_seq, rng=None, genetic_code=None):
     """Codon optimise an amino acid sequence.
 
-    :param table: a codon usage table.
-    :type table: dict
+    :param table: a codon usage table, either as a dict or as a
+        CompiledCodonTable. Dicts are compiled on each call, so compile once
+        when optimising many sequences against the same table.
+    :type table: dict or CompiledCodonTable
     :param aa_seq: an amino acid sequence.
-    :type table: str
+    :type aa_seq: str
+    :param rng: an optional random number generator, for reproducible runs.
+    :type rng: numpy.random.Generator
+    :param genetic_code: an optional genetic code (such as a NCBI translation
+        table id) of the host. Codons of a dict table are reassigned to the
+        amino acids they encode under this code, and their frequencies
+        renormalised (see genetic_code.remap_table). Default is None, which
+        uses the table as it is.
+    :type genetic_code: int or str or GeneticCode
     :return: a codon-optimised nucleic acid sequence, encoding the supplied
         amino acid sequence
     :rtype: str
     """
-    return ''.join([sample(table, amino_acid) for amino_acid in aa_seq])
+    if genetic_code is not None:
+        if isinstance(table, CompiledCodonTable):
+            raise ValueError(
+                "genetic_code cannot be applied to a CompiledCodonTable; "
+                "compile the output of genetic_code.remap_table instead"
+            )
+
+        # Imported here, as genetic_code imports Bio.Data:
+        # pylint: disable=import-outside-toplevel
+        from synbiopython.codon.genetic_code import remap_table
+
+        table = remap_table(table, genetic_code)
+
+    if not isinstance(table, CompiledCodonTable):
+        table = CompiledCodonTable(table)
+
+    return table.sample(aa_seq, rng=rng)
+
+
+def optimise_many(
+    table, sequences, workers=1, chunksize=64, seed=None, mp_context=None
+):
+    """Codon optimise many amino acid sequences, optionally over a pool of
+    worker processes.
+
+    The compiled table is sent to each worker once, when the worker starts.
+    (Python 3.6 has no worker initializer: there, workers started by fork
+    inherit the table, while other start methods receive it with each
+    chunk.) Sequences are processed in chunks, each with its own random number
+    stream spawned from ``seed``, so results are reproducible whatever the
+    number of workers. Results are yielded lazily, in input order, and only
+    a bounded number of chunks are in flight at any time.
+
+    :param table: a codon usage table, either as a dict or as a
+        CompiledCodonTable.
+    :type table: dict or CompiledCodonTable
+    :param sequences: an iterable of amino acid sequences.
+    :type sequences: iterable
+    :param workers: the number of worker processes (default is 1, which runs
+        in the current process).
+    :type workers: int
+    :param chunksize: the number of sequences per chunk.
+    :type chunksize: int
+    :param seed: an optional seed, for reproducible runs.
+    :type seed: int
+    :param mp_context: an optional multiprocessing context, to start workers
+        with a given start method (Python 3.7 or later).
+    :type mp_context: multiprocessing.context.BaseContext
+    :return: a generator of codon-optimised nucleic acid sequences.
+    :rtype: generator
+    """
+    if not isinstance(table, CompiledCodonTable):
+        table = CompiledCodonTable(table)
+
+    seed_seq = np.random.SeedSequence(seed)
+    chunks = _get_chunks(sequences, chunksize, seed_seq)
+
+    if workers <= 1:
+        for chunk in chunks:
+            for dna_seq in _optimise_chunk(chunk, table):
+                yield dna_seq
+        return
+
+    # Imported here, as only needed with worker processes:
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    token = next(_WORKER_TOKENS)
+    _WORKER_TABLES[token] = table
+    pool_args = {"max_workers": workers}
+    payload = None
+
+    if mp_context is not None:
+        pool_args["mp_context"] = mp_context
+
+    if sys.version_info >= (3, 7):
+        pool_args["initializer"] = _init_worker
+        pool_args["initargs"] = (token, table)
+    elif multiprocessing.get_start_method() != "fork":
+        payload = table
+
+    try:
+        with ProcessPoolExecutor(**pool_args) as executor:
+            pending = deque()
+
+            for chunk in chunks:
+                pending.append(
+                    executor.submit(_optimise_chunk, chunk, payload, token)
+                )
+
+                if len(pending) >= 2 * workers:
+                    for dna_seq in pending.popleft().result():
+                        yield dna_seq
+
+            while pending:
+                for dna_seq in pending.popleft().result():
+                    yield dna_seq
+    finally:
+        del _WORKER_TABLES[token]
+
+
+def back_translations(table, aa_seq, k=None):
+    """Enumerates the back-translations of an amino acid sequence in order of
+    decreasing probability under a codon usage table, lazily.
+
+    Back-translations are generated best-first from a heap. Positions are
+    ordered by the cost of replacing their most frequent codon by the next,
+    so that each back-translation has a single parent and at most three
+    children, each no more probable than their parent. Memory therefore
+    grows with the number of back-translations consumed, rather than with
+    the (exponential) number of possible back-translations, and no work is
+    done beyond the last one requested.
+
+    :param table: a codon usage table.
+    :type table: dict
+    :param aa_seq: an amino acid sequence.
+    :type aa_seq: str
+    :param k: the maximum number of back-translations (default is None, for
+        all).
+    :type k: int
+    :return: a generator of (nucleic acid sequence, log probability) tuples,
+        most probable first. Ties are broken deterministically.
+    :rtype: generator
+    """
+    if k is not None and k < 1:
+        return
+
+    codon_lists = {
+        amino_acid: _get_ranked_codons(codon_freqs)
+        for amino_acid, codon_freqs in table.items()
+    }
+    positions = [codon_lists[amino_acid] for amino_acid in aa_seq]
+
+    # Positions with a choice of codon, cheapest second choice first:
+    order = sorted(
+        (idx for idx, codons in enumerate(positions) if len(codons) > 1),
+        key=lambda idx: positions[idx][0][1] - positions[idx][1][1],
+    )
+    best = [codons[0][0] for codons in positions]
+    root_score = sum(codons[0][1] for codons in positions)
+
+    def get_seq(ranks):
+        seq = list(best)
+
+        for idx, rank in zip(order, ranks):
+            seq[idx] = positions[idx][rank][0]
+
+        return "".join(seq)
+
+    def get_score(score, pos, old_rank, new_rank):
+        codons = positions[order[pos]]
+        return score - codons[old_rank][1] + codons[new_rank][1]
+
+    counter = itertools.count()
+    heap = []
+
+    if order:
+        ranks = (1,) + (0,) * (len(order) - 1)
+        heap.append((-get_score(root_score, 0, 0, 1), next(counter), 0, ranks))
+
+    yield "".join(best), root_score
+
+    for _ in range(1, k) if k is not None else itertools.count(1):
+        if not heap:
+            return
+
+        score, _, pos, ranks = heapq.heappop(heap)
+        score = -score
+        yield get_seq(ranks), score
+
+        children = []
+        rank = ranks[pos]
+
+        # Take the next codon at the current position:
+        if rank + 1 < len(positions[order[pos]]):
+            children.append(
+                (
+                    get_score(score, pos, rank, rank + 1),
+                    pos,
+                    ranks[:pos] + (rank + 1,) + ranks[pos + 1 :],
+                )
+            )
+
+        if pos + 1 < len(order):
+            next_score = get_score(score, pos + 1, 0, 1)
+            next_ranks = ranks[: pos + 1] + (1,) + ranks[pos + 2 :]
+
+            # Also take the second codon at the next position:
+            children.append((next_score, pos + 1, next_ranks))
+
+            # Or move the second codon from this position to the next:
+            if rank == 1:
+                children.append(
+                    (
+                        get_score(next_score, pos, 1, 0),
+                        pos + 1,
+                        ranks[:pos] + (0,) + next_ranks[pos + 1 :],
+                    )
+                )
+
+        for child_score, child_pos, child_ranks in children:
+            heapq.heappush(
+                heap, (-child_score, next(counter), child_pos, child_ranks)
+            )
+
+
+def harmonise(sequences, source_table, target_table):
+    """Codon harmonise one or many nucleic acid sequences from a source host
+    to a target host, replacing each codon by the synonymous codon of the
+    same usage rank in the target host, so that the pattern of common and
+    rare codons is preserved.
+
+    :param sequences: a nucleic acid sequence, or a list of these. Codons
+        are read in frame from the first nucleotide. Ambiguous codons and
+        trailing nucleotides are left unchanged.
+    :type sequences: str or list
+    :param source_table: the codon usage table of the source host, or its
+        organism name or NCBI Taxonomy id.
+    :type source_table: dict or str
+    :param target_table: the codon usage table of the target host, or its
+        organism name or NCBI Taxonomy id.
+    :type target_table: dict or str
+    :return: the harmonised sequence, or a list of these.
+    :rtype: str or list
+    """
+    if isinstance(sequences, str):
+        return harmonise([sequences], source_table, target_table)[0]
+
+    mapping = get_harmonisation_map(source_table, target_table)
+    lengths = [len(seq) // 3 * 3 for seq in sequences]
+    seq = "".join(seq[:length] for seq, length in zip(sequences, lengths))
+
+    idxs = to_codon_indices(seq)
+    valid = idxs >= 0
+    codes = np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+    codes = codes.reshape(-1, 3).copy()
+    codes[valid] = _CODON_CODES[mapping[idxs[valid]]]
+    harmonised = codes.tobytes().decode("ascii")
+
+    results = []
+    start = 0
+
+    for orig_seq, length in zip(sequences, lengths):
+        result = harmonised[start : start + length] + orig_seq[length:]
+        start += length
+
+        if "U" in orig_seq.upper():
+            result = result.replace("T", "U")
+
+        results.append(result)
+
+    return results
+
+
+def get_harmonisation_map(source_table, target_table):
+    """Gets the map of each codon of a source host to the synonymous codon of
+    the same usage rank in a target host.
+
+    Maps are cached, so are computed once per pair of tables.
+
+    :param source_table: the codon usage table of the source host, or its
+        organism name or NCBI Taxonomy id.
+    :type source_table: dict or str
+    :param target_table: the codon usage table of the target host, or its
+        organism name or NCBI Taxonomy id.
+    :type target_table: dict or str
+    :return: a read-only array of 64 target codon indices, indexed as
+        codons.CODONS.
+    :rtype: numpy.ndarray
+    """
+    # Imported here, as table imports Bio.SeqIO and sqlite3:
+    # pylint: disable=import-outside-toplevel
+    from synbiopython.codon.table import get_table
+
+    source, target = [
+        CodonArray.from_dict(
+            table if isinstance(table, dict) else get_table(table)
+        )
+        for table in [source_table, target_table]
+    ]
+    key = tuple(
+        array.tobytes()
+        for array in [
+            source.values,
+            source.amino_acids,
+            target.values,
+            target.amino_acids,
+        ]
+    )
+    mapping = _HARMONISATION_CACHE.get(key)
+
+    if mapping is None:
+        mapping = np.arange(len(CODONS))
+        source_freqs = np.nan_to_num(source.values, nan=-1.0)
+        target_freqs = target.values
+
+        for amino_acid in np.unique(source.amino_acids):
+            source_idxs = np.flatnonzero(source.amino_acids == amino_acid)
+            target_idxs = np.flatnonzero(
+                (target.amino_acids == amino_acid) & ~np.isnan(target.values)
+            )
+
+            if not len(target_idxs):
+                continue
+
+            # Codons of each amino acid, most frequent first:
+            source_idxs = source_idxs[
+                np.argsort(-source_freqs[source_idxs], kind="stable")
+            ]
+            target_idxs = target_idxs[
+                np.argsort(-target_freqs[target_idxs], kind="stable")
+            ]
+            ranks = np.minimum(
+                np.arange(len(source_idxs)), len(target_idxs) - 1
+            )
+            mapping[source_idxs] = target_idxs[ranks]
+
+        mapping.flags.writeable = False
+        _HARMONISATION_CACHE.put(key, mapping)
+
+    return mapping
+
+
+def _get_ranked_codons(codon_freqs):
+    """Gets the codons of an amino acid with their log probabilities, most
+    probable first.
+
+    Codons of zero frequency are dropped, unless all codons have zero
+    frequency, in which case all are taken to be equally probable.
+
+    :param codon_freqs: a dict of codon to frequency.
+    :type codon_freqs: dict
+    :return: a list of (codon, log probability) tuples.
+    :rtype: list
+    """
+    total = sum(codon_freqs.values())
+
+    if total <= 0:
+        codon_freqs = dict.fromkeys(codon_freqs, 1.0)
+        total = len(codon_freqs)
+
+    return sorted(
+        (
+            (codon, math.log(freq / total))
+            for codon, freq in codon_freqs.items()
+            if freq > 0
+        ),
+        key=lambda codon_log_prob: (-codon_log_prob[1], codon_log_prob[0]),
+    )
+
+
+def _get_chunks(sequences, chunksize, seed_seq):
+    """Split sequences into chunks, each paired with its own SeedSequence.
+
+    :param sequences: an iterable of amino acid sequences.
+    :type sequences: iterable
+    :param chunksize: the number of sequences per chunk.
+    :type chunksize: int
+    :param seed_seq: the root SeedSequence.
+    :type seed_seq: numpy.random.SeedSequence
+    :return: a generator of (SeedSequence, list of sequences) tuples.
+    :rtype: generator
+    """
+    iterator = iter(sequences)
+
+    for idx in itertools.count():
+        chunk = list(itertools.islice(iterator, chunksize))
+
+        if not chunk:
+            return
+
+        yield np.random.SeedSequence(
+            seed_seq.entropy, spawn_key=seed_seq.spawn_key + (idx,)
+        ), chunk
+
+
+def _init_worker(token, table):
+    """Initialise a worker process with a compiled codon table.
+
+    :param token: the token of the table.
+    :type token: int
+    :param table: a compiled codon table.
+    :type table: CompiledCodonTable
+    """
+    _WORKER_TABLES[token] = table
+
+
+def _optimise_chunk(chunk, table=None, token=None):
+    """Codon optimise a chunk of amino acid sequences.
+
+    :param chunk: a (SeedSequence, list of sequences) tuple.
+    :type chunk: tuple
+    :param table: a compiled codon table (default is the table of the
+        current worker process).
+    :type table: CompiledCodonTable
+    :param token: the token of the table of the current worker process.
+    :type token: int
+    :return: a list of codon-optimised nucleic acid sequences.
+    :rtype: list
+    """
+    seed_seq, aa_seqs = chunk
+    rng = np.random.default_rng(seed_seq)
+    table = _WORKER_TABLES[token] if table is None else table
+    return [table.sample(aa_seq, rng=rng) for aa_seq in aa_seqs]
@@ -1,6 +1,11 @@
 # pylint: disable=C0114
 from .containers.Plate import Plate
+from .containers.ArrayPlate import ArrayPlate
+from .containers.ComponentIndex import ComponentIndex, PlateCollectionIndex
 from .containers.builtin_containers import (
+    ArrayPlate96,
+    ArrayPlate384,
+    ArrayPlate1536,
     Plate96,
     Plate384,
     Plate1536,
@@ -12,4 +17,5 @@ from .containers.builtin_containers import (
     Trough8x1,
 )
 from .picklist.PickList import PickList, Transfer
+from .picklist.Transfer import CompactTransfer
 from .picklist.Transfer import TransferError
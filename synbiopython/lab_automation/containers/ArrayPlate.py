@@ -0,0 +1,385 @@
+# pylint: disable=C0330,C0103,R0913,W0212,W0231
+"""This module implements an array-backed storage engine for plates.
+
+An ArrayPlate holds the volumes of its wells in a contiguous NumPy array, and
+the quantities of their components in a wells x components matrix. Wells are
+thin views over these arrays, created on demand (e.g. with ``plate["A1"]``),
+so that large plates allocate no per-well objects until wells are used.
+"""
+from collections.abc import Mapping, MutableMapping
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from synbiopython.lab_automation.containers.ComponentIndex import ComponentIndex
+from synbiopython.lab_automation.containers.Plate import Plate
+from synbiopython.lab_automation.containers.Well import Well
+from synbiopython.lab_automation.containers.WellContent import WellContent
+from synbiopython.lab_automation.containers.helper_functions import (
+    get_plate_geometry,
+)
+
+
+class ArrayQuantities(MutableMapping):
+    """Dict-like view {component: quantity} of a well of an ArrayPlate.
+
+    :param plate: The ArrayPlate on which the well is located
+    :param index: The index of the well in the plate's arrays (row order,
+        starting from 0)
+    """
+
+    __slots__ = ("plate", "index")
+
+    def __init__(self, plate, index):
+        self.plate = plate
+        self.index = index
+
+    def __getitem__(self, component):
+        column = self.plate._component_columns.get(component)
+        if column is None or not self.plate._present[self.index, column]:
+            raise KeyError(component)
+        return self.plate._quantities[self.index, column].item()
+
+    def __setitem__(self, component, quantity):
+        column = self.plate._get_component_column(component)
+        self.plate._quantities[self.index, column] = quantity
+        if not self.plate._present[self.index, column]:
+            self.plate._present[self.index, column] = True
+            self._index(component)
+
+    def __delitem__(self, component):
+        column = self.plate._component_columns.get(component)
+        if column is None or not self.plate._present[self.index, column]:
+            raise KeyError(component)
+        self.plate._quantities[self.index, column] = 0
+        self.plate._present[self.index, column] = False
+        self._unindex(component)
+
+    def __iter__(self):
+        components = self.plate._components
+        for column in np.flatnonzero(self.plate._present[self.index]):
+            yield components[column]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.plate._present[self.index]))
+
+    def clear(self):
+        """Remove all components from the well."""
+        for component in list(self):
+            self._unindex(component)
+        self.plate._quantities[self.index] = 0
+        self.plate._present[self.index] = False
+
+    def _index(self, component):
+        """Record the component in the component index of the plate."""
+        index = self.plate.component_index
+        if index is not None:
+            index.add(component, self.plate._get_well(self.index))
+
+    def _unindex(self, component):
+        """Remove the component from the component index of the plate."""
+        index = self.plate.component_index
+        if index is not None:
+            index.discard(component, self.plate._get_well(self.index))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ArrayWellContent(WellContent):
+    """View of the volume and quantities of a well of an ArrayPlate.
+
+    :param plate: The ArrayPlate on which the well is located
+    :param index: The index of the well in the plate's arrays
+    """
+
+    def __init__(self, plate, index):
+        self.plate = plate
+        self.index = index
+
+    @property
+    def volume(self):
+        """Return volume."""
+        return self.plate._volumes[self.index].item()
+
+    @volume.setter
+    def volume(self, volume):
+        self.plate._volumes[self.index] = volume
+
+    @property
+    def quantities(self):
+        """Return a dict-like view {component: quantity}."""
+        return ArrayQuantities(self.plate, self.index)
+
+    @quantities.setter
+    def quantities(self, quantities):
+        quantities = dict(quantities)
+        view = ArrayQuantities(self.plate, self.index)
+        for component in list(view):
+            if component not in quantities:
+                del view[component]
+        view.update(quantities)
+
+    @property
+    def wells(self):
+        """Return the tuple of wells holding the content."""
+        return (self.plate._get_well(self.index),)
+
+    def _index(self, component):
+        # The component index is updated by ArrayQuantities:
+        pass
+
+    def _unindex(self, component):
+        pass
+
+    def to_dict(self):
+        """Return a dict {volume: 0.0001, quantities: {...:...}}."""
+        return {"volume": self.volume, "quantities": dict(self.quantities)}
+
+
+class ArrayWell(Well):
+    """Well of an ArrayPlate, as a thin view over the plate's arrays.
+
+    Views are created on demand by the plate. Their data and sources are
+    stored by the plate, so that views of the same well are interchangeable
+    (and compare equal), and only for wells which have some: as with other
+    wells, they are created on first write.
+
+    :param plate: The ArrayPlate on which the well is located
+    :param index: The index of the well in the plate's arrays (row order,
+        starting from 0)
+    """
+
+    def __init__(self, plate, index):
+        self.plate = plate
+        self.index = index
+
+    @property
+    def row(self):
+        """Return the well's row (a number, starting from 1)."""
+        return self.index // self.plate.num_columns + 1
+
+    @property
+    def column(self):
+        """Return the well's column (a number, starting from 1)."""
+        return self.index % self.plate.num_columns + 1
+
+    @property
+    def name(self):
+        """Return the well's name, for instance "A1"."""
+        return self.plate.geometry.wellnames[self.index]
+
+    @property
+    def data(self):
+        """Return the dictionary storing data on the well (created on first
+        write)."""
+        return Well.data.fget(self)
+
+    @data.setter
+    def data(self, data):
+        self.plate._wells_data[self.index] = data
+
+    @property
+    def sources(self):
+        """Return the list of sources of the well (created on first
+        write)."""
+        return Well.sources.fget(self)
+
+    @sources.setter
+    def sources(self, sources):
+        self.plate._sources[self.index] = sources
+
+    def _get_data(self, create=False):
+        if create:
+            return self.plate._wells_data.setdefault(self.index, {})
+        return self.plate._wells_data.get(self.index)
+
+    def _get_sources(self, create=False):
+        if create:
+            return self.plate._sources.setdefault(self.index, [])
+        return self.plate._sources.get(self.index)
+
+    @property
+    def content(self):
+        """Return a view of the volume and quantities of the well."""
+        return ArrayWellContent(self.plate, self.index)
+
+    @content.setter
+    def content(self, content):
+        """Copy the volume and quantities of a WellContent into the well."""
+        view = ArrayWellContent(self.plate, self.index)
+        view.quantities = content.quantities
+        view.volume = content.volume
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ArrayWell)
+            and (self.plate is other.plate)
+            and (self.index == other.index)
+        )
+
+    def __hash__(self):
+        return hash((id(self.plate), self.index))
+
+    def __reduce__(self):
+        return _get_well_view, (self.plate, self.index)
+
+
+def _get_well_view(plate, index):
+    """Return a view of a well of an ArrayPlate (used to pickle and copy well
+    views, possibly before the plate's state is restored)."""
+    return type(plate)._get_well_class()(plate, index)
+
+
+class _WellViews(Mapping):
+    """Dict-like {wellname: well} of an ArrayPlate, creating wells on
+    demand."""
+
+    __slots__ = ("plate",)
+
+    def __init__(self, plate):
+        self.plate = plate
+
+    def __getitem__(self, wellname):
+        return self.plate._get_well(self.plate._get_index(wellname))
+
+    def __iter__(self):
+        return iter(self.plate.geometry.wellnames)
+
+    def __len__(self):
+        return self.plate.num_wells
+
+    def __contains__(self, wellname):
+        return wellname in self.plate.geometry.coordinates
+
+
+class ArrayPlate(Plate):
+    """Base class for array-backed plates.
+
+    Volumes are stored in a NumPy array of the plate's wells, in row order,
+    and the quantities of components in a wells x components matrix. The
+    ``Plate`` and ``Well`` API works on top of these arrays, with wells
+    created on demand as views (which are kept alive only while in use).
+
+    See the builtin_containers for usage classes (ArrayPlate96, etc).
+
+    :param name: Name or ID of the Plate as it will appear in strings and reports
+    :param wells_data: A dict {"A1": {data}, "A2": ...}.
+        The format of the data is left free
+    :param plate_data: plate data
+    """
+
+    def __init__(self, name=None, wells_data=None, plate_data=None):
+        self.name = name
+        self.data = plate_data or {}
+        self.wells_data = wells_data or {}
+        self.geometry = get_plate_geometry(self.num_rows, self.num_columns)
+        self.num_wells = self.geometry.num_wells
+        # Copies, as the geometry is shared by all plates of the same size:
+        self.rows = {row: list(names) for row, names in self.geometry.rows.items()}
+        self.columns = {
+            column: list(names) for column, names in self.geometry.columns.items()
+        }
+        self._volumes = np.zeros(self.num_wells)
+        self._quantities = np.zeros((self.num_wells, 0))
+        self._present = np.zeros((self.num_wells, 0), dtype=bool)
+        self._components = []
+        self._component_columns = {}
+        self._wells_data = {
+            self._get_index(wellname): data
+            for wellname, data in self.wells_data.items()
+        }
+        self._sources = {}
+        self.component_index = ComponentIndex(self)
+        self._init_views()
+
+    def _init_views(self):
+        self._views = WeakValueDictionary()
+        self.wells = _WellViews(self)
+
+    @property
+    def volumes(self):
+        """Return the array of the volumes of the wells, in row order."""
+        return self._volumes
+
+    @property
+    def components(self):
+        """Return the list of components ever added to the plate's wells, in
+        the order of the columns of ``quantities``."""
+        return list(self._components)
+
+    @property
+    def quantities(self):
+        """Return the wells x components matrix of quantities, with wells in
+        row order and components in the order of ``components``."""
+        return self._quantities[:, : len(self._components)]
+
+    def get_wells(self, direction="row"):
+        """Return the tuple of all wells, ordered either by row or by column.
+
+        The order of well names is shared by all plates of the same geometry;
+        wells are created on demand, so the tuple is not kept by the plate.
+        """
+        get_well = self.wells.__getitem__
+        return tuple(map(get_well, self.geometry.get_wellnames(direction)))
+
+    def iter_wells(self, direction="row"):
+        """Iter through the wells either by row or by column, creating them
+        on demand."""
+        return map(self.wells.__getitem__, self.geometry.get_wellnames(direction))
+
+    def _get_index(self, wellname):
+        """Return the index of a well in the plate's arrays (from 0), raising
+        a KeyError for names of wells not in the plate."""
+        if wellname not in self.geometry.coordinates:
+            raise KeyError(wellname)
+        return self.geometry.wellname_to_index(wellname) - 1
+
+    def _get_well(self, index):
+        """Return the view of the well at an index, creating it if needed."""
+        well = self._views.get(index)
+        if well is None:
+            well = self._get_well_class()(self, index)
+            self._views[index] = well
+        return well
+
+    @classmethod
+    def _get_well_class(cls):
+        """Return the view class of the plate's wells, combining ArrayWell
+        with the plate's ``well_class`` (e.g. for its capacity)."""
+        if "_well_view_class" not in cls.__dict__:
+            if issubclass(cls.well_class, ArrayWell):
+                cls._well_view_class = cls.well_class
+            else:
+                cls._well_view_class = type(
+                    "Array" + cls.well_class.__name__,
+                    (ArrayWell, cls.well_class),
+                    {},
+                )
+        return cls._well_view_class
+
+    def _get_component_column(self, component):
+        """Return the column of a component, adding it if needed."""
+        column = self._component_columns.get(component)
+        if column is None:
+            column = len(self._components)
+            if column == self._quantities.shape[1]:
+                capacity = max(8, 2 * column)
+                quantities = np.zeros((self.num_wells, capacity))
+                quantities[:, :column] = self._quantities
+                present = np.zeros((self.num_wells, capacity), dtype=bool)
+                present[:, :column] = self._present
+                self._quantities, self._present = quantities, present
+            self._components.append(component)
+            self._component_columns[component] = column
+        return column
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_views"]
+        del state["wells"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_views()
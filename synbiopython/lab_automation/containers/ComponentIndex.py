@@ -0,0 +1,178 @@
+# pylint: disable=C0103,W0212
+"""This module implements inverted indexes of the components of wells.
+
+A ComponentIndex maps each component to the wells of a plate containing it,
+and a PlateCollectionIndex maps each component to the plates containing it,
+so that "which wells contain X" queries take O(1) rather than a scan of
+every well. Plate indexes are kept up to date whenever components are added
+to or removed from the ``content.quantities`` of wells (including with
+``Well.add_content``, ``Well.subtract_content`` and ``Well.empty_completely``),
+and when the content of a well, or the quantities of a content, are replaced.
+"""
+
+
+class ComponentIndex:
+    """Index {component: wells containing it} of the wells of a plate.
+
+    :param plate: The plate whose wells are indexed
+    """
+
+    def __init__(self, plate=None):
+        self.plate = plate
+        self._wells = {}
+        self._collections = []
+
+    def add(self, component, well):
+        """Record that the well contains the component."""
+        wells = self._wells.get(component)
+        if wells is None:
+            wells = self._wells[component] = {}
+            for collection in self._collections:
+                collection._add(component, self.plate)
+        wells[well] = None
+
+    def discard(self, component, well):
+        """Record that the well no longer contains the component."""
+        wells = self._wells.get(component)
+        if wells is not None:
+            wells.pop(well, None)
+            if not wells:
+                self._remove(component)
+
+    def wells_containing(self, component):
+        """Return the list of wells containing the component."""
+        return list(self._wells.get(component, ()))
+
+    def contains(self, component, well):
+        """Return whether the well contains the component."""
+        return well in self._wells.get(component, ())
+
+    def clear(self):
+        """Remove all entries from the index."""
+        for component in list(self._wells):
+            self._remove(component)
+
+    def rebuild(self, wells):
+        """Rebuild the index from the content of the wells."""
+        self.clear()
+        for well in wells:
+            for component in well.content.quantities:
+                self.add(component, well)
+
+    def stats(self):
+        """Return a dict of statistics on the size of the index."""
+        sizes = [len(wells) for wells in self._wells.values()]
+        return {
+            "components": len(sizes),
+            "entries": sum(sizes),
+            "max_wells_per_component": max(sizes, default=0),
+        }
+
+    def _remove(self, component):
+        del self._wells[component]
+        for collection in self._collections:
+            collection._discard(component, self.plate)
+
+    def __contains__(self, component):
+        return component in self._wells
+
+    def __iter__(self):
+        return iter(self._wells)
+
+    def __len__(self):
+        return len(self._wells)
+
+    def __getstate__(self):
+        # Copies of a plate do not belong to the collections of the plate
+        # (copies of collections register themselves with their plates):
+        state = self.__dict__.copy()
+        state["_collections"] = []
+        return state
+
+    def __repr__(self):
+        return "ComponentIndex(%s)" % self.plate
+
+
+class PlateCollectionIndex:
+    """Index {component: plates containing it} of a collection of plates,
+    kept up to date with the component indexes of the plates.
+
+    :param plates: The plates of the collection
+    """
+
+    def __init__(self, plates=()):
+        self.plates = []
+        self._plates = {}
+        for plate in plates:
+            self.add_plate(plate)
+
+    def add_plate(self, plate):
+        """Add a plate to the collection."""
+        if plate in self.plates:
+            return
+        self.plates.append(plate)
+        plate.component_index._collections.append(self)
+        for component in plate.component_index:
+            self._add(component, plate)
+
+    def remove_plate(self, plate):
+        """Remove a plate from the collection."""
+        self.plates.remove(plate)
+        plate.component_index._collections.remove(self)
+        for component in plate.component_index:
+            self._discard(component, plate)
+
+    def plates_containing(self, component):
+        """Return the list of plates with wells containing the component."""
+        return list(self._plates.get(component, ()))
+
+    def wells_containing(self, component):
+        """Return the list of wells, of all plates, containing the
+        component."""
+        return [
+            well
+            for plate in self._plates.get(component, ())
+            for well in plate.component_index.wells_containing(component)
+        ]
+
+    def find_unique_well_containing(self, query):
+        """Return the unique well, of all plates, whose content contains the
+        query.
+
+        Raises a NoUniqueWell error if 0 or several wells contain the query.
+        """
+        # Imported here, as the Plate module depends on this one:
+        from synbiopython.lab_automation.containers.Plate import get_unique_well
+
+        return get_unique_well(self.wells_containing(query))
+
+    def stats(self):
+        """Return a dict of statistics on the size of the index."""
+        plate_stats = [plate.component_index.stats() for plate in self.plates]
+        return {
+            "plates": len(self.plates),
+            "components": len(self._plates),
+            "plate_entries": sum(len(plates) for plates in self._plates.values()),
+            "well_entries": sum(stats["entries"] for stats in plate_stats),
+        }
+
+    def _add(self, component, plate):
+        self._plates.setdefault(component, {})[plate] = None
+
+    def _discard(self, component, plate):
+        plates = self._plates.get(component)
+        if plates is not None:
+            plates.pop(plate, None)
+            if not plates:
+                del self._plates[component]
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for plate in self.plates:
+            plate.component_index._collections.append(self)
+
+    def __contains__(self, component):
+        return component in self._plates
+
+    def __len__(self):
+        return len(self._plates)
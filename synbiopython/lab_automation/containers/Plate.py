@@ -5,14 +5,13 @@ See synbiopython.lab_automation.containers for more specific plate subclasses, w
 set number of wells, well format, etc.
 """
 from collections import OrderedDict
+from numbers import Integral
 import pandas
+from synbiopython.lab_automation.containers.ComponentIndex import ComponentIndex
 from synbiopython.lab_automation.containers.Well import Well
 from synbiopython.lab_automation.containers.helper_functions import (
-    index_to_wellname,
+    get_plate_geometry,
     number_to_rowname,
-    wellname_to_index,
-    coordinates_to_wellname,
-    rowname_to_number,
 )
 from synbiopython.lab_automation.tools import replace_nans_in_dict
 
@@ -21,6 +20,18 @@ class NoUniqueWell(Exception):
     """NoUniqueWell exception class."""
 
 
+def get_unique_well(wells):
+    """Return the unique well of a list of wells.
+
+    Raises a NoUniqueWell error if the list has 0 or several wells.
+    """
+    if len(wells) > 1:
+        raise NoUniqueWell("Query returned several wells: %s" % wells)
+    if len(wells) == 0:
+        raise NoUniqueWell("No wells found matching the condition")
+    return wells[0]
+
+
 class Plate:
     """Base class for all plates.
 
@@ -40,24 +51,25 @@ class Plate:
         self.name = name
         self.data = plate_data or {}
         self.wells_data = wells_data or {}
-        self.num_wells = self.num_rows * self.num_columns
+        self.geometry = get_plate_geometry(self.num_rows, self.num_columns)
+        self.num_wells = self.geometry.num_wells
+        self.component_index = ComponentIndex(self)
         self.wells = {}
         self.columns = {column: [] for column in range(1, self.num_columns + 1)}
         self.rows = {number_to_rowname(row): [] for row in range(1, self.num_rows + 1)}
-        for row in range(1, self.num_rows + 1):
-            for column in range(1, self.num_columns + 1):
-                wellname = coordinates_to_wellname((row, column))
-                data = self.wells_data.get(wellname, {})
-                well = self.well_class(
-                    plate=self,
-                    row=row,
-                    column=column,
-                    name=wellname,
-                    data=data,
-                )
-                self.wells[wellname] = well
-                self.columns[column] += [wellname]
-                self.rows[number_to_rowname(row)] += [wellname]
+        for wellname, (row, column) in self.geometry.coordinates.items():
+            data = self.wells_data.get(wellname)
+            well = self.well_class(
+                plate=self,
+                row=row,
+                column=column,
+                name=wellname,
+                data=data,
+            )
+            self.wells[wellname] = well
+            self.columns[column] += [wellname]
+            self.rows[number_to_rowname(row)] += [wellname]
+        self._well_orders = {}
 
     def __getitem__(self, k):
         """Return e.g. well A1's dict when calling `myplate['A1']`."""
@@ -71,19 +83,31 @@ class Plate:
         Raises a NoUniqueWell error if 0 or several wells satisfy the condition.
         """
         wells = [well for name, well in self.wells.items() if condition(well)]
-        if len(wells) > 1:
-            raise NoUniqueWell("Query returned several wells: %s" % wells)
-        if len(wells) == 0:
-            raise NoUniqueWell("No wells found matching the condition")
-        return wells[0]
+        return get_unique_well(wells)
 
     def find_unique_well_containing(self, query):
         """Return the unique well whose content contains the query."""
+        return get_unique_well(self.list_wells_containing(query))
 
-        def condition(well):
-            return query in well.content.quantities.keys()
+    def list_wells_containing(self, component):
+        """Return the list of all wells of the plate whose content contains
+        the component.
 
-        return self.find_unique_well_by_condition(condition)
+        The plate's component index answers this without scanning the wells.
+        """
+        if self.component_index is None:
+            return [
+                well
+                for well in self.wells.values()
+                if component in well.content.quantities
+            ]
+        return self.component_index.wells_containing(component)
+
+    def rebuild_component_index(self):
+        """Rebuild the component index of the plate from the content of its
+        wells, e.g. after assigning a new ``component_index``."""
+        if self.component_index is not None:
+            self.component_index.rebuild(self.iter_wells())
 
     def list_well_data_fields(self):
         """Return all fields used in well data in the plate."""
@@ -101,14 +125,14 @@ class Plate:
         >>> for well in plate.list_wells_in_column(5):
         >>>      print(well.name)
         """
-        return [well for well in self.iter_wells() if well.column == column_number]
+        return self.return_column(column_number)
 
     def return_row(self, row):
         """Return the list of all wells of the plate in the given row.
 
         The `row` can be either a row number (1,2,3) or row letter(s) (A,B,C).
         """
-        if isinstance(row, int):
+        if isinstance(row, Integral):
             row = number_to_rowname(row)
         return [self.wells[wellname] for wellname in self.rows[row]]
 
@@ -123,9 +147,7 @@ class Plate:
         >>>      print(well.name)
 
         """
-        if isinstance(row, str):
-            row = rowname_to_number(row)
-        return [well for well in self.iter_wells() if well.row == row]
+        return self.return_row(row)
 
     def list_filtered_wells(self, well_filter):
         """List filtered wells.
@@ -187,7 +209,7 @@ class Plate:
         >>> plate.get_well_at_index(2)  # "A2"
         >>> plate.get_well_at_index(2, direction="column")  # "B1"
         """
-        return index_to_wellname(index, self.num_wells, direction=direction)
+        return self.geometry.index_to_wellname(index, direction=direction)
 
     def wellname_to_index(self, wellname, direction="row"):
         """Return the index of the well in the plate.
@@ -197,7 +219,7 @@ class Plate:
         >>> plate.wellname_to_index("A2")  # 2
         >>> plate.wellname_to_index("A1", direction="column")  # 9 (8x12 plate)
         """
-        return wellname_to_index(wellname, self.num_wells, direction=direction)
+        return self.geometry.wellname_to_index(wellname, direction=direction)
 
     def wells_sorted_by(self, sortkey):
         """Return wells sorted by sortkey"""
@@ -211,10 +233,19 @@ class Plate:
         >>> for well in plate.iter_wells():
         >>>     print (well.name)
         """
-        if direction == "row":
-            return self.wells_sorted_by(lambda w: (w.row, w.column))
-        else:
-            return self.wells_sorted_by(lambda w: (w.column, w.row))
+        return iter(self.get_wells(direction=direction))
+
+    def get_wells(self, direction="row"):
+        """Return the tuple of all wells, ordered either by row or by column.
+
+        Both orders are computed once per plate, then reused.
+        """
+        wells = self._well_orders.get(direction)
+        if wells is None:
+            wellnames = self.geometry.get_wellnames(direction)
+            wells = tuple(self.wells[wellname] for wellname in wellnames)
+            self._well_orders[direction] = wells
+        return wells
 
     def to_dict(self, replace_nans_by="null"):
         """Convert plate to dict."""
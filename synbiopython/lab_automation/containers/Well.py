@@ -1,12 +1,95 @@
 # pylint: disable=C0330,C0103,R0913
 """This module contains a generic class for a well."""
-from synbiopython.lab_automation.containers.WellContent import WellContent
+from collections.abc import MutableMapping, MutableSequence
+
+from synbiopython.lab_automation.containers.WellContent import (
+    CompactWellContent,
+    WellContent,
+)
 from synbiopython.lab_automation.picklist.Transfer import TransferError
 from ..tools import unit_factors
 
 
-class Well:
-    """Generic class for a well.
+class _WellData(MutableMapping):
+    """Data of a well which has none yet, creating the well's data dict on
+    first write, so that reading the data of many wells allocates nothing.
+
+    :param well: The well
+    """
+
+    __slots__ = ("well",)
+
+    def __init__(self, well):
+        self.well = well
+
+    def _read(self):
+        data = self.well._get_data()
+        return {} if data is None else data
+
+    def __getitem__(self, key):
+        return self._read()[key]
+
+    def __setitem__(self, key, value):
+        self.well._get_data(create=True)[key] = value
+
+    def __delitem__(self, key):
+        del self._read()[key]
+
+    def __iter__(self):
+        return iter(self._read())
+
+    def __len__(self):
+        return len(self._read())
+
+    def __repr__(self):
+        return repr(self._read())
+
+
+class _WellSources(MutableSequence):
+    """Sources of a well which has none yet, creating the well's sources list
+    on first write.
+
+    :param well: The well
+    """
+
+    __slots__ = ("well",)
+
+    def __init__(self, well):
+        self.well = well
+
+    def _read(self):
+        sources = self.well._get_sources()
+        return [] if sources is None else sources
+
+    def __getitem__(self, index):
+        return self._read()[index]
+
+    def __setitem__(self, index, source):
+        self._read()[index] = source
+
+    def __delitem__(self, index):
+        del self._read()[index]
+
+    def __len__(self):
+        return len(self._read())
+
+    def insert(self, index, source):
+        """Insert a source before the index."""
+        self.well._get_sources(create=True).insert(index, source)
+
+    def __eq__(self, other):
+        return list(self._read()) == other
+
+    def __repr__(self):
+        return repr(self._read())
+
+
+class CompactWell:
+    """Compact base class for a well.
+
+    Instances have no attribute dict, which saves memory when simulating many
+    plates. Arbitrary user data goes in the ``data`` dict, which (like the
+    ``sources`` list) is only created when first used.
 
     :param plate: The plate on which the well is located
     :param row: The well's row (a number, starting from 0)
@@ -15,17 +98,87 @@ class Well:
     :param data: A dictionary storing data on the well, used in algorithms and reports.
     """
 
+    __slots__ = ("plate", "row", "column", "name", "_content", "_data", "_sources")
+
     capacity = None
     dead_volume_per_transfer_class = None
+    content_class = CompactWellContent
 
     def __init__(self, plate, row, column, name, data=None):
         self.plate = plate
         self.row = row
         self.column = column
         self.name = name
-        self.data = data or {}
-        self.sources = []
-        self.content = WellContent()
+        self._data = data or None
+        self._sources = None
+        self._content = None
+        self.content = self.content_class()
+
+    @property
+    def content(self):
+        """Return the content (volume and quantities) of the well."""
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        """Set the content of the well, which may be shared with other wells
+        (e.g. in troughs), updating the component index of the plate."""
+        if self._content is not None:
+            self._content._detach(self)
+        self._content = content
+        content._attach(self)
+
+    @property
+    def data(self):
+        """Return the dictionary storing data on the well (created on first
+        write)."""
+        data = self._get_data()
+        return _WellData(self) if data is None else data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    @property
+    def sources(self):
+        """Return the list of transfers (or wells) which filled the well
+        (created on first write)."""
+        sources = self._get_sources()
+        return _WellSources(self) if sources is None else sources
+
+    @sources.setter
+    def sources(self, sources):
+        self._sources = sources
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for name in CompactWell.__slots__:
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        content = state.pop("_content")
+        for name, value in state.items():
+            setattr(self, name, value)
+        # Attach to the content, which does not keep its wells when copied:
+        self._content = None
+        self.content = content
+
+    def _get_data(self, create=False):
+        """Return the data dict of the well, or None if it has none and
+        ``create`` is False."""
+        if create and self._data is None:
+            self._data = {}
+        return self._data
+
+    def _get_sources(self, create=False):
+        """Return the sources list of the well, or None if it has none and
+        ``create`` is False."""
+        if create and self._sources is None:
+            self._sources = []
+        return self._sources
 
     @property
     def volume(self):
@@ -35,7 +188,7 @@ class Well:
     def iterate_sources_tree(self):
         """Iterate through the tree of sources."""
         for source in self.sources:
-            if isinstance(source, Well):
+            if isinstance(source, CompactWell):
                 for parent in source.iterate_sources_tree():
                     yield parent
             else:
@@ -60,10 +213,11 @@ class Well:
                     % (volume, self)
                 )
             self.content.volume = final_volume
+        quantities = self.content.quantities
         for component, quantity in components_quantities.items():
-            if component not in self.content.quantities:
-                self.content.quantities[component] = 0
-            self.content.quantities[component] += quantity
+            if component not in quantities:
+                quantities[component] = 0
+            quantities[component] += quantity
 
     def subtract_content(self, components_quantities, volume=0):
         """Subtract content from well."""
@@ -77,11 +231,12 @@ class Well:
                     % (volume, self, self.volume)
                 )
             self.content.volume -= volume
+        quantities = self.content.quantities
         for component, quantity in components_quantities.items():
-            if self.content.quantities[component] == quantity:
-                self.content.quantities.pop(component)
+            if quantities[component] == quantity:
+                quantities.pop(component)
             else:
-                self.content.quantities[component] -= quantity
+                quantities[component] -= quantity
 
     def empty_completely(self):
         """Empty the well."""
@@ -153,3 +308,16 @@ class Well:
 
     def __lt__(self, other):
         return str(self) < str(other)
+
+
+class Well(CompactWell):
+    """Generic class for a well.
+
+    :param plate: The plate on which the well is located
+    :param row: The well's row (a number, starting from 0)
+    :param column: The well's column (a number, starting from 0)
+    :param name: The well's name, for instance "A1"
+    :param data: A dictionary storing data on the well, used in algorithms and reports.
+    """
+
+    content_class = WellContent
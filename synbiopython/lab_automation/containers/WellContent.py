@@ -2,18 +2,176 @@
 """This module contains a class to represent the volume and quantities of a well."""
 
 
-class WellContent:
-    """Class to represent the volume and quantities of a well.
+class ComponentQuantities(dict):
+    """Dict {component: quantity} of a well content.
 
-    Having the well content represented as a separate object makes it possible
-    to have several wells share the same content, e.g. in throughs.
+    Adding or removing components (with any dict method) updates the
+    component indexes of the plates of the wells holding the content.
+
+    :param content: The content owning the quantities
+    :param quantities: The initial dict {component: quantity}
+    """
+
+    __slots__ = ("content",)
+
+    def __init__(self, content, quantities=()):
+        dict.__init__(self, quantities)
+        self.content = content
+
+    def __setitem__(self, component, quantity):
+        is_new = component not in self
+        dict.__setitem__(self, component, quantity)
+        if is_new:
+            self._index(component)
+
+    def __delitem__(self, component):
+        dict.__delitem__(self, component)
+        self._unindex(component)
+
+    def pop(self, component, *default):
+        """Remove a component and return its quantity."""
+        if component not in self:
+            return dict.pop(self, component, *default)
+        quantity = dict.pop(self, component)
+        self._unindex(component)
+        return quantity
+
+    def popitem(self):
+        """Remove a component and return a (component, quantity) pair."""
+        component, quantity = dict.popitem(self)
+        self._unindex(component)
+        return component, quantity
+
+    def setdefault(self, component, default=None):
+        """Return the quantity of a component, adding it if needed."""
+        if component not in self:
+            self[component] = default
+        return dict.__getitem__(self, component)
+
+    def update(self, *args, **kwargs):
+        """Update the quantities from a dict or iterable of pairs."""
+        for component, quantity in dict(*args, **kwargs).items():
+            self[component] = quantity
+
+    def clear(self):
+        """Remove all components."""
+        components = list(self)
+        dict.clear(self)
+        for component in components:
+            self._unindex(component)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Copies are plain dicts, not bound to the content:
+        return dict, (dict(self),)
+
+    def _index(self, component):
+        if self.content is not None:
+            self.content._index(component)
+
+    def _unindex(self, component):
+        if self.content is not None:
+            self.content._unindex(component)
+
+
+class CompactWellContent:
+    """Compact class to represent the volume and quantities of a well.
+
+    Instances have no attribute dict (only slots), which saves memory when
+    simulating many wells.
+
+    The content knows the wells holding it, so that changing its
+    ``quantities`` (e.g. with ``make_empty``, or by setting a component)
+    updates the component indexes of their plates. Quantities are held in a
+    ComponentQuantities dict, into which dicts assigned to ``quantities`` are
+    copied.
     """
 
+    __slots__ = ("volume", "_quantities", "_wells")
+
     def __init__(self, quantities=None, volume=0):
         if quantities is None:
             quantities = {}
         self.volume = volume
-        self.quantities = quantities
+        self._quantities = ComponentQuantities(self, quantities)
+        self._wells = None
+
+    @property
+    def quantities(self):
+        """Return the dict {component: quantity}."""
+        return self._quantities
+
+    @quantities.setter
+    def quantities(self, quantities):
+        old_quantities = self._quantities
+        old_quantities.content = None
+        quantities = self._quantities = ComponentQuantities(self, quantities)
+        for component in old_quantities:
+            if component not in quantities:
+                self._unindex(component)
+        for component in quantities:
+            if component not in old_quantities:
+                self._index(component)
+
+    @property
+    def wells(self):
+        """Return the tuple of wells holding the content."""
+        wells = self._wells
+        if wells is None:
+            return ()
+        if isinstance(wells, tuple):
+            return wells
+        return (wells,)
+
+    def _attach(self, well):
+        """Record that the well holds the content, and index its components.
+
+        A single well is stored as such, rather than in a tuple, to save
+        memory in the usual case of one well per content.
+        """
+        wells = self.wells
+        if well not in wells:
+            wells += (well,)
+            self._wells = wells[0] if len(wells) == 1 else wells
+            for component in self._quantities:
+                _index_well(well, component)
+
+    def _detach(self, well):
+        """Record that the well no longer holds the content."""
+        wells = self.wells
+        if well in wells:
+            wells = tuple(other for other in wells if other is not well)
+            self._wells = (wells[0] if len(wells) == 1 else wells) or None
+            for component in self._quantities:
+                _unindex_well(well, component)
+
+    def _index(self, component):
+        """Record the component in the component indexes of the wells."""
+        for well in self.wells:
+            _index_well(well, component)
+
+    def _unindex(self, component):
+        """Remove the component from the component indexes of the wells."""
+        for well in self.wells:
+            _unindex_well(well, component)
+
+    def __getstate__(self):
+        # The wells holding the content are not copied with it (they
+        # re-attach themselves when copied):
+        state = dict(getattr(self, "__dict__", {}))
+        state["volume"] = self.volume
+        state["quantities"] = dict(self._quantities)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self._wells = None
+        self._quantities = ComponentQuantities(self, state.pop("quantities"))
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def concentration(self, component=None, default=0):
         """Return concentration of component."""
@@ -39,3 +197,25 @@ class WellContent:
     def components_as_string(self, separator=" "):
         """Return a string representation of what's in the well mix."""
         return separator.join(sorted(self.quantities.keys()))
+
+
+def _index_well(well, component):
+    """Record the component in the component index of the well's plate."""
+    index = getattr(well.plate, "component_index", None)
+    if index is not None:
+        index.add(component, well)
+
+
+def _unindex_well(well, component):
+    """Remove the well from the component index of the well's plate."""
+    index = getattr(well.plate, "component_index", None)
+    if index is not None:
+        index.discard(component, well)
+
+
+class WellContent(CompactWellContent):
+    """Class to represent the volume and quantities of a well.
+
+    Having the well content represented as a separate object makes it possible
+    to have several wells share the same content, e.g. in throughs.
+    """
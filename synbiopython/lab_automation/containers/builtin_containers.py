@@ -1,5 +1,6 @@
 """Classes to represent plates"""
 from synbiopython.lab_automation.containers.Plate import Plate
+from synbiopython.lab_automation.containers.ArrayPlate import ArrayPlate
 from synbiopython.lab_automation.containers.Well import Well
 
 
@@ -24,6 +25,27 @@ class Plate1536(Plate):
     num_columns = 48
 
 
+class ArrayPlate96(ArrayPlate):
+    """Array-backed standard 96-well plate"""
+
+    num_rows = 8
+    num_columns = 12
+
+
+class ArrayPlate384(ArrayPlate):
+    """Array-backed standard 384-well plate"""
+
+    num_rows = 16
+    num_columns = 24
+
+
+class ArrayPlate1536(ArrayPlate):
+    """Array-backed 1536-well plate (32 rows, 48 columns)"""
+
+    num_rows = 32
+    num_columns = 48
+
+
 class Plate2x4(Plate):
     """Class for 8-well (2 x 4) plates such as colony plating plates"""
 
@@ -99,5 +121,5 @@ class Trough8x1(Plate):
 
     def __init__(self, name, wells_data=None, plate_data=None):
         Plate.__init__(self, name=name, wells_data=None, plate_data=None)
-        for well in self:
+        for well in self.iter_wells():
             well.content = self["A1"].content
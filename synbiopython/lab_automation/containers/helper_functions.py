@@ -1,8 +1,16 @@
 # pylint: disable=C0114,C0103,C0116
+from functools import lru_cache
 import math
-import re
+from types import MappingProxyType
 
+import numpy as np
 
+_ROWNAME_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_DIGITS = "0123456789"
+_DIRECTIONS = ("row", "column")
+
+
+@lru_cache(maxsize=None)
 def compute_rows_columns(num_wells):
     """Convert 96->(8,12), 384->(16,24), etc."""
     a = math.sqrt(num_wells / 6)
@@ -13,25 +21,33 @@ def compute_rows_columns(num_wells):
 
 def rowname_to_number(name):
     "Convert A->1 Z->26 AA->27 etc."
-    if len(name) == 2:
-        return 26 * rowname_to_number(name[0]) + rowname_to_number(name[1])
-    try:
-        return "ABCDEFGHIJKLMNOPQRSTUVWXYZ".index(name) + 1
-    except IndexError:
+    if not name:
         raise ValueError(name + " is not a valid row name.")
+    number = 0
+    for letter in name:
+        digit = _ROWNAME_LETTERS.find(letter)
+        if digit < 0:
+            raise ValueError(name + " is not a valid row name.")
+        number = 26 * number + digit + 1
+    return number
 
 
 def number_to_rowname(number):
     "Convert 1->A 26->Z 27->AA etc."
-    if number > 26:
-        return number_to_rowname(int(number / 26)) + number_to_rowname(number % 26)
-    return "ABCDEFGHIJKLMNOPQRSTUVWXYZ"[number - 1]
+    letters = []
+    while number > 0:
+        number, digit = divmod(number - 1, 26)
+        letters.append(_ROWNAME_LETTERS[digit])
+    return "".join(reversed(letters))
 
 
 def wellname_to_coordinates(wellname):
     """Convert A1->(1,1), H11->(8, 11), etc."""
-    rowname, colname = re.match("([a-zA-Z]+)([0-9]+)", wellname).groups()
-    return rowname_to_number(rowname), int(colname)
+    rowname = wellname.rstrip(_DIGITS)
+    colname = wellname[len(rowname) :]
+    if not colname or not rowname.isalpha():
+        raise ValueError(wellname + " is not a valid well name.")
+    return rowname_to_number(rowname.upper()), int(colname)
 
 
 def coordinates_to_wellname(coords):
@@ -40,6 +56,164 @@ def coordinates_to_wellname(coords):
     return number_to_rowname(row) + str(column)
 
 
+class PlateGeometry:
+    """Precomputed conversions between the names, indices and coordinates of
+    the wells of a plate with a given number of rows and columns.
+
+    Use ``get_plate_geometry``, which creates one (immutable) instance per
+    geometry, rather than this constructor. As instances are shared by all
+    plates of a geometry, their ``rows``, ``columns`` and ``coordinates`` are
+    read-only mappings of tuples.
+
+    Indices start from 1 and count either by row (A1 A2 A3...) or by column
+    (A1 B1 C1...).
+
+    :param num_rows: the number of rows of the plate
+    :type num_rows: int
+    :param num_columns: the number of columns of the plate
+    :type num_columns: int
+    """
+
+    def __init__(self, num_rows, num_columns):
+        self.num_rows = num_rows
+        self.num_columns = num_columns
+        self.num_wells = num_rows * num_columns
+        rownames = [number_to_rowname(row) for row in range(1, num_rows + 1)]
+        self.wellnames = tuple(
+            rowname + str(column)
+            for rowname in rownames
+            for column in range(1, num_columns + 1)
+        )
+        self.rows = MappingProxyType(
+            {
+                rowname: self.wellnames[row * num_columns : (row + 1) * num_columns]
+                for row, rowname in enumerate(rownames)
+            }
+        )
+        self.columns = MappingProxyType(
+            {
+                column: self.wellnames[column - 1 :: num_columns]
+                for column in range(1, num_columns + 1)
+            }
+        )
+        self.coordinates = MappingProxyType(
+            {
+                wellname: (1 + index // num_columns, 1 + index % num_columns)
+                for index, wellname in enumerate(self.wellnames)
+            }
+        )
+        column_order = [
+            wellname
+            for column in range(1, num_columns + 1)
+            for wellname in self.columns[column]
+        ]
+        self._orders = {"row": self.wellnames, "column": tuple(column_order)}
+        self._names = {
+            "row": np.array(self.wellnames),
+            "column": np.array(column_order),
+        }
+        self._indices = {
+            "row": {name: index for index, name in enumerate(self.wellnames, 1)},
+            "column": {name: index for index, name in enumerate(column_order, 1)},
+        }
+
+    def get_wellnames(self, direction="row"):
+        """Return the tuple of all well names, by row (A1 A2 A3...) or by
+        column (A1 B1 C1...)."""
+        return self._orders[self._check_direction(direction)]
+
+    def wellname_to_index(self, wellname, direction="row"):
+        """Convert e.g. A1..H12 into 1..96 (for a 96-well plate)."""
+        index = self._get_indices(direction).get(wellname)
+        if index is None:
+            # Non-canonical names, e.g. A01:
+            row, column = wellname_to_coordinates(wellname)
+            index = self.coordinates_to_index((row, column), direction)
+        return index
+
+    def index_to_wellname(self, index, direction="row"):
+        """Convert e.g. 1..96 into A1..H12 (for a 96-well plate)."""
+        names = self._get_names(direction)
+        if 1 <= index <= self.num_wells:
+            return str(names[index - 1])
+        return coordinates_to_wellname(self.index_to_coordinates(index, direction))
+
+    def wellname_to_coordinates(self, wellname):
+        """Convert A1->(1,1), H11->(8, 11), etc."""
+        coordinates = self.coordinates.get(wellname)
+        if coordinates is None:
+            coordinates = wellname_to_coordinates(wellname)
+        return coordinates
+
+    def coordinates_to_index(self, coords, direction="row"):
+        """Convert (row, column) coordinates into an index."""
+        row, column = coords
+        if self._check_direction(direction) == "row":
+            return column + self.num_columns * (row - 1)
+        return row + self.num_rows * (column - 1)
+
+    def index_to_coordinates(self, index, direction="row"):
+        """Convert an index into (row, column) coordinates."""
+        if self._check_direction(direction) == "row":
+            return (
+                1 + (index - 1) // self.num_columns,
+                1 + (index - 1) % self.num_columns,
+            )
+        return 1 + (index - 1) % self.num_rows, 1 + (index - 1) // self.num_rows
+
+    def wellnames_to_indices(self, wellnames, direction="row"):
+        """Convert an array of well names into an array of indices."""
+        indices = self._get_indices(direction)
+        return np.array(
+            [
+                indices.get(wellname) or self.wellname_to_index(wellname, direction)
+                for wellname in wellnames
+            ],
+            dtype=int,
+        )
+
+    def indices_to_wellnames(self, indices, direction="row"):
+        """Convert an array of indices (within the plate) into an array of well
+        names."""
+        indices = np.asarray(indices, dtype=int)
+        if indices.size and (indices.min() < 1 or indices.max() > self.num_wells):
+            raise ValueError("Indices must be between 1 and %d" % self.num_wells)
+        return self._get_names(direction)[indices - 1]
+
+    def _check_direction(self, direction):
+        if direction not in _DIRECTIONS:
+            raise ValueError("`direction` must be in (row, column)")
+        return direction
+
+    def _get_indices(self, direction):
+        return self._indices[self._check_direction(direction)]
+
+    def _get_names(self, direction):
+        return self._names[self._check_direction(direction)]
+
+    def __reduce__(self):
+        return get_plate_geometry, (self.num_rows, self.num_columns)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return "PlateGeometry(%d, %d)" % (self.num_rows, self.num_columns)
+
+
+@lru_cache(maxsize=None)
+def get_plate_geometry(num_rows, num_columns):
+    """Return the (cached) PlateGeometry of plates with the given number of
+    rows and columns."""
+    return PlateGeometry(num_rows, num_columns)
+
+
+def get_plate_geometry_from_num_wells(num_wells):
+    """Return the PlateGeometry of plates with the given number of wells,
+    e.g. 96->(8,12), in the standard 2:3 format."""
+    return get_plate_geometry(*compute_rows_columns(num_wells))
+
+
 def wellname_to_index(wellname, num_wells, direction="row"):
     """Convert e.g. A1..H12 into 1..96
     direction is either row for A1 A2 A3... or column for A1 B1 C1 D1 etc.
@@ -50,25 +224,30 @@ def wellname_to_index(wellname, num_wells, direction="row"):
     :param direction: the direction of counting. Either "row" or "column".
     :type direction: str
     """
-    n_rows, n_columns = compute_rows_columns(num_wells)
-    row, column = wellname_to_coordinates(wellname)
-    if direction == "row":
-        return column + n_columns * (row - 1)
-    if direction == "column":
-        return row + n_rows * (column - 1)
-    raise ValueError("`direction` must be in (row, column)")
+    return get_plate_geometry_from_num_wells(num_wells).wellname_to_index(
+        wellname, direction
+    )
+
+
+def wellnames_to_indices(wellnames, num_wells, direction="row"):
+    """Convert an array of well names into an array of indices, e.g.
+    ["A1", "A2"] into [1, 2] (for a 96-well plate, counting by row).
+
+    :param wellnames: the names of the wells
+    :param num_wells: number of wells on the plate
+    :type num_wells: int
+    :param direction: the direction of counting. Either "row" or "column".
+    :type direction: str
+    """
+    return get_plate_geometry_from_num_wells(num_wells).wellnames_to_indices(
+        wellnames, direction
+    )
 
 
 def index_to_row_column(index, num_wells, direction="row"):
-    n_rows, n_columns = compute_rows_columns(num_wells)
-    if direction == "row":
-        row = 1 + int((index - 1) / n_columns)
-        column = 1 + ((index - 1) % n_columns)
-    elif direction == "column":
-        row, column = 1 + ((index - 1) % n_rows), 1 + int((index - 1) / n_rows)
-    else:
-        raise ValueError("`direction` must be in (row, column)")
-    return row, column
+    return get_plate_geometry_from_num_wells(num_wells).index_to_coordinates(
+        index, direction
+    )
 
 
 def index_to_wellname(index, num_wells, direction="row"):
@@ -81,5 +260,21 @@ def index_to_wellname(index, num_wells, direction="row"):
     :param direction: the direction of counting. Either "row" or "column".
     :type direction: str
     """
-    row, column = index_to_row_column(index, num_wells, direction)
-    return coordinates_to_wellname((row, column))
+    return get_plate_geometry_from_num_wells(num_wells).index_to_wellname(
+        index, direction
+    )
+
+
+def indices_to_wellnames(indices, num_wells, direction="row"):
+    """Convert an array of indices into an array of well names, e.g. [1, 2]
+    into ["A1", "A2"] (for a 96-well plate, counting by row).
+
+    :param indices: the indices of the wells
+    :param num_wells: number of wells on the plate
+    :type num_wells: int
+    :param direction: the direction of counting. Either "row" or "column".
+    :type direction: str
+    """
+    return get_plate_geometry_from_num_wells(num_wells).indices_to_wellnames(
+        indices, direction
+    )
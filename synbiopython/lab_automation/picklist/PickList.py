@@ -120,9 +120,10 @@ class PickList:
         transfers, such as "source_well", or a function f(transfer) -> value.
         """
         if not hasattr(sorting_method, "__call__"):
+            attribute = sorting_method
 
             def sorting_method(transfer):
-                return transfer.__dict__[sorting_method]
+                return getattr(transfer, attribute)
 
         return PickList(
             sorted(self.transfers_list, key=sorting_method),
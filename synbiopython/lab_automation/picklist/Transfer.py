@@ -5,8 +5,9 @@ class TransferError(ValueError):
     pass
 
 
-class Transfer:
-    """Class representing a transfer from a source well to a destination well.
+class CompactTransfer:
+    """Compact class representing a transfer from a source well to a
+    destination well, with no attribute dict per instance.
 
     :param source_well: A Well object from which to transfer.
     :param destination_well: A Well object to which to transfer.
@@ -16,6 +17,8 @@ class Transfer:
         when exporting a picklist.
     """
 
+    __slots__ = ("volume", "source_well", "destination_well", "data")
+
     def __init__(self, source_well, destination_well, volume, data=None):
 
         self.volume = volume
@@ -84,3 +87,15 @@ class Transfer:
     def __repr__(self):
         """Return  "Transfer {volume}L from {source_well} into {dest_well}"."""
         return self.to_plain_string()
+
+
+class Transfer(CompactTransfer):
+    """Class representing a transfer from a source well to a destination well.
+
+    :param source_well: A Well object from which to transfer.
+    :param destination_well: A Well object to which to transfer.
+    :param volume: Volume to be transferred, expressed in liters.
+    :param data: A dict containing any useful information about the transfer.
+        This information can be used later e.g. as parameters for the transfer
+        when exporting a picklist.
+    """
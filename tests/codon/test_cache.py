@@ -0,0 +1,76 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+from synbiopython.codon.cache import LRUCache
+
+
+class TestCache(unittest.TestCase):
+    """Class to test the cache module."""
+
+    def test_get_put(self):
+        """Test get and put methods."""
+        cache = LRUCache(maxsize=2)
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        # "b" is least recently used, so is evicted:
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.info(), (3, 2, 1, 2, 2))
+
+    def test_stamp(self):
+        """Test invalidation of entries with a changed stamp."""
+        cache = LRUCache()
+        cache.put("a", 1, stamp=(1, 100))
+
+        self.assertEqual(cache.get("a", stamp=(1, 100)), 1)
+        self.assertIsNone(cache.get("a", stamp=(2, 100)))
+        self.assertIsNone(cache.get("a", stamp=(1, 100)))
+        self.assertEqual(cache.info().currsize, 0)
+
+    def test_resize_clear(self):
+        """Test resize and clear methods."""
+        cache = LRUCache(maxsize=4)
+
+        for key in range(4):
+            cache.put(key, key)
+
+        cache.resize(1)
+        self.assertEqual(cache.info(), (0, 0, 3, 1, 1))
+        self.assertEqual(cache.get(3), 3)
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 1, 0))
+
+    def test_threads(self):
+        """Test concurrent access."""
+        cache = LRUCache(maxsize=8)
+
+        def work(key):
+            cache.put(key % 16, key)
+            cache.get(key % 16)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(work, range(1000)))
+
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 1000)
+        self.assertEqual(info.currsize, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import os.path
+import unittest
+
+import numpy as np
+
+from synbiopython.codon import codon_array, store
+from synbiopython.codon.codons import CODON_INDEX
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class TestCodonArray(unittest.TestCase):
+    """Class to test the codon_array module."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = store.parse_file(os.path.join(_DATA_DIR, "37762.txt"))
+
+    def test_from_dict(self):
+        """Test from_dict method."""
+        array = codon_array.CodonArray.from_dict(self.table)
+
+        self.assertEqual(array.values.shape, (64,))
+        self.assertEqual(array.values[CODON_INDEX["CTG"]], 0.47)
+        self.assertEqual(array.to_dict(), self.table)
+
+        # RNA codons, and codons absent from the table:
+        array = codon_array.CodonArray.from_dict({"M": {"AUG": 1.0}})
+        self.assertEqual(array.values[CODON_INDEX["ATG"]], 1.0)
+        self.assertEqual(np.isnan(array.values).sum(), 63)
+        self.assertEqual(array.to_dict(dna=False), {"M": {"AUG": 1.0}})
+
+    def test_views(self):
+        """Test dna and rna views."""
+        array = codon_array.CodonArray.from_dict(self.table)
+
+        self.assertEqual(array.dna["CTG"], array.rna["CUG"])
+        self.assertEqual(len(array.rna), 64)
+        self.assertNotIn("CTG", array.rna)
+
+        # Views share memory with the array:
+        array.rna["CUG"] = 0.5
+        self.assertEqual(array.dna["CTG"], 0.5)
+        self.assertEqual(array.to_dict()["L"]["CTG"], 0.5)
+
+    def test_normalise(self):
+        """Test normalise method."""
+        array = codon_array.CodonArray.from_dict(
+            {"L": {"CTG": 3.0, "CTA": 1.0}, "M": {"ATG": 2.0}}
+        )
+        normalised = array.normalise()
+
+        self.assertEqual(normalised.dna["CTG"], 0.75)
+        self.assertEqual(normalised.dna["ATG"], 1.0)
+        self.assertEqual(array.dna["CTG"], 3.0)
+
+    def test_stack(self):
+        """Test stack method."""
+        array = codon_array.CodonArray.from_dict(self.table)
+        stacked = codon_array.stack([array, array.normalise()])
+
+        self.assertEqual(stacked.shape, (2,))
+        self.assertEqual(len(stacked), 2)
+        np.testing.assert_array_equal(stacked.dna["CTG"], [0.47, 0.47])
+        self.assertEqual(stacked[1].to_dict(), array.normalise().to_dict())
+
+        # Negative tests:
+        with self.assertRaises(ValueError):
+            stacked.to_dict()
+
+        with self.assertRaises(ValueError):
+            codon_array.CodonArray(np.zeros(63))
+
+        with self.assertRaises(ValueError):
+            codon_array.stack(
+                [array, codon_array.CodonArray.from_dict({"W": {"TGA": 1}})]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
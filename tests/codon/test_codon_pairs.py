@@ -0,0 +1,115 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import io
+import math
+import os.path
+import unittest
+
+import numpy as np
+
+from synbiopython.codon import codon_pairs
+from synbiopython.codon.codons import CODON_INDEX
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+_TABLE = {
+    "K": {"AAA": 0.5, "AAG": 0.5},
+    "L": {"CTG": 0.6, "CTA": 0.4},
+    "M": {"ATG": 1.0},
+}
+
+
+def _pair_idx(pair):
+    """Gets the index of a codon pair in a flattened pair array."""
+    return CODON_INDEX[pair[:3]], CODON_INDEX[pair[3:]]
+
+
+class TestCodonPairs(unittest.TestCase):
+    """Class to test the codon_pairs module."""
+
+    def test_count_codon_pairs(self):
+        """Test count_codon_pairs method."""
+        counts = codon_pairs.count_codon_pairs(
+            ["ATGCTGCTG", "CTGNNNCTGAA", "CTG"], batch_size=2
+        )
+
+        self.assertEqual(counts.shape, (64, 64))
+        self.assertEqual(counts.sum(), 2)
+        self.assertEqual(counts[_pair_idx("ATGCTG")], 1)
+        self.assertEqual(counts[_pair_idx("CTGCTG")], 1)
+
+        # Files:
+        fasta = io.StringIO(">1\nATGCTGCTG\n")
+        np.testing.assert_array_equal(
+            codon_pairs.count_codon_pairs(fasta, fmt="fasta"),
+            codon_pairs.count_codon_pairs(["ATGCTGCTG"]),
+        )
+        self.assertEqual(
+            codon_pairs.count_codon_pairs(
+                os.path.join(_DATA_DIR, "cds.gb")
+            ).sum(),
+            7,
+        )
+
+    def test_codon_pair_scores(self):
+        """Test codon_pair_scores method."""
+
+        # CTG is followed by AAA, and CTA by AAG, more often than expected:
+        seqs = ["CTGAAA"] * 9 + ["CTAAAG"] * 9 + ["CTGAAG", "CTAAAA"]
+        counts = codon_pairs.count_codon_pairs(seqs)
+        scores = codon_pairs.codon_pair_scores(counts, pseudocount=0)
+
+        self.assertAlmostEqual(scores[_pair_idx("CTGAAA")], math.log(9 / 5))
+        self.assertAlmostEqual(scores[_pair_idx("CTGAAG")], math.log(1 / 5))
+        self.assertEqual(scores[_pair_idx("ATGATG")], 0)
+
+        # Pseudocounts shrink scores towards zero:
+        scores = codon_pairs.codon_pair_scores(counts)
+        self.assertAlmostEqual(
+            scores[_pair_idx("CTGAAA")], math.log(9.5 / 5.5)
+        )
+        self.assertTrue(np.isfinite(scores).all())
+
+    def test_cpb(self):
+        """Test cpb method."""
+        scores = np.zeros((64, 64))
+        scores[_pair_idx("CTGAAA")] = 1.0
+        scores[_pair_idx("AAACTG")] = -0.5
+
+        self.assertEqual(codon_pairs.cpb("CTGAAACTG", scores), 0.25)
+
+        values = codon_pairs.cpb(["CTGAAA", "CTG", "CTGNNNAAA"], scores)
+        self.assertEqual(values[0], 1.0)
+        self.assertTrue(np.isnan(values[1:]).all())
+
+    def test_optimise(self):
+        """Test optimise method."""
+        scores = np.zeros((64, 64))
+
+        # Without pair scores, the most frequent codons are chosen:
+        self.assertEqual(
+            codon_pairs.optimise(_TABLE, "MLK", scores), "ATGCTGAAA"
+        )
+
+        # With pair scores, less frequent codons may be preferred:
+        scores[_pair_idx("ATGCTA")] = 1.0
+        scores[_pair_idx("CTAAAG")] = 1.0
+        self.assertEqual(
+            codon_pairs.optimise(_TABLE, "MLK", scores), "ATGCTAAAG"
+        )
+        self.assertEqual(
+            codon_pairs.optimise(_TABLE, "MLK", scores, weight=0),
+            "ATGCTGAAA",
+        )
+        self.assertEqual(codon_pairs.optimise(_TABLE, "", scores), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+# pylint: disable=protected-access
+import os.path
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from synbiopython.codon import config, fetch, store, table
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class TestConfig(unittest.TestCase):
+    """Class to test the config module."""
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.mkdtemp()
+        self.__patches = [
+            mock.patch.dict(config._SETTINGS, clear=True),
+            mock.patch.dict(
+                os.environ,
+                {config.CACHE_ENV: os.path.join(self.__tmp_dir, "user")},
+            ),
+        ]
+
+        for patch in self.__patches:
+            patch.start()
+
+        os.environ.pop(config.SHARED_CACHE_ENV, None)
+        os.environ.pop(config.OFFLINE_ENV, None)
+
+    def tearDown(self):
+        for patch in reversed(self.__patches):
+            patch.stop()
+
+        shutil.rmtree(self.__tmp_dir)
+
+    def test_get_cache_dir(self):
+        """Test get_cache_dir method."""
+        self.assertEqual(
+            config.get_cache_dir(), os.path.join(self.__tmp_dir, "user")
+        )
+        self.assertEqual(
+            config.get_store_path(),
+            os.path.join(self.__tmp_dir, "user", config.STORE_FILENAME),
+        )
+
+        config.set_cache_dir(self.__tmp_dir)
+        self.assertEqual(config.get_cache_dir(), self.__tmp_dir)
+
+        config.set_cache_dir(None)
+        self.assertEqual(
+            config.get_cache_dir(), os.path.join(self.__tmp_dir, "user")
+        )
+
+    def test_get_shared_dirs(self):
+        """Test get_shared_dirs method."""
+        self.assertEqual(config.get_shared_dirs(), [])
+
+        os.environ[config.SHARED_CACHE_ENV] = os.pathsep.join(["a", "", "b"])
+        self.assertEqual(config.get_shared_dirs(), ["a", "b"])
+
+        config.set_shared_dirs(["c"])
+        self.assertEqual(config.get_shared_dirs(), ["c"])
+
+    def test_is_offline(self):
+        """Test is_offline method."""
+        self.assertFalse(config.is_offline())
+
+        os.environ[config.OFFLINE_ENV] = "True"
+        self.assertTrue(config.is_offline())
+
+        config.set_offline(False)
+        self.assertFalse(config.is_offline())
+
+    def test_offline(self):
+        """Test offline mode."""
+        config.set_offline(True)
+        target_dir = config.get_cache_dir()
+
+        # Negative tests:
+        self.assertRaises(
+            ConnectionError, fetch.fetch_content, "37762", target_dir
+        )
+        self.assertRaises(ConnectionError, table.get_table, "37762")
+
+        # Positive tests:
+        os.makedirs(target_dir)
+        shutil.copy(os.path.join(_DATA_DIR, "37762.txt"), target_dir)
+        self.assertEqual(table.get_table("37762")["M"], {"ATG": 1.0})
+
+    def test_shared_store(self):
+        """Test get_table method, reading a shared, read-only store."""
+        shared_dir = os.path.join(self.__tmp_dir, "shared")
+        os.makedirs(shared_dir)
+        store.CodonUsageStore(
+            os.path.join(shared_dir, config.STORE_FILENAME)
+        ).import_files([os.path.join(_DATA_DIR, "37762.txt")])
+
+        config.set_shared_dirs([shared_dir])
+        config.set_offline(True)
+
+        self.assertEqual(table.get_table("37762")["M"], {"ATG": 1.0})
+        self.assertEqual(
+            table.get_table("37762", dna=False)["W"], {"UGG": 1.0}
+        )
+        self.assertFalse(os.path.exists(config.get_cache_dir()))
+
+    def test_shared_files(self):
+        """Test get_table method, reading shared Codon Usage Database files."""
+        shared_dir = os.path.join(self.__tmp_dir, "shared")
+        os.makedirs(shared_dir)
+        shutil.copy(os.path.join(_DATA_DIR, "37762.txt"), shared_dir)
+
+        config.set_shared_dirs([shared_dir])
+        config.set_offline(True)
+
+        self.assertEqual(table.get_table("37762")["M"], {"ATG": 1.0})
+        self.assertFalse(os.path.exists(config.get_cache_dir()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import os.path
+import unittest
+
+from Bio.Seq import Seq
+import numpy as np
+
+from synbiopython.codon import constrained, store
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class TestConstrained(unittest.TestCase):
+    """Class to test the constrained module."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = store.parse_file(os.path.join(_DATA_DIR, "37762.txt"))
+        rng = np.random.default_rng(0)
+        cls.aa_seq = "".join(rng.choice(list("ACDEFGHIKLMNPQRSTVWY"), 500))
+
+    def test_get_motifs(self):
+        """Test get_motifs method."""
+        self.assertEqual(constrained.get_motifs(["gaattc"]), ["GAATTC"])
+        self.assertEqual(constrained.get_motifs(["GGTCTC"]),
+                         ["GAGACC", "GGTCTC"])
+        self.assertEqual(
+            constrained.get_motifs(["GGTCTC"], both_strands=False,
+                                   max_homopolymer=3),
+            ["AAAA", "CCCC", "GGGG", "GGTCTC", "TTTT"])
+
+    def test_motif_automaton(self):
+        """Test MotifAutomaton class."""
+        automaton = constrained.MotifAutomaton(["ACA", "CAT"])
+        transitions = automaton.codon_transitions()
+
+        self.assertEqual(transitions.shape, (7, 64))
+
+        # ACA is forbidden from the start state; TAA only after reading TCA:
+        aca, tca, taa = 4, 52, 48
+        self.assertEqual(transitions[0, aca], -1)
+        self.assertGreaterEqual(transitions[0, taa], 0)
+        self.assertEqual(transitions[transitions[0, tca], taa], -1)
+
+        self.assertRaises(ValueError, constrained.MotifAutomaton, ["ACN"])
+
+    def test_optimise(self):
+        """Test optimise method."""
+
+        # Negative tests:
+        self.assertRaises(ValueError, constrained.optimise, self.table, "M",
+                          forbidden=["ATG"])
+        self.assertRaises(ValueError, constrained.optimise, self.table, "MM",
+                          forbidden=["ATGA"])
+
+        # Positive tests:
+        self.assertEqual(constrained.optimise(self.table, ""), "")
+        self.assertEqual(constrained.optimise(self.table, "MLK"), "ATGCTGAAA")
+        self.assertEqual(
+            constrained.optimise(self.table, "MK", forbidden=["ATGAAA"]),
+            "ATGAAG")
+
+        motifs = ["GAATTC", "GGATCC", "GGTCTC", "GCTCTTC"]
+        dna_seq = constrained.optimise(
+            self.table, self.aa_seq, forbidden=motifs, max_homopolymer=5
+        )
+
+        self.assertEqual(str(Seq(dna_seq).translate()), self.aa_seq)
+
+        for motif in constrained.get_motifs(motifs, max_homopolymer=5):
+            self.assertNotIn(motif, dna_seq)
+
+    def test_optimise_gc(self):
+        """Test optimise method with GC content bounds."""
+        dna_seq = constrained.optimise(
+            self.table,
+            self.aa_seq,
+            forbidden=["GAATTC"],
+            gc_window=60,
+            gc_range=(0.45, 0.6),
+        )
+
+        self.assertEqual(str(Seq(dna_seq).translate()), self.aa_seq)
+        self.assertNotIn("GAATTC", dna_seq)
+
+        is_gc = np.array([base in "GC" for base in dna_seq])
+        gc = np.convolve(is_gc, np.ones(60), "valid") / 60
+        self.assertGreaterEqual(gc.min(), 0.45)
+        self.assertLessEqual(gc.max(), 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
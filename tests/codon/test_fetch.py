@@ -0,0 +1,234 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+# pylint: disable=invalid-name,protected-access
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import os.path
+from socketserver import ThreadingMixIn
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
+
+from synbiopython.codon import config, fetch, store, table
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    """Local stand-in for the Codon Usage Database server."""
+
+    daemon_threads = True
+    requests = Counter()
+    clients = set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler, serving a codon usage table for tax id 37762."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """Handle GET request."""
+        tax_id = parse_qs(urlsplit(self.path).query)["species"][0]
+        self.server.requests[tax_id] += 1
+        self.server.clients.add(self.client_address)
+
+        if tax_id == "redirect":
+            self.send_response(302)
+            self.send_header(
+                "Location", self.path.replace("species=redirect", "species=37762")
+            )
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        # Slow responses, to widen the window for concurrent downloads:
+        time.sleep(0.05)
+
+        if tax_id == "0":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(os.path.join(_DATA_DIR, "37762.txt"), "rb") as fle:
+            content = fle.read()
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        """Suppress logging."""
+
+
+class TestFetch(unittest.TestCase):
+    """Class to test the fetch module."""
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.__server = _Server(("127.0.0.1", 0), _Handler)
+        self.__server.requests.clear()
+        self.__server.clients.clear()
+        self.__url = "http://127.0.0.1:%d/showcodon.cgi?species=%%s" % (
+            self.__server.server_address[1]
+        )
+        threading.Thread(target=self.__server.serve_forever).start()
+
+        # Connect to the local server directly, whatever the environment:
+        self.__env = mock.patch.dict(os.environ)
+        self.__env.start()
+
+        for name in list(os.environ):
+            if name.lower().endswith("_proxy"):
+                del os.environ[name]
+
+    def tearDown(self):
+        self.__env.stop()
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__tmp_dir.cleanup()
+
+    def test_fetch_content(self):
+        """Test fetch_content method."""
+        target_dir = os.path.join(self.__tmp_dir.name, "codon")
+
+        # Negative test:
+        self.assertRaises(
+            HTTPError, fetch.fetch_content, "0", target_dir, url=self.__url
+        )
+        self.assertEqual(os.listdir(target_dir), [])
+
+        # Positive test, with concurrent callers:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            filenames = list(
+                executor.map(
+                    lambda _: fetch.fetch_content(
+                        "37762", target_dir, url=self.__url
+                    ),
+                    range(8),
+                )
+            )
+
+        self.assertEqual(set(filenames), {os.path.join(target_dir, "37762.txt")})
+        self.assertEqual(self.__server.requests["37762"], 1)
+        self.assertEqual(
+            store.parse_file(filenames[0]),
+            store.parse_file(os.path.join(_DATA_DIR, "37762.txt")),
+        )
+
+        # No lock or temporary files are left behind:
+        self.assertEqual(os.listdir(target_dir), ["37762.txt"])
+
+    def test_fetch_all(self):
+        """Test fetch_all method."""
+        tax_ids = [str(tax_id) for tax_id in range(1, 21)]
+        target_dir = os.path.join(self.__tmp_dir.name, "codon")
+
+        start = time.time()
+        filenames = fetch.fetch_all(
+            tax_ids + tax_ids, target_dir, concurrency=10, url=self.__url
+        )
+
+        # 20 slow downloads should run concurrently:
+        self.assertLess(time.time() - start, 0.8)
+        self.assertEqual(
+            filenames[:20],
+            [os.path.join(target_dir, "%s.txt" % tax_id) for tax_id in tax_ids],
+        )
+        self.assertEqual(filenames[:20], filenames[20:])
+        self.assertEqual(
+            self.__server.requests, Counter({tax_id: 1 for tax_id in tax_ids})
+        )
+
+    def test_http_session(self):
+        """Test HTTPSession class."""
+        session = fetch.HTTPSession()
+
+        # Negative tests:
+        self.assertRaises(HTTPError, session.get, self.__url % "0")
+        self.assertRaises(
+            URLError, session.get, "http://127.0.0.1:1/showcodon.cgi"
+        )
+
+        # Positive tests:
+        content = session.get(self.__url % "redirect")
+        self.assertEqual(self.__server.requests["37762"], 1)
+
+        with open(os.path.join(_DATA_DIR, "37762.txt"), "rb") as fle:
+            self.assertEqual(content, fle.read())
+
+        # Connections are reused, and closed whatever the thread:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(session.get, self.__url % "1").result()
+            executor.submit(session.get, self.__url % "2").result()
+            self.assertEqual(len(self.__server.clients), 2)
+
+            session.close()
+            executor.submit(session.get, self.__url % "3").result()
+            self.assertEqual(len(self.__server.clients), 3)
+
+        session.close()
+
+    def test_proxy(self):
+        """Test fetch_content method, through a proxy."""
+        target_dir = os.path.join(self.__tmp_dir.name, "codon")
+        os.environ["http_proxy"] = "http://127.0.0.1:%d" % (
+            self.__server.server_address[1]
+        )
+
+        filename = fetch.fetch_content(
+            "37762",
+            target_dir,
+            url="http://codon.invalid/showcodon.cgi?species=%s",
+        )
+
+        self.assertEqual(filename, os.path.join(target_dir, "37762.txt"))
+        self.assertEqual(self.__server.requests["37762"], 1)
+
+    def test_prefetch_tables(self):
+        """Test prefetch_tables method."""
+        with mock.patch.dict(
+            config._SETTINGS,
+            {
+                "cache_dir": os.path.join(self.__tmp_dir.name, "codon"),
+                "shared_dirs": [],
+            },
+        ):
+            self.assertEqual(
+                table.prefetch_tables(
+                    ["37762", 37762, "83333"], concurrency=2, url=self.__url
+                ),
+                ["37762", "83333"],
+            )
+            self.assertEqual(
+                self.__server.requests, Counter({"37762": 1, "83333": 1})
+            )
+            self.assertEqual(
+                store.CodonUsageStore().tax_ids(), ["37762", "83333"]
+            )
+
+            # Stored tables are neither fetched again nor downloaded:
+            config.set_offline(True)
+            self.assertEqual(
+                table.prefetch_tables(["83333"], url=self.__url), ["83333"]
+            )
+            self.assertEqual(table.get_table("83333")["M"], {"ATG": 1.0})
+            self.assertEqual(sum(self.__server.requests.values()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
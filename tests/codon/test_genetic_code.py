@@ -0,0 +1,77 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import unittest
+
+from synbiopython.codon import genetic_code
+
+_TABLE = {
+    "*": {"TAG": 0.07, "TGA": 0.29, "TAA": 0.64},
+    "M": {"ATG": 1.0},
+    "W": {"TGG": 1.0},
+}
+
+
+class TestGeneticCode(unittest.TestCase):
+    """Class to test the genetic_code module."""
+
+    def test_get_genetic_code(self):
+        """Test get_genetic_code method."""
+        code = genetic_code.get_genetic_code(2)
+
+        self.assertEqual(code.table_id, 2)
+        self.assertEqual(genetic_code.get_genetic_code("2"), code)
+        self.assertEqual(
+            genetic_code.get_genetic_code("Vertebrate Mitochondrial"), code
+        )
+        self.assertEqual(code.stop_codons, ["AGA", "AGG", "TAA", "TAG"])
+        self.assertEqual(code.get_codons("W"), ["TGA", "TGG"])
+
+        # Negative tests:
+        with self.assertRaises(ValueError):
+            genetic_code.get_genetic_code(7)
+
+    def test_translate(self):
+        """Test translate method."""
+        self.assertEqual(genetic_code.translate("ATGTGGTGANNNAT"), "MW*X")
+        self.assertEqual(genetic_code.translate("AUGUGA", 4), "MW")
+        self.assertEqual(
+            genetic_code.translate("ATGTAAATG", to_stop=True), "M"
+        )
+
+    def test_back_translate(self):
+        """Test back_translate method."""
+        aa_seq = "MWKL*"
+        dna_seq = genetic_code.back_translate(aa_seq)
+
+        self.assertEqual(dna_seq, "ATGTGGAAACTATAA")
+        self.assertEqual(genetic_code.translate(dna_seq), aa_seq)
+
+        # Most frequent codons of a table:
+        self.assertEqual(
+            genetic_code.back_translate("MW*", table=_TABLE), "ATGTGGTAA"
+        )
+        self.assertEqual(
+            genetic_code.back_translate("MW*", 4, table=_TABLE), "ATGTGGTAA"
+        )
+
+        # Negative tests:
+        with self.assertRaises(KeyError):
+            genetic_code.back_translate("MZ")
+
+    def test_remap_table(self):
+        """Test remap_table method."""
+        table = genetic_code.remap_table(_TABLE, 4)
+
+        self.assertEqual(table["*"], {"TAG": 0.07 / 0.71, "TAA": 0.64 / 0.71})
+        self.assertEqual(table["W"], {"TGA": 0.29 / 1.29, "TGG": 1 / 1.29})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import io
+import math
+import os.path
+import unittest
+
+import numpy as np
+
+from synbiopython.codon import scoring, store
+from synbiopython.codon.codons import CODON_INDEX
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class TestScoring(unittest.TestCase):
+    """Class to test the scoring module."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = store.parse_file(os.path.join(_DATA_DIR, "37762.txt"))
+
+    def test_relative_adaptiveness(self):
+        """Test relative_adaptiveness method."""
+        weights = scoring.relative_adaptiveness(self.table)
+
+        self.assertEqual(weights[CODON_INDEX["CTG"]], 1.0)
+        self.assertAlmostEqual(weights[CODON_INDEX["CTA"]], 0.04 / 0.47)
+        self.assertTrue(np.isnan(weights[CODON_INDEX["ATG"]]))
+        self.assertTrue(np.isnan(weights[CODON_INDEX["TAA"]]))
+
+    def test_cai(self):
+        """Test cai method."""
+
+        # Single sequence:
+        self.assertEqual(scoring.cai("ATGCTGAAACCGTAA", self.table), 1.0)
+        self.assertAlmostEqual(
+            scoring.cai("CTGCTA", self.table), math.sqrt(0.04 / 0.47)
+        )
+
+        # Batch, ignoring ambiguous codons and trailing nucleotides:
+        scores = scoring.cai(["CTGNNNCTAC", "CTA", "ATGTGG", ""], self.table)
+        self.assertEqual(len(scores), 4)
+        self.assertAlmostEqual(scores[0], math.sqrt(0.04 / 0.47))
+        self.assertAlmostEqual(scores[1], 0.04 / 0.47)
+        self.assertTrue(np.isnan(scores[2:]).all())
+
+    def test_cai_profile(self):
+        """Test cai_profile method."""
+        profile = scoring.cai_profile("CTG" * 5 + "CTA" * 5, self.table, 5)
+
+        self.assertEqual(len(profile), 6)
+        self.assertAlmostEqual(profile[0], 1.0)
+        self.assertAlmostEqual(profile[-1], 0.04 / 0.47)
+        self.assertTrue(np.all(np.diff(profile) < 0))
+
+        profiles = scoring.cai_profile(
+            ["CTG" * 10, "CTG", "CTA" * 5], self.table, 5
+        )
+        self.assertEqual([len(profile) for profile in profiles], [6, 0, 1])
+        np.testing.assert_allclose(profiles[0], 1.0)
+        np.testing.assert_allclose(profiles[2], 0.04 / 0.47)
+        self.assertEqual(scoring.cai_profile([], self.table), [])
+
+        # Negative test:
+        self.assertRaises(
+            ValueError, scoring.cai_profile, "CTG" * 5, self.table, 0
+        )
+
+    def test_window_profile(self):
+        """Test window_profile method."""
+        profile = scoring.window_profile(
+            "CTG" * 5 + "CTA" + "NNN" + "GGG" * 5, self.table, 3
+        )
+
+        self.assertEqual(len(profile.mean_freq), 10)
+        self.assertAlmostEqual(profile.mean_freq[0], 0.47)
+        self.assertAlmostEqual(profile.mean_freq[4], (0.47 + 0.04) / 2)
+        self.assertAlmostEqual(profile.min_freq[3], 0.04)
+        self.assertAlmostEqual(profile.min_freq[5], 0.04)
+        self.assertAlmostEqual(profile.min_freq[6], profile.mean_freq[6])
+        self.assertAlmostEqual(profile.gc[0], 2 / 3)
+        self.assertAlmostEqual(profile.gc[-1], 1.0)
+
+        # Batch, including sequences shorter than the window:
+        profiles = scoring.window_profile(
+            ["CTG" * 10, "CTG", "NNN" * 5], self.table, 5
+        )
+        self.assertEqual([len(profile.gc) for profile in profiles], [6, 0, 1])
+        self.assertTrue(np.isnan(profiles[2].mean_freq).all())
+        self.assertTrue(np.isnan(profiles[2].min_freq).all())
+
+        # Negative test:
+        self.assertRaises(
+            ValueError, scoring.window_profile, "CTG" * 5, self.table, 0
+        )
+
+    def test_rscu(self):
+        """Test rscu method."""
+        values = scoring.rscu("CTGCTGCTAAAA")
+
+        self.assertEqual(values[CODON_INDEX["CTG"]], 4.0)
+        self.assertEqual(values[CODON_INDEX["CTA"]], 2.0)
+        self.assertEqual(values[CODON_INDEX["TTA"]], 0.0)
+        self.assertEqual(values[CODON_INDEX["AAA"]], 2.0)
+        self.assertTrue(np.isnan(values[CODON_INDEX["CCG"]]))
+
+        self.assertEqual(scoring.rscu(["CTG", "AAA", ""]).shape, (3, 64))
+
+    def test_score_fasta(self):
+        """Test score_fasta method."""
+        fasta = io.StringIO(
+            ">seq1\nATGCTGAAA\nCCGTAA\n>seq2\nCTGCTA\n>seq3\nATG\n"
+        )
+        results = list(scoring.score_fasta(fasta, self.table, batch_size=2))
+
+        self.assertEqual([seq_id for seq_id, _ in results],
+                         ["seq1", "seq2", "seq3"])
+        self.assertEqual(results[0][1], 1.0)
+        self.assertAlmostEqual(results[1][1], math.sqrt(0.04 / 0.47))
+        self.assertTrue(math.isnan(results[2][1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+# pylint: disable=protected-access
+import os.path
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from synbiopython.codon import config, similarity, store
+
+_TABLES = {
+    "1": {"L": {"CTG": 0.9, "CTA": 0.1}, "M": {"ATG": 1.0}},
+    "2": {"L": {"CTG": 0.5, "CTA": 0.5}, "M": {"ATG": 1.0}},
+    "3": {"L": {"CTG": 0.1, "CTA": 0.9}, "M": {"ATG": 1.0}},
+}
+
+
+class TestSimilarity(unittest.TestCase):
+    """Class to test the similarity module."""
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.__store = store.CodonUsageStore(
+            os.path.join(self.__tmp_dir.name, "codon_usage.db")
+        )
+        self.__store.put_many(_TABLES.items())
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_from_store(self):
+        """Test from_store method."""
+        matrix = similarity.UsageMatrix.from_store(self.__store)
+
+        self.assertEqual(len(matrix), 3)
+        self.assertEqual(list(matrix.tax_ids), ["1", "2", "3"])
+        self.assertEqual(matrix.values.shape, (3, 64))
+        self.assertAlmostEqual(matrix.values.sum(), 6.0)
+
+        # Memory-mapped:
+        filename = os.path.join(self.__tmp_dir.name, "matrix.npy")
+        mmapped = similarity.UsageMatrix.from_store(self.__store, filename)
+        self.assertIsInstance(mmapped.values, np.memmap)
+        np.testing.assert_array_equal(mmapped.values, matrix.values)
+        self.assertEqual(
+            os.listdir(self.__tmp_dir.name).count("matrix.npy"), 1
+        )
+        self.assertFalse(
+            [
+                name
+                for name in os.listdir(self.__tmp_dir.name)
+                if name[0] == "."
+            ]
+        )
+
+        # Rebuilding leaves existing maps intact:
+        store.CodonUsageStore(self.__store.path).put("4", _TABLES["1"])
+        rebuilt = similarity.UsageMatrix.from_store(self.__store, filename)
+        self.assertEqual(len(rebuilt), 4)
+        np.testing.assert_array_equal(mmapped.values, matrix.values)
+
+    def test_from_store_layers(self):
+        """Test from_store method, reading the stores of the codon cache."""
+        shared_dir = os.path.join(self.__tmp_dir.name, "shared")
+        shared_store = store.CodonUsageStore(
+            os.path.join(shared_dir, config.STORE_FILENAME)
+        )
+        shared_store.put_many([("3", _TABLES["1"]), ("4", _TABLES["2"])])
+
+        with mock.patch.dict(
+            config._SETTINGS,
+            {"cache_dir": self.__tmp_dir.name, "shared_dirs": [shared_dir]},
+        ):
+            matrix = similarity.UsageMatrix.from_store(mmap_threshold=2)
+
+        self.assertEqual(list(matrix.tax_ids), ["3", "4", "1", "2"])
+        self.assertIsInstance(matrix.values, np.memmap)
+        np.testing.assert_array_equal(matrix.values[0], matrix.values[2])
+
+    def test_distances(self):
+        """Test distances method."""
+        matrix = similarity.UsageMatrix.from_store(self.__store)
+
+        for metric in similarity.METRICS:
+            dists = matrix.distances(metric=metric, chunk_size=2)
+            self.assertEqual(dists.shape, (3, 3))
+            np.testing.assert_allclose(np.diag(dists), 0, atol=1e-6)
+            self.assertLess(dists[0, 1], dists[0, 2])
+            self.assertTrue((dists > -1e-9).all())
+
+        np.testing.assert_allclose(
+            matrix.distances(metric="euclidean")[0, 2], 0.8 * np.sqrt(2)
+        )
+
+        # Negative tests:
+        with self.assertRaises(ValueError):
+            matrix.distances(metric="manhattan")
+
+    def test_nearest(self):
+        """Test nearest method."""
+        matrix = similarity.UsageMatrix.from_store(self.__store)
+        query = {"L": {"CTG": 8.0, "CTA": 2.0}}
+
+        for metric in similarity.METRICS:
+            nearest = matrix.nearest(query, k=2, metric=metric)
+            self.assertEqual([tax_id for tax_id, _ in nearest], ["1", "2"])
+
+        self.assertEqual(len(matrix.nearest(query, k=5)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Synbiopython (c) Global BioFoundry Alliance 2020
+
+Synbiopython is licensed under the MIT License.
+
+To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
+
+@author: neilswainston
+"""
+import os.path
+import tempfile
+import unittest
+
+from synbiopython.codon import store
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+
+class TestStore(unittest.TestCase):
+    """Class to test the store module."""
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.__store = store.CodonUsageStore(
+            os.path.join(self.__tmp_dir.name, "codon", "codon_usage.db")
+        )
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_get_put(self):
+        """Test get and put methods."""
+        filename = os.path.join(_DATA_DIR, "37762.txt")
+        codon_table = store.parse_file(filename)
+
+        # Negative tests:
+        self.assertNotIn("37762", self.__store)
+        self.assertIsNone(self.__store.get("37762"))
+
+        # Positive tests:
+        self.__store.put("37762", codon_table)
+        self.assertIn(37762, self.__store)
+        self.assertEqual(len(self.__store), 1)
+        self.assertEqual(self.__store.get("37762"), codon_table)
+        self.assertEqual(
+            list(self.__store.get("37762")["L"]), list(codon_table["L"])
+        )
+
+        rna_table = self.__store.get("37762", dna=False)
+        self.assertEqual(len(rna_table), 21)
+        self.assertEqual(rna_table["*"]["UAA"], 0.61)
+
+    def test_version(self):
+        """Test version method."""
+        codon_table = store.parse_file(os.path.join(_DATA_DIR, "37762.txt"))
+
+        # Negative test:
+        self.assertIsNone(self.__store.version("37762"))
+
+        # Positive tests:
+        self.__store.put_many([("9606", codon_table), ("37762", codon_table)])
+        version = self.__store.version("37762")
+        self.assertNotEqual(self.__store.version("9606"), version)
+
+        self.__store.put("9606", codon_table)
+        self.assertEqual(self.__store.version("37762"), version)
+        self.__store.put("37762", codon_table)
+        self.assertGreater(self.__store.version("37762"), version)
+
+    def test_import_files(self):
+        """Test import_files method."""
+        filename = os.path.join(_DATA_DIR, "37762.txt")
+        self.assertEqual(self.__store.import_files([filename]), 1)
+        self.assertEqual(self.__store.tax_ids(), ["37762"])
+        self.assertEqual(self.__store.get("37762"), store.parse_file(filename))
+
+    def test_arrays(self):
+        """Test arrays method."""
+        filename = os.path.join(_DATA_DIR, "37762.txt")
+        codon_table = store.parse_file(filename)
+        self.__store.put_many([("9606", codon_table), ("37762", codon_table)])
+
+        arrays = list(self.__store.arrays())
+        self.assertEqual([tax_id for tax_id, _ in arrays], ["37762", "9606"])
+        self.assertEqual(arrays[0][1].to_dict(), codon_table)
+
+    def test_import_spsum(self):
+        """Test import_spsum method."""
+        filename = os.path.join(self.__tmp_dir.name, "test.spsum")
+
+        with open(filename, "w") as fle:
+            fle.write("562:Escherichia coli: 2\n")
+            fle.write(" ".join(["10"] * 63 + ["0"]) + "\n")
+            fle.write("9606:Homo sapiens: 1\n")
+            fle.write(" ".join(["1"] * 64) + "\n")
+
+        self.assertEqual(self.__store.import_spsum(filename), 2)
+
+        codon_table = self.__store.get("562")
+        self.assertEqual(len(codon_table), 21)
+        self.assertAlmostEqual(codon_table["*"]["TAA"], 0.5)
+        self.assertAlmostEqual(codon_table["*"]["TGA"], 0.0)
+        self.assertAlmostEqual(codon_table["L"]["CTG"], 1 / 6)
+        self.assertEqual(codon_table["M"], {"ATG": 1.0})
+        self.assertAlmostEqual(self.__store.get("9606")["*"]["TGA"], 1 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,16 +7,46 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 
 @author: neilswainston
 """
-# pylint: disable=C0330
+# pylint: disable=C0330,W0212
+import gzip
+import io
 import itertools
+import os.path
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
-from synbiopython.codon import table
+from synbiopython.codon import config, store, table
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
 
 
 class TestTable(unittest.TestCase):
     """Class to test the table module."""
 
+    def setUp(self):
+        # Cache downloaded tables in a temporary directory, not in the
+        # user's cache:
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.__patches = [
+            mock.patch.dict(config._SETTINGS),
+            mock.patch.dict(
+                os.environ, {config.CACHE_ENV: self.__tmp_dir.name}
+            ),
+        ]
+
+        for patch in self.__patches:
+            patch.start()
+
+        config._SETTINGS.pop("cache_dir", None)
+
+    def tearDown(self):
+        for patch in reversed(self.__patches):
+            patch.stop()
+
+        self.__tmp_dir.cleanup()
+
     def test_get_table(self):
         """Test get_table method."""
 
@@ -30,6 +60,143 @@ class TestTable(unittest.TestCase):
         ):
             self.__test_table(table.get_table(table_id, dna=dna), dna=dna)
 
+    def test_get_table_cache(self):
+        """Test get_table method, caching tables in memory."""
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(
+            config._SETTINGS,
+            {"cache_dir": tmp_dir, "shared_dirs": [], "offline": True},
+        ):
+            for tax_id in ["37762", "83333"]:
+                shutil.copy(
+                    os.path.join(_DATA_DIR, "37762.txt"),
+                    os.path.join(tmp_dir, "%s.txt" % tax_id),
+                )
+
+            table.clear_cache()
+            self.assertEqual(table.get_cache_info(), (0, 0, 0, 128, 0))
+
+            # Hits, and copies of the cached tables:
+            codon_table = table.get_table("37762")
+            codon_table["M"]["ATG"] = 0.5
+            self.assertEqual(table.get_table("37762")["M"], {"ATG": 1.0})
+            self.assertEqual(table.get_table(37762)["M"], {"ATG": 1.0})
+            self.assertEqual(table.get_cache_info(), (2, 1, 0, 128, 1))
+
+            # Adding other tables to the store keeps cached tables valid:
+            table.get_table("83333")
+            table.get_table("37762")
+            self.assertEqual(table.get_cache_info(), (3, 2, 0, 128, 2))
+
+            # Replacing a table in the store invalidates its cached copy:
+            store.CodonUsageStore().put("37762", codon_table)
+            self.assertEqual(table.get_table("37762")["M"], {"ATG": 0.5})
+            table.get_table("83333")
+            self.assertEqual(table.get_cache_info(), (4, 3, 0, 128, 2))
+
+            # Resizing evicts the least recently used tables:
+            try:
+                table.set_cache_size(1)
+                self.assertEqual(table.get_cache_info(), (4, 3, 1, 1, 1))
+                table.get_table("37762")
+                self.assertEqual(table.get_cache_info(), (4, 4, 2, 1, 1))
+            finally:
+                table.set_cache_size(128)
+
+            table.clear_cache()
+            self.assertEqual(table.get_cache_info(), (0, 0, 0, 128, 0))
+
+    def test_get_table_cache_shared(self):
+        """Test get_table method, caching tables of shared directories."""
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(
+            config._SETTINGS,
+            {
+                "cache_dir": os.path.join(tmp_dir, "cache"),
+                "shared_dirs": [tmp_dir],
+                "offline": True,
+            },
+        ):
+            shutil.copy(os.path.join(_DATA_DIR, "37762.txt"), tmp_dir)
+            table.clear_cache()
+            codon_table = table.get_table("37762")
+            self.assertEqual(table.get_table("37762"), codon_table)
+            self.assertEqual(table.get_cache_info()[:2], (1, 1))
+
+            # Adding a shared store invalidates cached copies:
+            shared_store = store.CodonUsageStore(
+                os.path.join(tmp_dir, config.STORE_FILENAME)
+            )
+            codon_table["M"]["ATG"] = 0.5
+            shared_store.put("37762", codon_table)
+            self.assertEqual(table.get_table("37762")["M"], {"ATG": 0.5})
+
+            # ...as does changing it:
+            codon_table["M"]["ATG"] = 0.25
+            shared_store.put("37762", codon_table)
+            self.assertEqual(table.get_table("37762")["M"], {"ATG": 0.25})
+            self.assertEqual(table.get_cache_info()[:2], (1, 3))
+
+            table.clear_cache()
+
+    def test_build_table_from_sequences(self):
+        """Test build_table_from_sequences method."""
+        filename = os.path.join(_DATA_DIR, "cds.gb")
+        codon_table = table.build_table_from_sequences(filename)
+
+        self.assertEqual(len(codon_table), 21)
+        self.assertEqual(codon_table["M"], {"ATG": 1.0})
+        self.assertEqual(codon_table["L"]["CTG"], 0.75)
+        self.assertEqual(codon_table["L"]["CTA"], 0.25)
+        self.assertEqual(codon_table["L"]["TTA"], 0.0)
+        self.assertAlmostEqual(codon_table["*"]["TGA"], 1 / 3)
+
+        # FASTA handles, gzipped files and iterables of sequences:
+        fasta = ">1\nATGCTGCTGTAA\n>2\nATGCTATGA\n>3\natgctgtag\n"
+        self.assertEqual(
+            table.build_table_from_sequences(io.StringIO(fasta)), codon_table
+        )
+        self.assertEqual(
+            table.build_table_from_sequences(
+                ["ATGCTGCTGTAA", "ATGCTATGA", "ATGCTGTAG"], batch_size=2
+            ),
+            codon_table,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            gz_filename = os.path.join(tmp_dir, "cds.gb.gz")
+
+            with open(filename, "rb") as fle_in, gzip.open(
+                gz_filename, "wb"
+            ) as fle_out:
+                shutil.copyfileobj(fle_in, fle_out)
+
+            self.assertEqual(
+                table.build_table_from_sequences(gz_filename), codon_table
+            )
+
+        # Under the Mycoplasma code (4), TGA encodes W:
+        codon_table = table.build_table_from_sequences(
+            filename, genetic_code=4
+        )
+        self.assertEqual(codon_table["W"], {"TGG": 0.0, "TGA": 1.0})
+
+    def test_build_table_from_sequences_table_id(self):
+        """Test build_table_from_sequences method, registering the table."""
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(
+            config._SETTINGS, {"cache_dir": tmp_dir, "shared_dirs": []}
+        ):
+            # Negative tests:
+            self.assertRaises(ValueError, table.get_table, "my_strain")
+
+            # Positive tests:
+            codon_table = table.build_table_from_sequences(
+                os.path.join(_DATA_DIR, "cds.gb"), table_id="my_strain"
+            )
+            self.assertEqual(table.get_table("my_strain"), codon_table)
+            self.assertEqual(
+                table.get_table("my_strain", dna=False)["*"]["UGA"],
+                codon_table["*"]["TGA"],
+            )
+
     def __test_table(self, codon_table, dna):
         """Test table."""
         self.assertEqual(len(codon_table), 21)
@@ -9,6 +9,9 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 """
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from synbiopython.codon import taxonomy_utils
 
 
@@ -30,6 +33,12 @@ class TestTaxonomyUtils(unittest.TestCase):
         for table_id in [45372, "45372", "Abies alba"]:
             self.assertEqual(taxonomy_utils.get_tax_id(table_id), "45372")
 
+        # Names containing comment characters:
+        self.assertEqual(taxonomy_utils.get_tax_id("Acropora sp. #30"),
+                         "258444")
+        self.assertEqual(taxonomy_utils.get_tax_id("161709.mitochondrion"),
+                         "161709.mitochondrion")
+
     def test_get_organism_name(self):
         """Test get_organism_name method."""
 
@@ -46,6 +55,95 @@ class TestTaxonomyUtils(unittest.TestCase):
         self.assertEqual(taxonomy_utils.get_organism_name("Abies alba"),
                          "Abies alba")
 
+    def test_get_tax_ids(self):
+        """Test get_tax_ids method."""
+        table_ids = [45372, "Abies alba", 45372.0, "hello", "255"]
+
+        # Negative tests:
+        self.assertRaises(ValueError, taxonomy_utils.get_tax_ids, table_ids)
+        self.assertRaises(ValueError, taxonomy_utils.get_tax_ids, [255],
+                          errors="unknown")
+
+        # Positive tests:
+        self.assertEqual(
+            taxonomy_utils.get_tax_ids(table_ids, errors="coerce").tolist(),
+            ["45372", "45372", "45372", None, "255"])
+        self.assertEqual(
+            taxonomy_utils.get_tax_ids(pd.Series(table_ids), errors="ignore",
+                                       fill_value="").tolist(),
+            ["45372", "45372", "45372", "hello", "255"])
+        self.assertEqual(
+            taxonomy_utils.get_tax_ids(np.array([[255], [45372]])).tolist(),
+            [["255"], ["45372"]])
+
+    def test_get_organism_names(self):
+        """Test get_organism_names method."""
+
+        # Negative test:
+        self.assertRaises(ValueError, taxonomy_utils.get_organism_names,
+                          ["hello"])
+
+        # Positive tests:
+        self.assertEqual(
+            taxonomy_utils.get_organism_names(
+                ["255", "Abies alba", -1], errors="coerce",
+                fill_value="").tolist(),
+            ["'Flavobacterium' lutescens", "Abies alba", ""])
+        self.assertEqual(taxonomy_utils.get_organism_names([]).tolist(), [])
+
+    def test_complete_organism_names(self):
+        """Test complete_organism_names method."""
+
+        # Negative test:
+        self.assertEqual(taxonomy_utils.complete_organism_names("xyzzy"), [])
+
+        # Positive tests:
+        names = taxonomy_utils.complete_organism_names("ESCHERICHIA COLI", 3)
+        self.assertEqual(len(names), 3)
+        self.assertEqual(names[0], "Escherichia coli")
+        self.assertTrue(all(name.startswith("Escherichia coli")
+                            for name in names))
+        self.assertEqual(taxonomy_utils.complete_organism_names("abies alb"),
+                         ["Abies alba"])
+
+    def test_search_organism_names(self):
+        """Test search_organism_names method."""
+
+        # Negative test:
+        self.assertEqual(taxonomy_utils.search_organism_names(""), [])
+
+        # Positive tests:
+        matches = taxonomy_utils.search_organism_names("Escherichia colli")
+        self.assertEqual(len(matches), 10)
+        self.assertEqual(matches[0][0], "Escherichia coli")
+
+        scores = [score for _, score in matches]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        self.assertEqual(
+            taxonomy_utils.search_organism_names("sacharomyces cervisiae",
+                                                 k=1)[0][0],
+            "Saccharomyces cerevisiae")
+        self.assertEqual(
+            taxonomy_utils.search_organism_names("Homo sapiens", k=1),
+            [("Homo sapiens", 1.0)])
+
+    def test_search_ties(self):
+        """Test searching, with names tying for the k-th best."""
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        names = [first + second + "xy" for first in letters
+                 for second in letters] + ["xy", "zzzz xy"]
+        index = taxonomy_utils._SearchIndex(names)  # pylint: disable=W0212
+        matches = index.search("xy", len(names))
+
+        self.assertEqual(matches,
+                         sorted(matches,
+                                key=lambda match: (-match[1],
+                                                   match[0].lower())))
+
+        for k in [3, 5, 10]:
+            self.assertEqual(index.search("xy", k), matches[:k])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,16 +7,73 @@ To view a copy of this license, visit <http://opensource.org/licenses/MIT/>.
 
 @author: neilswainston
 """
-# pylint: disable=fixme,C0330
+# pylint: disable=fixme,C0330,W0212
 from collections import Counter
+import itertools
+import math
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
-from synbiopython.codon import table, utils
+import numpy as np
+
+from synbiopython.codon import config, table, utils
+
+_TABLE = {
+    "*": {"TAG": 0.07, "TGA": 0.29, "TAA": 0.64},
+    "L": {"CTA": 0.04, "CTC": 0.10, "TTA": 0.13, "CTG": 0.50, "TTG": 0.13,
+          "CTT": 0.10},
+    "M": {"ATG": 1.0},
+    "S": {"TCG": 0.15, "TCA": 0.12, "AGC": 0.28, "TCC": 0.15, "AGT": 0.15,
+          "TCT": 0.15},
+    "W": {"TGG": 1.0},
+}
 
 
 class TestUtils(unittest.TestCase):
     """Class to test the utils module."""
 
+    def setUp(self):
+        # Cache downloaded tables in a temporary directory, not in the
+        # user's cache:
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.__patches = [
+            mock.patch.dict(config._SETTINGS),
+            mock.patch.dict(
+                os.environ, {config.CACHE_ENV: self.__tmp_dir.name}
+            ),
+        ]
+
+        for patch in self.__patches:
+            patch.start()
+
+        config._SETTINGS.pop("cache_dir", None)
+
+    def tearDown(self):
+        for patch in reversed(self.__patches):
+            patch.stop()
+
+        self.__tmp_dir.cleanup()
+
+    def test_import(self):
+        """Test importing the utils module, without the table module."""
+        modules = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import sys, synbiopython.codon.utils; "
+                "print(' '.join(sys.modules))",
+            ],
+            universal_newlines=True,
+        ).split()
+
+        for module in ["synbiopython.codon.table", "Bio.SeqIO", "sqlite3"]:
+            self.assertNotIn(module, modules)
+
     def test_sample(self):
         """Test sample method."""
         codon_table = table.get_table("Escherichia coli")
@@ -52,6 +109,170 @@ class TestUtils(unittest.TestCase):
         # Test:
         self._test(codons, aa_codons)
 
+    def test_compiled_codon_table(self):
+        """Test CompiledCodonTable class."""
+        compiled = utils.CompiledCodonTable(_TABLE)
+
+        # Negative test:
+        self.assertRaises(KeyError, compiled.sample, "MLX")
+
+        # Positive tests:
+        self.assertEqual(compiled.sample(""), "")
+        self.assertEqual(compiled.sample("MWM"), "ATGTGGATG")
+
+        for amino_acid in ["L", "S", "*"]:
+            dna_seq = compiled.sample(amino_acid * 100000)
+            codons = [dna_seq[i : i + 3] for i in range(0, len(dna_seq), 3)]
+            self._test(codons, _TABLE[amino_acid])
+
+    def test_codon_optimise_rng(self):
+        """Test codon optimise method with a seeded generator."""
+        aa_seq = "MLSLLSW*"
+        dna_seq = utils.optimise(_TABLE, aa_seq, np.random.default_rng(42))
+
+        self.assertEqual(len(dna_seq), 3 * len(aa_seq))
+        self.assertEqual(
+            dna_seq,
+            utils.optimise(
+                utils.CompiledCodonTable(_TABLE),
+                aa_seq,
+                np.random.default_rng(42),
+            ),
+        )
+
+        for amino_acid, i in zip(aa_seq, range(0, len(dna_seq), 3)):
+            self.assertIn(dna_seq[i : i + 3], _TABLE[amino_acid])
+
+    def test_codon_optimise_genetic_code(self):
+        """Test codon optimise method with an alternative genetic code."""
+
+        # Under the Mycoplasma code (4), TGA encodes W, not stop:
+        dna_seq = utils.optimise(
+            _TABLE, "W" * 200, np.random.default_rng(0), genetic_code=4
+        )
+        codons = {dna_seq[i : i + 3] for i in range(0, len(dna_seq), 3)}
+        self.assertEqual(codons, {"TGG", "TGA"})
+
+        # Negative tests:
+        with self.assertRaises(ValueError):
+            utils.optimise(
+                utils.CompiledCodonTable(_TABLE), "W", genetic_code=4
+            )
+
+    def test_optimise_many(self):
+        """Test optimise_many method."""
+        aa_seqs = ["M" + "LS" * idx + "W*" for idx in range(50)]
+
+        serial = list(
+            utils.optimise_many(_TABLE, aa_seqs, chunksize=8, seed=1)
+        )
+        parallel = list(
+            utils.optimise_many(
+                _TABLE, iter(aa_seqs), workers=2, chunksize=8, seed=1
+            )
+        )
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(serial), len(aa_seqs))
+
+        for aa_seq, dna_seq in zip(aa_seqs, serial):
+            self.assertTrue(dna_seq.startswith("ATG"))
+            self.assertEqual(len(dna_seq), 3 * len(aa_seq))
+
+    def test_optimise_many_spawn(self):
+        """Test optimise_many method, with spawned workers."""
+        aa_seqs = ["M" + "LS" * idx + "W*" for idx in range(50)]
+        pickled = []
+
+        def getstate(compiled):
+            pickled.append(compiled)
+            return compiled.__dict__
+
+        with mock.patch.object(
+            utils.CompiledCodonTable, "__getstate__", getstate, create=True
+        ):
+            spawned = list(
+                utils.optimise_many(
+                    _TABLE,
+                    aa_seqs,
+                    workers=2,
+                    chunksize=8,
+                    seed=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            )
+
+        self.assertEqual(
+            spawned,
+            list(utils.optimise_many(_TABLE, aa_seqs, chunksize=8, seed=1)),
+        )
+
+        # The table is sent to each worker once, not with each chunk:
+        self.assertIn(len(pickled), [1, 2])
+
+    def test_back_translations(self):
+        """Test back_translations method."""
+        aa_seq = "MLSW*L"
+        results = list(utils.back_translations(_TABLE, aa_seq))
+
+        # All back-translations, each once, most probable first:
+        self.assertEqual(len(results), 6 * 6 * 3 * 6)
+        self.assertEqual(len({dna_seq for dna_seq, _ in results}), 648)
+        self.assertEqual(results[0][0], "ATGCTGAGCTGGTAACTG")
+        self.assertAlmostEqual(
+            results[0][1], math.log(0.5 * 0.28 * 0.64 * 0.5)
+        )
+
+        log_probs = [log_prob for _, log_prob in results]
+        self.assertEqual(log_probs, sorted(log_probs, reverse=True))
+
+        # Lazy, deterministic and bounded by k:
+        self.assertEqual(
+            list(utils.back_translations(_TABLE, aa_seq, k=10)), results[:10]
+        )
+        self.assertEqual(
+            list(itertools.islice(utils.back_translations(_TABLE, aa_seq), 5)),
+            results[:5],
+        )
+        self.assertEqual(
+            list(utils.back_translations(_TABLE, "", k=3)), [("", 0)]
+        )
+
+        # Negative tests:
+        with self.assertRaises(KeyError):
+            list(utils.back_translations(_TABLE, "MZ"))
+
+    def test_harmonise(self):
+        """Test harmonise method."""
+        target_table = {
+            "*": {"TAG": 0.64, "TGA": 0.29, "TAA": 0.07},
+            "L": {"CTA": 0.50, "CTC": 0.04, "TTA": 0.13, "CTG": 0.10,
+                  "TTG": 0.13, "CTT": 0.10},
+            "M": {"ATG": 1.0},
+            "W": {"TGG": 1.0},
+        }
+
+        # Most frequent to most frequent, least frequent to least frequent:
+        self.assertEqual(
+            utils.harmonise("ATGCTGCTATAANNNCT", _TABLE, target_table),
+            "ATGCTACTCTAGNNNCT",
+        )
+        self.assertEqual(
+            utils.harmonise(["CTG", "AUGCUGUAA", "TCG", ""], _TABLE, _TABLE),
+            ["CTG", "AUGCUGUAA", "TCG", ""],
+        )
+
+        # Amino acids absent from the target are unchanged:
+        self.assertEqual(
+            utils.harmonise("TCGAGC", _TABLE, target_table), "TCGAGC"
+        )
+
+        mapping = utils.get_harmonisation_map(_TABLE, target_table)
+        self.assertIs(
+            utils.get_harmonisation_map(_TABLE, target_table), mapping
+        )
+        self.assertFalse(mapping.flags.writeable)
+
     def _test(self, target, aa_codons):
         """Test method."""
         codons = Counter(target)
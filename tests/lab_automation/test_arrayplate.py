@@ -0,0 +1,134 @@
+# pylint: disable=C0114,E0401,C0103,C0116,W0621
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+import synbiopython.lab_automation as lab
+from synbiopython.lab_automation.containers.ArrayPlate import ArrayWell
+from synbiopython.lab_automation.containers.Well import Well
+from synbiopython.lab_automation.picklist.Transfer import TransferError
+
+
+def test_getitem():
+    plate = lab.ArrayPlate96(wells_data={"B3": {"barcode": "x"}})
+    well = plate["B3"]
+    assert isinstance(well, Well)
+    assert (well.name, well.row, well.column) == ("B3", 2, 3)
+    assert well.data == {"barcode": "x"}
+    assert plate["B3"] is well
+    assert plate.wells["B3"] == well
+    assert well != plate["B4"]
+    with pytest.raises(KeyError):
+        plate["Z99"]
+
+
+def test_data():
+    plate = lab.ArrayPlate1536()
+    plate.to_dict()
+    assert plate.list_filtered_wells(lambda well: well.data.get("x")) == []
+    assert plate["A1"].data == {}
+    assert plate["A1"].sources == []
+    assert plate._wells_data == {}
+    assert plate._sources == {}
+
+    # Writing data and sources creates them:
+    data = plate["A1"].data
+    data["x"] = 1
+    assert plate["A1"].data == {"x": 1}
+    plate["A2"].data = {"x": 2}
+    plate["A3"].sources.append(plate["A1"])
+    assert plate["A3"].sources == [plate["A1"]]
+    assert list(plate["A3"].iterate_sources_tree()) == [plate["A1"], plate["A3"]]
+    assert plate.list_filtered_wells(lambda well: well.data.get("x")) == [
+        plate["A1"],
+        plate["A2"],
+    ]
+
+
+def test_add_content():
+    plate = lab.ArrayPlate96()
+    plate["A1"].add_content({"Compound_1": 5}, volume=20, unit_volume="uL")
+    assert plate["A1"].content.quantities == {"Compound_1": 5}
+    assert plate["A1"].content.concentration() == 250000.00000000003
+    assert plate.volumes[0] == pytest.approx(20e-6)
+    assert plate.components == ["Compound_1"]
+    assert plate.quantities.shape == (96, 1)
+    assert plate.quantities[:, 0].sum() == 5
+
+
+def test_subtract_content():
+    plate = lab.ArrayPlate96()
+    well = plate["A1"]
+    well.add_content({"Compound_1": 5, "Compound_2": 1}, volume=20e-6)
+    well.subtract_content({"Compound_1": 5}, volume=10e-6)
+    assert well.content.to_dict() == {
+        "volume": 10e-6,
+        "quantities": {"Compound_2": 1},
+    }
+    with pytest.raises(TransferError):
+        well.subtract_content({}, volume=30e-6)
+    well.empty_completely()
+    assert well.is_empty
+    assert well.content.quantities == {}
+
+
+def test_transfer():
+    plate = lab.ArrayPlate96(name="p")
+    plate["A1"].add_content({"Compound_1": 5}, volume=20e-6)
+    picklist = lab.PickList()
+    picklist.add_transfer(plate["A1"], plate["B1"], 5e-6)
+    new_plates = picklist.simulate(inplace=False)
+    assert plate["B1"].is_empty
+    new_plate = new_plates[plate]
+    assert new_plate["B1"].content.quantities == {"Compound_1": 1.25}
+    assert new_plate["B1"].sources[0].destination_well == new_plate["B1"]
+
+    picklist.simulate()
+    assert plate["B1"].content.quantities == {"Compound_1": 1.25}
+    assert plate["B1"].sources == picklist.transfers_list
+
+
+def test_capacity():
+    class CapacityPlate(lab.ArrayPlate96):
+        well_class = lab.containers.builtin_containers.Plate4ti0960Well
+
+    well = CapacityPlate()["A1"]
+    assert isinstance(well, ArrayWell)
+    assert well.capacity == 150e-6
+    with pytest.raises(TransferError):
+        well.add_content({}, volume=200e-6)
+
+
+def test_pickle():
+    plate = lab.ArrayPlate384(name="p")
+    plate["P24"].add_content({"Compound_1": 5}, volume=20e-6)
+    new_plate = pickle.loads(pickle.dumps(plate))
+    assert new_plate["P24"].content.to_dict() == plate["P24"].content.to_dict()
+    assert copy.deepcopy(plate).to_dict() == plate.to_dict()
+
+
+def test_plate_api():
+    plate = lab.ArrayPlate1536()
+    reference = lab.Plate1536()
+    assert [well.name for well in plate.iter_wells(direction="column")] == [
+        well.name for well in reference.iter_wells(direction="column")
+    ]
+    assert [well.name for well in plate.return_row("AF")] == [
+        well.name for well in reference.return_row("AF")
+    ]
+    assert plate.get_well_at_index(49).name == "B1"
+    assert plate.to_dict() == reference.to_dict()
+    assert np.array_equal(plate.volumes, np.zeros(1536))
+    assert plate.rows == reference.rows
+    assert plate.columns == reference.columns
+
+
+def test_rows_columns():
+    plate = lab.ArrayPlate96()
+    plate.rows["A"].remove("A1")
+    del plate.columns[1]
+    other = lab.ArrayPlate96()
+    assert other.rows["A"][0] == "A1"
+    assert [well.name for well in other.return_column(1)][:2] == ["A1", "B1"]
@@ -0,0 +1,150 @@
+# pylint: disable=C0114,E0401,C0103,C0116,W0621
+import copy
+import pickle
+
+import pytest
+
+import synbiopython.lab_automation as lab
+from synbiopython.lab_automation.containers.ComponentIndex import ComponentIndex
+from synbiopython.lab_automation.containers.Plate import NoUniqueWell
+from synbiopython.lab_automation.containers.WellContent import WellContent
+
+
+@pytest.mark.parametrize("plate_class", [lab.Plate96, lab.ArrayPlate96])
+def test_component_index(plate_class):
+    plate = plate_class(name="p")
+    index = plate.component_index
+    plate["A1"].add_content({"Compound_1": 5, "Compound_2": 1}, volume=20e-6)
+    assert "Compound_1" in index
+    assert index.wells_containing("Compound_1") == [plate["A1"]]
+    assert index.contains("Compound_2", plate["A1"])
+
+    lab.Transfer(plate["A1"], plate["B1"], 10e-6).apply()
+    assert plate.list_wells_containing("Compound_1") == [plate["A1"], plate["B1"]]
+    assert index.stats() == {
+        "components": 2,
+        "entries": 4,
+        "max_wells_per_component": 2,
+    }
+
+    plate["A1"].subtract_content({"Compound_2": 0.5})
+    assert plate.find_unique_well_containing("Compound_2") == plate["B1"]
+    with pytest.raises(NoUniqueWell):
+        plate.find_unique_well_containing("Compound_1")
+
+    plate["B1"].empty_completely()
+    assert plate.find_unique_well_containing("Compound_1") == plate["A1"]
+    assert "Compound_2" not in index
+    assert len(index) == 1
+
+
+@pytest.mark.parametrize("plate_class", [lab.Plate96, lab.ArrayPlate96])
+def test_replace_content(plate_class):
+    plate = plate_class()
+    plate["A1"].add_content({"x": 1}, volume=1e-6)
+    plate["B1"].content = WellContent(quantities={"y": 1}, volume=1e-6)
+    assert plate.find_unique_well_containing("y") == plate["B1"]
+
+    plate["A1"].content.make_empty()
+    assert plate.list_wells_containing("x") == []
+    assert "x" not in plate.component_index
+
+    plate["B1"].content.quantities = {"x": 2}
+    assert plate.list_wells_containing("y") == []
+    assert plate.find_unique_well_containing("x") == plate["B1"]
+
+
+def test_trough():
+    trough = lab.Trough8x1(name="t")
+    assert trough.num_wells == 8
+    trough["A1"].add_content({"Compound_1": 5}, volume=20e-6)
+    assert trough["H1"].content.quantities == {"Compound_1": 5}
+    assert len(trough.list_wells_containing("Compound_1")) == 8
+    with pytest.raises(NoUniqueWell):
+        trough.find_unique_well_containing("Compound_1")
+    trough["D1"].empty_completely()
+    assert trough.list_wells_containing("Compound_1") == []
+
+
+@pytest.mark.parametrize("plate_class", [lab.Plate96, lab.ArrayPlate96])
+def test_quantities(plate_class):
+    plate = plate_class()
+    quantities = plate["C3"].content.quantities
+    quantities["r"] = 1
+    assert plate.find_unique_well_containing("r") == plate["C3"]
+    quantities.update({"s": 1}, t=2)
+    quantities.setdefault("u", 3)
+    assert plate.find_unique_well_containing("u") == plate["C3"]
+    assert quantities.pop("r") == 1
+    del quantities["s"]
+    assert plate.list_wells_containing("r") == []
+    assert plate.list_wells_containing("s") == []
+    quantities.clear()
+    assert len(plate.component_index) == 0
+
+
+def test_rebuild_component_index():
+    plate = lab.Plate96()
+    plate["C3"].content.quantities["Compound_1"] = 1
+    plate.component_index = ComponentIndex(plate)
+    assert plate.list_wells_containing("Compound_1") == []
+    plate.rebuild_component_index()
+    assert plate.list_wells_containing("Compound_1") == [plate["C3"]]
+
+
+def test_plate_collection_index():
+    plate_1 = lab.Plate96(name="p1")
+    plate_2 = lab.ArrayPlate384(name="p2")
+    plate_1["A1"].add_content({"Compound_1": 5}, volume=20e-6)
+    collection = lab.PlateCollectionIndex([plate_1, plate_2])
+    assert collection.plates_containing("Compound_1") == [plate_1]
+
+    plate_2["P24"].add_content({"Compound_1": 1, "Compound_2": 1}, volume=1e-6)
+    assert collection.wells_containing("Compound_1") == [plate_1["A1"], plate_2["P24"]]
+    assert collection.find_unique_well_containing("Compound_2") == plate_2["P24"]
+    assert collection.stats() == {
+        "plates": 2,
+        "components": 2,
+        "plate_entries": 3,
+        "well_entries": 3,
+    }
+
+    new_plate = copy.deepcopy(plate_1)
+    new_plate["A1"].add_content({"Compound_3": 1}, volume=1e-6)
+    assert new_plate.component_index.wells_containing("Compound_1") == [
+        new_plate["A1"]
+    ]
+    assert "Compound_3" not in collection
+
+    plate_1["A1"].empty_completely()
+    assert collection.plates_containing("Compound_1") == [plate_2]
+    collection.remove_plate(plate_2)
+    assert "Compound_1" not in collection
+    with pytest.raises(NoUniqueWell):
+        collection.find_unique_well_containing("Compound_2")
+
+
+def test_copy():
+    plate = lab.Plate96(name="p")
+    plate["A1"].add_content({"Compound_1": 5}, volume=20e-6)
+
+    content = copy.deepcopy(plate["A1"].content)
+    assert content.wells == ()
+    assert content.quantities == {"Compound_1": 5}
+    assert len(pickle.dumps(plate["A1"].content)) < 1000
+    content.quantities["Compound_2"] = 1
+    assert "Compound_2" not in plate.component_index
+
+    new_plate = copy.deepcopy(plate)
+    assert new_plate["A1"].content.wells == (new_plate["A1"],)
+    new_plate["B1"].content.quantities["Compound_1"] = 1
+    assert new_plate.list_wells_containing("Compound_1") == [
+        new_plate["A1"],
+        new_plate["B1"],
+    ]
+    assert plate.list_wells_containing("Compound_1") == [plate["A1"]]
+
+    collection = copy.deepcopy(lab.PlateCollectionIndex([plate]))
+    new_plate = collection.plates[0]
+    new_plate["B1"].add_content({"Compound_2": 1}, volume=1e-6)
+    assert collection.plates_containing("Compound_2") == [new_plate]
@@ -73,3 +73,48 @@ inverted_wellname_data = [[s[-1], s[1], s[2], s[0]] for s in wellname_data]
 @pytest.mark.parametrize("wellname, nwells, direction, expected", wellname_data)
 def test_wellname_to_index(wellname, nwells, direction, expected):
     assert helper.wellname_to_index(wellname, nwells, direction) == expected
+
+
+@pytest.mark.parametrize("wellname, nwells, direction, expected", wellname_data)
+def test_index_to_wellname(wellname, nwells, direction, expected):
+    assert helper.index_to_wellname(expected, nwells, direction) == wellname
+
+
+def test_rowname_round_trip():
+    for number in range(1, 800):
+        assert helper.rowname_to_number(helper.number_to_rowname(number)) == number
+    assert helper.number_to_rowname(52) == "AZ"
+    with pytest.raises(ValueError):
+        helper.rowname_to_number("A1")
+
+
+def test_get_plate_geometry():
+    geometry = helper.get_plate_geometry(2, 4)
+    assert helper.get_plate_geometry(2, 4) is geometry
+    assert geometry.wellnames == ("A1", "A2", "A3", "A4", "B1", "B2", "B3", "B4")
+    assert geometry.rows["B"] == ("B1", "B2", "B3", "B4")
+    assert geometry.columns[2] == ("A2", "B2")
+    with pytest.raises(TypeError):
+        geometry.rows["B"] = ()
+    assert geometry.wellname_to_index("B1") == 5
+    assert geometry.wellname_to_index("B1", "column") == 2
+    assert geometry.wellname_to_index("B01") == 5
+    assert geometry.index_to_wellname(2, "column") == "B1"
+    assert geometry.wellname_to_coordinates("B3") == (2, 3)
+    with pytest.raises(ValueError):
+        geometry.wellname_to_index("B1", "diagonal")
+    assert lab.Plate2x4().wellname_to_index("B1") == 5
+
+
+def test_bulk_conversions():
+    wellnames = ["A1", "H12", "C6", "A01"]
+    indices = helper.wellnames_to_indices(wellnames, 96, direction="column")
+    assert indices.tolist() == [1, 96, 43, 1]
+    assert helper.indices_to_wellnames(indices, 96, "column").tolist() == [
+        "A1",
+        "H12",
+        "C6",
+        "A1",
+    ]
+    with pytest.raises(ValueError):
+        helper.indices_to_wellnames([0, 97], 96)
@@ -52,6 +52,9 @@ def test_restricted_to():
 
 def test_sorted_by():
     assert isinstance(lab.PickList().sorted_by(), lab.PickList)
+    transfers = [transfer_1.with_new_volume(v) for v in [3, 1, 2]]
+    sorted_picklist = lab.PickList(transfers).sorted_by("volume")
+    assert [tr.volume for tr in sorted_picklist.transfers_list] == [1, 2, 3]
 
 
 def test_total_transferred_volume():
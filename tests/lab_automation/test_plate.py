@@ -1,4 +1,5 @@
 # pylint: disable=C0114,E0401,C0103,C0116,W0621
+import numpy as np
 import pytest
 
 import synbiopython.lab_automation as lab
@@ -31,16 +32,22 @@ def test_return_column():
 
 def test_list_wells_in_column():
     assert isinstance(lab.Plate96().list_wells_in_column(5)[0], Well)
+    wells = lab.Plate96().list_wells_in_column(12)
+    assert [well.name for well in wells] == [row + "12" for row in "ABCDEFGH"]
 
 
 def test_return_row():
     assert isinstance(lab.Plate96().return_row("A")[0], Well)
     assert isinstance(lab.Plate96().return_row(1)[0], Well)
     assert len(lab.Plate96().return_row("A")) == 12
+    assert lab.Plate96().return_row(np.int64(2))[0].name == "B1"
+    assert lab.ArrayPlate96().return_row(np.int64(2))[0].name == "B1"
 
 
 def test_list_wells_in_row():
     assert isinstance(lab.Plate96().list_wells_in_row(5)[0], Well)
+    wells = lab.Plate384().list_wells_in_row("B")
+    assert [well.name for well in wells] == ["B%d" % col for col in range(1, 25)]
 
 
 def test_list_filtered_wells():
@@ -82,6 +89,20 @@ def test_iter_wells():
     result = lab.Plate96().iter_wells()
     assert isinstance(next(result), Well)
 
+    for plate in [lab.Plate2x4(), lab.ArrayPlate384()]:
+        for direction, key in [
+            ("row", lambda w: (w.row, w.column)),
+            ("column", lambda w: (w.column, w.row)),
+        ]:
+            wells = list(plate.iter_wells(direction=direction))
+            assert wells == sorted(plate.wells.values(), key=key)
+
+
+def test_get_wells():
+    plate = lab.Plate96()
+    assert plate.get_wells() is plate.get_wells()
+    assert plate.get_wells(direction="column")[1].name == "B1"
+
 
 def test___repr__():
     assert lab.Plate96().__repr__() == "Plate96(None)"
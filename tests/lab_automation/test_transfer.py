@@ -63,3 +63,14 @@ def test___repr__():
     assert (
         transfer.__repr__() == "Transfer 2.50E-05L from Source A1 into Destination B2"
     )
+
+
+def test_compact_transfer():
+    compact = lab.CompactTransfer(source_well, destination_well, volume)
+    assert compact.to_short_string() == (
+        "CompactTransfer 2.50E-05L (Source-A1) -> (Destination-B2)"
+    )
+    assert isinstance(compact.with_new_volume(volume), lab.CompactTransfer)
+    assert isinstance(transfer, lab.CompactTransfer)
+    with pytest.raises(AttributeError):
+        compact.note = "note"
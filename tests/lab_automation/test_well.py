@@ -1,9 +1,10 @@
-# pylint: disable=C0114,E0401,C0103,C0116,W0621
+# pylint: disable=C0114,E0401,C0103,C0116,W0621,W0212
 import pytest
 
 import synbiopython.lab_automation as lab
 from synbiopython.lab_automation.picklist.Transfer import TransferError
-from synbiopython.lab_automation.containers.Well import Well
+from synbiopython.lab_automation.containers.Well import CompactWell, Well
+from synbiopython.lab_automation.containers.WellContent import CompactWellContent
 
 
 plate = lab.Plate96()
@@ -79,5 +80,33 @@ def test_is_after():
     assert other_well.is_after(well) is True
 
 
+def test_compact_well():
+    class CompactPlate(lab.Plate96):
+        well_class = CompactWell
+
+    compact_plate = CompactPlate(wells_data={"A2": {"barcode": "x"}})
+    compact_well = compact_plate["A1"]
+    assert type(compact_well.content) is CompactWellContent
+
+    # Reading data and sources allocates nothing:
+    compact_plate.to_dict()
+    assert compact_plate.list_filtered_wells(lambda w: w.data.get("x")) == []
+    assert compact_well.data == {}
+    assert compact_well.sources == []
+    assert compact_well._data is None
+    assert compact_well._sources is None
+
+    assert compact_plate["A2"].data == {"barcode": "x"}
+    compact_well.data["barcode"] = "y"
+    assert compact_well.to_dict()["barcode"] == "y"
+    compact_well.add_content({"Compound_1": 5}, volume=20e-6)
+    lab.Transfer(compact_well, compact_plate["A2"], 10e-6).apply()
+    assert compact_plate["A2"].sources[0].source_well is compact_well
+    assert list(compact_plate["A2"].iterate_sources_tree())[-1] is compact_plate["A2"]
+    assert isinstance(well, CompactWell)
+    with pytest.raises(AttributeError):
+        compact_well.barcode = "x"
+
+
 def test___lt__():
     assert True
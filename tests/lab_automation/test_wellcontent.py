@@ -1,5 +1,10 @@
 # pylint: disable=C0114,E0401,C0103,C0116,W0621
-from synbiopython.lab_automation.containers.WellContent import WellContent
+import pytest
+
+from synbiopython.lab_automation.containers.WellContent import (
+    CompactWellContent,
+    WellContent,
+)
 
 wellcontent = WellContent(
     quantities={"Compound_1": 5, "Compound_2": 10}, volume=25
@@ -31,3 +36,11 @@ def test_make_empty():
 
 def test_components_as_string():
     assert wellcontent.components_as_string() == "Compound_1 Compound_2"
+
+
+def test_compact_wellcontent():
+    compact = CompactWellContent(quantities={"Compound_1": 5}, volume=25)
+    assert compact.concentration() == 0.2
+    assert isinstance(wellcontent, CompactWellContent)
+    with pytest.raises(AttributeError):
+        compact.data = {}